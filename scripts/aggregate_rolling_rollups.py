@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Rolling multi-week hook/vertical rollups across Weekly Signal Brief runs.
+
+Feeds trend columns and the "no improvement after 2 iterations" kill trigger
+(analytics/schema.md §9), which need more history than a single run.json.
+
+Each week contributes a partial aggregate cached under $AGGREGATE_CACHE_DIR (default
+build/aggregate_cache) and reused while its posts_export.csv is unchanged. On a miss the
+week resumes from the checkpoint aggregate_weekly_inputs.py --incremental persists next to
+its run.json, parsing only the appended rows (or, without a usable checkpoint, the whole
+export). Run directories are only read.
+
+Usage:
+  python scripts/aggregate_rolling_rollups.py --runs 'products/weekly_signal_brief/runs/*' --out-dir build/rolling
+
+Writes, per window N (default 4, 8, 12 weeks ending at --as-of-week or the latest run):
+  hooks_rollup_<N>w.csv, verticals_rollup_<N>w.csv and rolling_windows.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aggregate_weekly_inputs as agg
+
+DEFAULT_WINDOWS = (4, 8, 12)
+
+
+def _iso_week_id(monday: dt.date) -> str:
+    year, week, _ = monday.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _parse_windows(spec: str) -> List[int]:
+    try:
+        windows = sorted({int(x) for x in spec.split(",") if x.strip()})
+    except ValueError as exc:
+        raise SystemExit(f"--windows must be comma-separated integers: {spec}") from exc
+    if not windows or windows[0] < 1:
+        raise SystemExit(f"--windows must be positive integers: {spec}")
+    return windows
+
+
+def rolling_rollups(
+    runs: Sequence[Tuple[dt.date, str, agg._StreamingAggregator]],
+    *,
+    as_of: dt.date,
+    window_weeks: int,
+) -> Tuple[Optional[agg._StreamingAggregator], List[str]]:
+    """Merge the weekly partial aggregates that fall inside the window ending at ``as_of``."""
+
+    start = as_of - dt.timedelta(weeks=window_weeks - 1)
+    merged: Optional[agg._StreamingAggregator] = None
+    week_ids: List[str] = []
+    for monday, week_id, weekly in runs:
+        if not start <= monday <= as_of:
+            continue
+        if merged is None:
+            merged = agg._StreamingAggregator(
+                engine=weekly.engine,
+                dims=weekly.dims,
+                workers=weekly.workers,
+                win_rate_source=weekly.win_rate_source,
+            )
+        merged.merge(weekly)
+        week_ids.append(week_id)
+    return merged, week_ids
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Rolling multi-week hook/vertical rollups across runs")
+    ap.add_argument(
+        "--runs",
+        nargs="+",
+        required=True,
+        help="Run directories, run.json files, or glob patterns (e.g. 'products/weekly_signal_brief/runs/*')",
+    )
+    ap.add_argument("--out-dir", required=True, help="Directory for the rolling rollup CSVs")
+    ap.add_argument("--windows", default=",".join(str(w) for w in DEFAULT_WINDOWS), help="Window lengths in weeks")
+    ap.add_argument("--as-of-week", default=None, help="Last ISO week of every window (default: latest run)")
+    ap.add_argument("--scoring-engine", choices=agg.SCORING_ENGINES, default="auto")
+    ap.add_argument("--workers", type=int, default=1, help="Scoring worker processes (0 = one per CPU)")
+    ap.add_argument("--win-rate-source", choices=agg.WIN_RATE_SOURCES, default="decision")
+    ap.add_argument("--rollup-schema", choices=agg.ROLLUP_SCHEMAS, default="v01")
+    args = ap.parse_args(argv)
+
+    engine = agg._resolve_scoring_engine(args.scoring_engine)
+    workers = agg._resolve_workers(args.workers)
+    windows = _parse_windows(args.windows)
+    dims = [agg.HOOKS_DIMENSION, agg.VERTICALS_DIMENSION]
+
+    run_paths = agg._expand_run_jsons(args.runs)
+    if not run_paths:
+        raise SystemExit("no run.json found for --runs")
+
+    runs: List[Tuple[dt.date, str, agg._StreamingAggregator]] = []
+    seen: Dict[dt.date, Path] = {}
+    for run_json_path in run_paths:
+        week_id, posts_export, _, _, _, _ = agg._resolve_run_paths(run_json_path)
+        monday = agg._week_monday(week_id)
+        if monday in seen:
+            raise SystemExit(f"two runs cover ISO week {_iso_week_id(monday)}: {seen[monday]} and {run_json_path}")
+        seen[monday] = run_json_path
+        if not posts_export.exists():
+            raise SystemExit(f"posts_export.csv not found: {posts_export}")
+        weekly = agg._load_run_aggregate(
+            posts_export,
+            run_json_path.parent / agg.AGGREGATE_STATE_FILENAME,
+            engine=engine,
+            dims=dims,
+            workers=workers,
+            win_rate_source=args.win_rate_source,
+        )
+        runs.append((monday, week_id, weekly))
+    runs.sort(key=lambda r: r[0])
+
+    as_of = agg._week_monday(args.as_of_week) if args.as_of_week else runs[-1][0]
+    as_of_week = _iso_week_id(as_of)
+    out_dir = Path(args.out_dir).resolve()
+    summary: Dict[str, Any] = {"as_of_week": as_of_week, "windows": []}
+
+    for n in windows:
+        merged, week_ids = rolling_rollups(runs, as_of=as_of, window_weeks=n)
+        label = f"{_iso_week_id(as_of - dt.timedelta(weeks=n - 1))}..{as_of_week}"
+        leading = {"window_weeks": n, "weeks_present": len(week_ids)}
+        for dim, name in [(agg.HOOKS_DIMENSION, "hooks"), (agg.VERTICALS_DIMENSION, "verticals")]:
+            rows = [] if merged is None else [{**leading, **r} for r in merged.rollups(label, dim, args.rollup_schema)]
+            path = out_dir / f"{name}_rollup_{n}w.csv"
+            agg._write_rollup(path, dim, rows, leading_columns=list(leading), schema=args.rollup_schema)
+            print(f"Wrote {path}")
+        summary["windows"].append(
+            {
+                "window_weeks": n,
+                "week_range": label,
+                "weeks_present": week_ids,
+                "valid_posts": 0 if merged is None else merged.valid_posts,
+            }
+        )
+
+    summary_path = out_dir / "rolling_windows.json"
+    summary_path.write_text(json.dumps(summary, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Wrote {summary_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,7 @@
 """Aggregate weekly inputs for Weekly Signal Brief.
 
-This script is intentionally dependency-free (stdlib only) and produces:
+This script is intentionally dependency-free (stdlib only; NumPy is used for vectorized
+scoring when installed) and produces:
 
 - hooks_rollup.csv
 - verticals_rollup.csv
@@ -17,14 +18,51 @@ Design goals:
 from __future__ import annotations
 
 import argparse
+import base64
 import csv
 import datetime as dt
+import functools
+import glob
+import hashlib
+import io
+import itertools
 import json
 import math
+import mmap
+import operator
+import os
+import re
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from statistics import median
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# The buyer kit ships this script alone (package_weekly_signal_brief_kit.py), so sibling
+# modules are imported only on the code paths of the flags that need them.
+if TYPE_CHECKING:
+    import decision_triggers
+    import metric_drift
+
+try:  # Optional: vectorized scoring engine.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None  # type: ignore[assignment]
+
+SCORING_ENGINES = ("auto", "numpy", "stdlib")
+# Rollup CSV layouts: v01 is csv_appendix_schema.md; v02 appends median velocity and comment rate.
+ROLLUP_SCHEMAS = ("v01", "v02")
+
+# Hours between the 1h and 24h view snapshots (Velocity, analytics/schema.md §2.3).
+VELOCITY_HOURS = 23.0
+
+# Composite score weights (analytics/schema.md §2.4) and the fill for a missing component.
+SCORE_WEIGHTS = (0.35, 0.25, 0.20, 0.20)
+MISSING_COMPONENT_FILL = 0.5
 
 
 @dataclass(frozen=True)
@@ -34,7 +72,12 @@ class PostRow:
     vertical: str
     hook_type: str
     duration_sec: Optional[float]
+    visual_style: str
+    voice_style: str
     block_id: str
+    experiment_id: str
+    variant_id: str
+    is_control: str
     decision: str
     notes: str
 
@@ -45,6 +88,7 @@ class PostRow:
     loop_pct: Optional[float]
     shares: Optional[float]
     saves: Optional[float]
+    comments: Optional[float]
 
 
 def _parse_float(v: Any) -> Optional[float]:
@@ -54,9 +98,11 @@ def _parse_float(v: Any) -> Optional[float]:
     if not s:
         return None
     try:
-        return float(s)
+        f = float(s)
     except ValueError:
         return None
+    # A literal "nan" is missing, as it is in the columnar store (NaN marks a missing value).
+    return None if math.isnan(f) else f
 
 
 def _parse_bool(v: Any) -> Optional[bool]:
@@ -83,6 +129,14 @@ def _duration_band(duration_sec: Optional[float]) -> str:
     return "other"
 
 
+def _logistic(z: float) -> float:
+    try:
+        return 1.0 / (1.0 + math.exp(-z))
+    except OverflowError:
+        # exp(-z) only overflows for very negative z (e.g. MAD == 0), where the result is 0.0.
+        return 0.0
+
+
 def _robust_norm(values: Sequence[float]) -> List[float]:
     """Robust normalize values to 0..1 via median/MAD + logistic.
 
@@ -95,11 +149,7 @@ def _robust_norm(values: Sequence[float]) -> List[float]:
     abs_dev = [abs(x - m) for x in values]
     d = median(abs_dev)
     denom = max(1e-9, 1.4826 * d)
-    out: List[float] = []
-    for x in values:
-        z = (x - m) / denom
-        out.append(1.0 / (1.0 + math.exp(-z)))
-    return out
+    return [_logistic((x - m) / denom) for x in values]
 
 
 def _format_float(v: Optional[float]) -> str:
@@ -132,31 +182,246 @@ def _extract_invalid_reason(decision: str, notes: str, missing: List[str]) -> Op
     return None
 
 
-def _parse_posts_csv(path: Path) -> List[PostRow]:
+def _post_row_from_record(r: Dict[str, Any]) -> PostRow:
+    return PostRow(
+        date=str(r.get("date", "")).strip(),
+        platform=str(r.get("platform", "")).strip(),
+        vertical=str(r.get("vertical", "")).strip(),
+        hook_type=str(r.get("hook_type", "")).strip(),
+        duration_sec=_parse_float(r.get("duration_sec")),
+        visual_style=str(r.get("visual_style", "")).strip(),
+        voice_style=str(r.get("voice_style", "")).strip(),
+        block_id=str(r.get("block_id", "")).strip(),
+        experiment_id=str(r.get("experiment_id", "")).strip(),
+        variant_id=str(r.get("variant_id", "")).strip(),
+        is_control=str(r.get("is_control", "")).strip(),
+        decision=str(r.get("decision", "")).strip(),
+        notes=str(r.get("notes", "")).strip(),
+        views_1h=_parse_float(r.get("views_1h")),
+        views_24h=_parse_float(r.get("views_24h")),
+        avg_view_duration_sec=_parse_float(r.get("avg_view_duration_sec")),
+        completion_pct=_parse_float(r.get("completion_pct")),
+        loop_pct=_parse_float(r.get("loop_pct")),
+        shares=_parse_float(r.get("shares")),
+        saves=_parse_float(r.get("saves")),
+        comments=_parse_float(r.get("comments")),
+    )
+
+
+def _iter_posts_csv(path: Path, *, start: int = 0) -> Iterator[PostRow]:
+    """Yield rows one at a time (used by --streaming so the export is never materialized).
+
+    ``start`` is a byte offset at a row boundary (an --incremental checkpoint); rows before
+    it are skipped without being parsed.
+    """
+
+    if start <= 0:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            for r in csv.DictReader(f):
+                yield _post_row_from_record(r)
+        return
+
+    with path.open("rb") as raw:
+        header = next(csv.reader([raw.readline().decode("utf-8")]))
+        raw.seek(start)
+        f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        for r in csv.DictReader(f, fieldnames=header):
+            yield _post_row_from_record(r)
+
+
+# Numeric metric columns (array('d'), NaN = missing) and dictionary-encoded label columns.
+_NUMERIC_FIELDS: Tuple[str, ...] = (
+    "duration_sec",
+    "views_1h",
+    "views_24h",
+    "avg_view_duration_sec",
+    "completion_pct",
+    "loop_pct",
+    "shares",
+    "saves",
+    "comments",
+)
+_CODED_FIELDS: Tuple[str, ...] = (
+    "date",
+    "platform",
+    "vertical",
+    "hook_type",
+    "visual_style",
+    "voice_style",
+    "block_id",
+    "experiment_id",
+    "variant_id",
+    "is_control",
+    "decision",
+)
+
+# Label fields a rollup can group by, alone or combined (e.g. "experiment_id+variant_id").
+ROLLUP_DIMENSION_FIELDS: Tuple[str, ...] = (
+    "hook_type",
+    "vertical",
+    "visual_style",
+    "voice_style",
+    "experiment_id",
+    "variant_id",
+)
+HOOKS_DIMENSION: Tuple[str, ...] = ("hook_type",)
+VERTICALS_DIMENSION: Tuple[str, ...] = ("vertical",)
+
+# Metrics a row needs to count as valid, in the order they are reported as missing.
+_REQUIRED_METRICS: Tuple[str, ...] = (
+    "views_24h",
+    "completion_pct",
+    "loop_pct",
+    "duration_sec",
+    "avg_view_duration_sec",
+)
+
+
+def _code_index() -> Dict[str, int]:
+    """Label -> code map that hands an unseen label the next code on lookup."""
+
+    index: defaultdict = defaultdict()
+    index.default_factory = index.__len__
+    return index
+
+
+class PostColumns:
+    """Columnar store for posts_export.csv.
+
+    Numeric metrics are array('d') columns with NaN for missing values. Low-cardinality labels
+    are dictionary-encoded: ``codes[field][i]`` indexes into ``labels[field]``. Notes stay a
+    plain list because they are only consulted for invalid rows.
+    """
+
+    __slots__ = ("numeric", "codes", "labels", "notes", "_label_index")
+
+    def __init__(self) -> None:
+        self.numeric: Dict[str, array] = {f: array("d") for f in _NUMERIC_FIELDS}
+        self.codes: Dict[str, array] = {f: array("I") for f in _CODED_FIELDS}
+        self.labels: Dict[str, List[str]] = {f: [] for f in _CODED_FIELDS}
+        self.notes: List[str] = []
+        self._label_index: Dict[str, Dict[str, int]] = {f: _code_index() for f in _CODED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    def encode(self, field: str, value: str) -> int:
+        code = self._label_index[field][value]
+        labels = self.labels[field]
+        if code == len(labels):
+            labels.append(value)
+        return code
+
+    def append_record(self, r: Dict[str, Any]) -> None:
+        for f in _NUMERIC_FIELDS:
+            v = _parse_float(r.get(f))
+            self.numeric[f].append(math.nan if v is None else v)
+        for f in _CODED_FIELDS:
+            self.codes[f].append(self.encode(f, str(r.get(f, "")).strip()))
+        self.notes.append(str(r.get("notes", "")).strip())
+
+    def extend_columns(self, raw: Dict[str, Optional[Sequence[str]]], n: int) -> None:
+        """Append ``n`` rows given as raw CSV strings per column (None = column absent).
+
+        Same results as append_record per row, but floats are converted a column at a time
+        and labels are encoded through a defaultdict whose factory hands out the next code,
+        so both loops run in C for well-formed data.
+        """
+
+        for f in _NUMERIC_FIELDS:
+            values = raw.get(f)
+            self.numeric[f].extend(_float_column(values) if values is not None else array("d", [math.nan]) * n)
+        for f in _CODED_FIELDS:
+            values = raw.get(f)
+            index = self._label_index[f]
+            if values is None:
+                self.codes[f].extend(array("I", [index[""]]) * n)
+            else:
+                self.codes[f].extend(map(index.__getitem__, map(str.strip, values)))
+            labels = self.labels[f]
+            if len(index) > len(labels):
+                labels.extend(itertools.islice(index, len(labels), None))
+        notes = raw.get("notes")
+        self.notes.extend([""] * n if notes is None else map(str.strip, notes))
+
+    def label(self, field: str, i: int) -> str:
+        return self.labels[field][self.codes[field][i]]
+
+    def take(self, idxs: Sequence[int]) -> "PostColumns":
+        """Return a store holding only rows ``idxs``; label dictionaries are shared."""
+
+        out = PostColumns.__new__(PostColumns)
+        out.numeric = {f: array("d", [col[i] for i in idxs]) for f, col in self.numeric.items()}
+        out.codes = {f: array("I", [col[i] for i in idxs]) for f, col in self.codes.items()}
+        out.labels = self.labels
+        out._label_index = self._label_index
+        out.notes = [self.notes[i] for i in idxs]
+        return out
+
+
+def _float_or_nan(v: Optional[str]) -> float:
+    try:
+        return float(v)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _float_column(values: Sequence[str]) -> array:
+    """Batch float conversion with _parse_float semantics (blank/unparseable -> NaN)."""
+
+    try:
+        return array("d", [float(v) if v else math.nan for v in values])
+    except ValueError:
+        return array("d", map(_float_or_nan, values))
+
+
+# Rows per batch in _parse_posts_csv; bounds the raw csv rows held in memory at once.
+_PARSE_CHUNK_ROWS = 8192
+
+# csv.DictReader fills short rows with None, which append_record turns into "None" labels
+# and a missing metric; padding with the same string reproduces that exactly.
+_SHORT_ROW_FILL = "None"
+
+
+def _parse_posts_csv(path: Path) -> PostColumns:
+    """Read posts_export.csv straight into a PostColumns.
+
+    Header positions are resolved once; csv.reader rows are taken a chunk at a time and each
+    wanted column is pulled out with an itemgetter and converted in one batch.
+    """
+
+    cols = PostColumns()
     with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        rows: List[PostRow] = []
-        for r in reader:
-            rows.append(
-                PostRow(
-                    date=str(r.get("date", "")).strip(),
-                    platform=str(r.get("platform", "")).strip(),
-                    vertical=str(r.get("vertical", "")).strip(),
-                    hook_type=str(r.get("hook_type", "")).strip(),
-                    duration_sec=_parse_float(r.get("duration_sec")),
-                    block_id=str(r.get("block_id", "")).strip(),
-                    decision=str(r.get("decision", "")).strip(),
-                    notes=str(r.get("notes", "")).strip(),
-                    views_1h=_parse_float(r.get("views_1h")),
-                    views_24h=_parse_float(r.get("views_24h")),
-                    avg_view_duration_sec=_parse_float(r.get("avg_view_duration_sec")),
-                    completion_pct=_parse_float(r.get("completion_pct")),
-                    loop_pct=_parse_float(r.get("loop_pct")),
-                    shares=_parse_float(r.get("shares")),
-                    saves=_parse_float(r.get("saves")),
-                )
-            )
-        return rows
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return cols
+        # Last occurrence wins for duplicate names, as with DictReader.
+        pos = {name: i for i, name in enumerate(header)}
+        width = len(header)
+        getters = {f: operator.itemgetter(pos[f]) for f in [*_NUMERIC_FIELDS, *_CODED_FIELDS, "notes"] if f in pos}
+
+        while True:
+            chunk = list(itertools.islice(reader, _PARSE_CHUNK_ROWS))
+            if not chunk:
+                break
+            rows = [r for r in chunk if r]  # DictReader skips blank lines
+            if not rows:
+                continue
+            if min(map(len, rows)) < width:
+                rows = [r if len(r) >= width else r + [_SHORT_ROW_FILL] * (width - len(r)) for r in rows]
+            cols.extend_columns({f: list(map(get, rows)) for f, get in getters.items()}, len(rows))
+    return cols
+
+
+def _parse_posts_csv_records(path: Path) -> PostColumns:
+    """Reference reader: one csv.DictReader record at a time (parity tests and benchmarks)."""
+
+    cols = PostColumns()
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for r in csv.DictReader(f):
+            cols.append_record(r)
+    return cols
 
 
 def _retention_ratio(row: PostRow) -> Optional[float]:
@@ -173,6 +438,18 @@ def _save_share_rate(row: PostRow) -> Optional[float]:
     return (shares + saves) / max(1.0, row.views_24h)
 
 
+def _velocity(row: PostRow) -> Optional[float]:
+    if row.views_24h is None or row.views_1h is None:
+        return None
+    return (row.views_24h - row.views_1h) / VELOCITY_HOURS
+
+
+def _comment_rate(row: PostRow) -> Optional[float]:
+    if row.views_24h is None or row.views_24h <= 0 or row.comments is None:
+        return None
+    return row.comments / max(1.0, row.views_24h)
+
+
 def _is_valid(row: PostRow) -> Tuple[bool, List[str]]:
     missing: List[str] = []
     # Treat explicit invalid decision as invalid.
@@ -180,213 +457,1233 @@ def _is_valid(row: PostRow) -> Tuple[bool, List[str]]:
         return False, missing
 
     # Minimum metrics for rollups.
-    if row.views_24h is None:
-        missing.append("views_24h")
-    if row.completion_pct is None:
-        missing.append("completion_pct")
-    if row.loop_pct is None:
-        missing.append("loop_pct")
-    if row.duration_sec is None:
-        missing.append("duration_sec")
-    if row.avg_view_duration_sec is None:
-        missing.append("avg_view_duration_sec")
+    for f in _REQUIRED_METRICS:
+        if getattr(row, f) is None:
+            missing.append(f)
 
     return (len(missing) == 0), missing
 
 
-def _compute_scores(rows: List[PostRow]) -> Dict[int, float]:
-    """Compute composite scores per row index within each comparison set.
+# Derived per-export caches (column cache, drift histograms, weekly partials) live under one
+# root outside runs/, in a directory per export path, so reading a run (this week's or a
+# history week's) never writes into its directory.
+AGGREGATE_CACHE_DIR_ENV = "AGGREGATE_CACHE_DIR"
+
+
+def _export_cache_dir(posts_export: Path) -> Optional[Path]:
+    """Cache directory for ``posts_export``: under $AGGREGATE_CACHE_DIR (empty disables caching),
+    else build/aggregate_cache in the repo."""
+
+    root = os.environ.get(AGGREGATE_CACHE_DIR_ENV)
+    if root == "":
+        return None
+    base = Path(root) if root else Path(__file__).resolve().parents[1] / "build" / "aggregate_cache"
+    return base / hashlib.sha256(str(posts_export.resolve()).encode("utf-8")).hexdigest()[:24]
+
+
+def _source_matches(source: Dict[str, Any], posts_export: Path) -> bool:
+    """Whether a cache entry's recorded source is still ``posts_export``.
 
-    Comparison set = (platform, duration_band, block_id).
+    An unchanged size and mtime_ns is trusted; otherwise the recorded sha256 is checked.
     """
 
-    # Collect metrics per row.
-    rr: List[Optional[float]] = []
-    cc: List[Optional[float]] = []
-    ll: List[Optional[float]] = []
-    ss: List[Optional[float]] = []
-    for r in rows:
-        rr.append(_retention_ratio(r))
-        cc.append(r.completion_pct)
-        ll.append(r.loop_pct)
-        ss.append(_save_share_rate(r))
-
-    # Group indices.
-    groups: Dict[Tuple[str, str, str], List[int]] = {}
-    for idx, r in enumerate(rows):
-        key = (r.platform, _duration_band(r.duration_sec), r.block_id)
-        groups.setdefault(key, []).append(idx)
-
-    scores: Dict[int, float] = {}
-    for _, idxs in groups.items():
-        # Build vectors, dropping None by replacing with group median after normalization.
-        def vec(vals: List[Optional[float]]) -> List[Optional[float]]:
-            return [vals[i] for i in idxs]
-
-        rr_v = vec(rr)
-        cc_v = vec(cc)
-        ll_v = vec(ll)
-        ss_v = vec(ss)
-
-        def norm(v: List[Optional[float]]) -> List[float]:
-            present = [x for x in v if x is not None]
-            if not present:
-                return [0.5 for _ in v]
-            n_present = _robust_norm([float(x) for x in present])
-            # Map back, using 0.5 for missing.
-            it = iter(n_present)
-            out: List[float] = []
-            for x in v:
-                out.append(next(it) if x is not None else 0.5)
-            return out
-
-        R = norm(rr_v)
-        C = norm(cc_v)
-        L = norm(ll_v)
-        S = norm(ss_v)
-
-        for local_pos, idx in enumerate(idxs):
-            score = 0.35 * R[local_pos] + 0.25 * C[local_pos] + 0.20 * L[local_pos] + 0.20 * S[local_pos]
-            scores[idx] = float(score)
+    st = posts_export.stat()
+    if (source.get("size"), source.get("mtime_ns")) == (st.st_size, st.st_mtime_ns):
+        return True
+    return source.get("sha256") == _sha256_path(posts_export)
+
+
+def _write_cache_json(path: Path, payload: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Read-only cache root: the next read recomputes this entry.
+
+
+# Binary column cache written to the export's cache directory the first time it is parsed. Layout:
+# magic, <Q header length, JSON header, then 8-byte aligned raw column arrays at the
+# offsets the header lists, so the file can be memory-mapped and sliced without parsing.
+COLUMN_CACHE_SUFFIX = ".colcache"
+_COLUMN_CACHE_MAGIC = b"NNCOLS\x01\n"
+_COLUMN_CACHE_VERSION = 3
+
+
+def _column_cache_path(posts_export: Path) -> Optional[Path]:
+    cache_dir = _export_cache_dir(posts_export)
+    return None if cache_dir is None else cache_dir / (posts_export.name + COLUMN_CACHE_SUFFIX)
+
+
+def _sha256_path(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_column_cache(cache_path: Path, cols: PostColumns, source: Dict[str, Any]) -> None:
+    note_index = _code_index()
+    note_codes = array("I", map(note_index.__getitem__, cols.notes))
+    blobs: List[Tuple[str, str, array, Optional[List[str]]]] = [
+        *((f, "d", cols.numeric[f], None) for f in _NUMERIC_FIELDS),
+        *((f, "I", cols.codes[f], cols.labels[f]) for f in _CODED_FIELDS),
+        ("notes", "I", note_codes, list(note_index)),
+    ]
+
+    columns: Dict[str, Any] = {}
+    offset = 0
+    for name, kind, values, labels in blobs:
+        nbytes = len(values) * values.itemsize
+        columns[name] = {"kind": kind, "offset": offset, "nbytes": nbytes, "labels": labels}
+        offset += (nbytes + 7) // 8 * 8
+    header = json.dumps(
+        {
+            "version": _COLUMN_CACHE_VERSION,
+            "layout": _array_layout(),
+            "source": source,
+            "rows": len(cols),
+            "columns": columns,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * (-(len(_COLUMN_CACHE_MAGIC) + 8 + len(header)) % 8)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_COLUMN_CACHE_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for _, _, values, _ in blobs:
+            data = values.tobytes()
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    os.replace(tmp, cache_path)
+
+
+def _read_column_cache(cache_path: Path, posts_export: Path) -> Optional[PostColumns]:
+    """The cached columns for ``posts_export``, or None if the cache is missing or stale.
+
+    A cache matches when its recorded sha256 equals the export's; an unchanged size and
+    mtime_ns short-circuits the hash so a warm load never reads the CSV.
+    """
+
+    try:
+        with cache_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _columns_from_cache(mm, posts_export)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        # Missing, empty, truncated or foreign file: fall back to parsing the CSV.
+        return None
+
+
+def _columns_from_cache(mm: mmap.mmap, posts_export: Path) -> Optional[PostColumns]:
+    prefix = len(_COLUMN_CACHE_MAGIC) + 8
+    if mm[: len(_COLUMN_CACHE_MAGIC)] != _COLUMN_CACHE_MAGIC:
+        return None
+    (header_len,) = struct.unpack("<Q", mm[len(_COLUMN_CACHE_MAGIC) : prefix])
+    header = json.loads(mm[prefix : prefix + header_len])
+    if header.get("version") != _COLUMN_CACHE_VERSION or header.get("layout") != _array_layout():
+        return None
+
+    if not _source_matches(header.get("source") or {}, posts_export):
+        return None
+
+    base = prefix + header_len
+    columns = header["columns"]
+    cols = PostColumns()
+
+    def read(name: str, kind: str) -> array:
+        meta = columns[name]
+        if meta["kind"] != kind:
+            raise ValueError(f"column {name} has kind {meta['kind']}, expected {kind}")
+        start = base + int(meta["offset"])
+        values = array(kind)
+        with memoryview(mm) as view, view[start : start + int(meta["nbytes"])] as blob:
+            values.frombytes(blob)
+        return values
+
+    for f in _NUMERIC_FIELDS:
+        cols.numeric[f] = read(f, "d")
+    for f in _CODED_FIELDS:
+        cols.codes[f] = read(f, "I")
+        cols.labels[f] = list(columns[f]["labels"])
+        cols._label_index[f].update((label, i) for i, label in enumerate(cols.labels[f]))
+    note_labels = columns["notes"]["labels"]
+    cols.notes = [note_labels[c] for c in read("notes", "I")]
+
+    if any(len(col) != header["rows"] for col in [*cols.numeric.values(), *cols.codes.values(), cols.notes]):
+        return None
+    return cols
+
+
+def _load_posts_columns(posts_export: Path, *, use_cache: bool = True) -> PostColumns:
+    """Parse posts_export.csv, going through its binary column cache when ``use_cache``."""
+
+    cache_path = _column_cache_path(posts_export) if use_cache else None
+    if cache_path is None:
+        return _parse_posts_csv(posts_export)
+    cached = _read_column_cache(cache_path, posts_export)
+    if cached is not None:
+        return cached
+
+    st = posts_export.stat()
+    sha256 = _sha256_path(posts_export)
+    cols = _parse_posts_csv(posts_export)
+    try:
+        _write_column_cache(cache_path, cols, {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+    except OSError:
+        pass  # Read-only cache root: the cache is an optimization, never a requirement.
+    return cols
+
+
+def _split_valid(cols: PostColumns) -> Tuple[List[int], int, Dict[str, int]]:
+    """Column-wise _is_valid: (valid row indices, rows with missing metrics, invalid reason counts)."""
+
+    invalid_decision = [d.lower() == "invalid" for d in cols.labels["decision"]]
+    decision_codes = cols.codes["decision"]
+    required = [(f, cols.numeric[f]) for f in _REQUIRED_METRICS]
+
+    valid_idx: List[int] = []
+    missing_count = 0
+    reason_counts: Dict[str, int] = {}
+    for i in range(len(cols)):
+        if invalid_decision[decision_codes[i]]:
+            missing: List[str] = []
+        else:
+            missing = [f for f, col in required if math.isnan(col[i])]
+            if not missing:
+                valid_idx.append(i)
+                continue
+            missing_count += 1
+        reason = _extract_invalid_reason(cols.label("decision", i), cols.notes[i], missing)
+        if reason:
+            reason_counts[reason] = reason_counts.get(reason, 0) + 1
+    return valid_idx, missing_count, reason_counts
+
+
+def _retention_ratio_column(cols: PostColumns) -> array:
+    avg = cols.numeric["avg_view_duration_sec"]
+    dur = cols.numeric["duration_sec"]
+    out = array("d", bytes(8 * len(cols)))
+    for i in range(len(cols)):
+        a, d = avg[i], dur[i]
+        # NaN compares False, so a missing duration fails `d > 0`.
+        out[i] = min(1.0, a / d) if d > 0 and not math.isnan(a) else math.nan
+    return out
+
+
+def _save_share_rate_column(cols: PostColumns) -> array:
+    views = cols.numeric["views_24h"]
+    shares = cols.numeric["shares"]
+    saves = cols.numeric["saves"]
+    out = array("d", bytes(8 * len(cols)))
+    for i in range(len(cols)):
+        v = views[i]
+        if not v > 0:
+            out[i] = math.nan
+            continue
+        sh = shares[i]
+        sv = saves[i]
+        out[i] = ((0.0 if math.isnan(sh) else sh) + (0.0 if math.isnan(sv) else sv)) / max(1.0, v)
+    return out
+
+
+def _velocity_comment_rate_columns(cols: PostColumns) -> Tuple[array, array]:
+    """Velocity and comment rate columns, both from one pass over the rows."""
+
+    views_1h = cols.numeric["views_1h"]
+    views = cols.numeric["views_24h"]
+    comments = cols.numeric["comments"]
+    velocity = array("d", bytes(8 * len(cols)))
+    comment_rate = array("d", bytes(8 * len(cols)))
+    for i in range(len(cols)):
+        v = views[i]
+        # NaN propagates through the subtraction, so a missing window leaves velocity missing.
+        velocity[i] = (v - views_1h[i]) / VELOCITY_HOURS
+        comment_rate[i] = comments[i] / max(1.0, v) if v > 0 else math.nan
+    return velocity, comment_rate
+
+
+def _duration_band_column(cols: PostColumns) -> List[str]:
+    # Durations are low-cardinality, so band each distinct value once.
+    band_of: Dict[float, str] = {}
+    out: List[str] = []
+    for d in cols.numeric["duration_sec"]:
+        band = band_of.get(d)
+        if band is None:
+            band = _duration_band(None if math.isnan(d) else d)
+            if not math.isnan(d):
+                band_of[d] = band
+        out.append(band)
+    return out
+
+
+def _score_comparison_set(
+    rr_v: Sequence[float],
+    cc_v: Sequence[float],
+    ll_v: Sequence[float],
+    ss_v: Sequence[float],
+) -> List[float]:
+    """Composite scores for the members of one comparison set (NaN = missing metric)."""
+
+    def norm(v: Sequence[float]) -> List[float]:
+        present = [x for x in v if not math.isnan(x)]
+        if not present:
+            return [MISSING_COMPONENT_FILL for _ in v]
+        n_present = _robust_norm(present)
+        # Map back, using the fill for missing.
+        it = iter(n_present)
+        out: List[float] = []
+        for x in v:
+            out.append(MISSING_COMPONENT_FILL if math.isnan(x) else next(it))
+        return out
+
+    R = norm(rr_v)
+    C = norm(cc_v)
+    L = norm(ll_v)
+    S = norm(ss_v)
+    wr, wc, wl, ws = SCORE_WEIGHTS
+
+    return [float(wr * R[i] + wc * C[i] + wl * L[i] + ws * S[i]) for i in range(len(R))]
+
+
+def _np_grouped_median(values: Any, groups: Any, n_groups: int) -> Any:
+    """Per-group medians (NaN for empty groups), averaging the middle pair like statistics.median."""
+
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    has = counts > 0
+    lo = (starts + (counts - 1) // 2)[has]
+    hi = (starts + counts // 2)[has]
+    out = np.full(n_groups, np.nan)
+    out[has] = (ordered[lo] + ordered[hi]) / 2
+    return out
+
+
+def _np_robust_norm_grouped(values: Any, groups: Any, n_groups: int) -> Any:
+    """Vectorized _robust_norm applied independently within each group (NaN = missing)."""
+
+    out = np.full(values.shape[0], MISSING_COMPONENT_FILL)
+    present = ~np.isnan(values)
+    if not present.any():
+        return out
+    v = values[present]
+    g = groups[present]
+    m = _np_grouped_median(v, g, n_groups)[g]
+    d = _np_grouped_median(np.abs(v - m), g, n_groups)[g]
+    denom = np.maximum(1e-9, 1.4826 * d)
+    with np.errstate(over="ignore"):
+        out[present] = 1.0 / (1.0 + np.exp(-((v - m) / denom)))
+    return out
+
+
+def _resolve_scoring_engine(name: str) -> str:
+    if name == "auto":
+        return "stdlib" if np is None else "numpy"
+    if name == "numpy" and np is None:
+        raise SystemExit("--scoring-engine numpy requires NumPy (pip install numpy)")
+    if name not in SCORING_ENGINES:
+        raise SystemExit(f"unknown scoring engine: {name}")
+    return name
 
+
+def _score_sets(
+    rr: Sequence[float],
+    cc: Sequence[float],
+    ll: Sequence[float],
+    ss: Sequence[float],
+    set_ids: Optional[Sequence[int]] = None,
+    *,
+    engine: str = "stdlib",
+) -> array:
+    """Composite score per row, normalizing within comparison sets.
+
+    ``set_ids[i]`` is row i's comparison set (0..n-1); None means all rows share one set.
+    The numpy engine matches the stdlib engine to floating point rounding of exp().
+    """
+
+    n = len(rr)
+    if engine == "numpy":
+        if set_ids is None:
+            groups = np.zeros(n, dtype=np.intp)
+        else:
+            groups = np.asarray(set_ids, dtype=np.intp)
+        n_groups = int(groups.max()) + 1 if n else 0
+        wr, wc, wl, ws = SCORE_WEIGHTS
+        R, C, L, S = (
+            _np_robust_norm_grouped(np.asarray(col, dtype=np.float64), groups, n_groups) for col in (rr, cc, ll, ss)
+        )
+        return array("d", (wr * R + wc * C + wl * L + ws * S).tobytes())
+
+    if set_ids is None:
+        return array("d", _score_comparison_set(rr, cc, ll, ss))
+
+    members: Dict[int, List[int]] = {}
+    for idx, sid in enumerate(set_ids):
+        members.setdefault(sid, []).append(idx)
+
+    scores = array("d", bytes(8 * n))
+    for idxs in members.values():
+        set_scores = _score_comparison_set(
+            [rr[i] for i in idxs],
+            [cc[i] for i in idxs],
+            [ll[i] for i in idxs],
+            [ss[i] for i in idxs],
+        )
+        for idx, score in zip(idxs, set_scores):
+            scores[idx] = score
     return scores
 
 
-def _win_rate(rows: List[PostRow]) -> float:
-    """Heuristic win rate for v1.
+def _partition_sets(sizes: Sequence[int], n_parts: int) -> List[List[int]]:
+    """Deal set indexes, largest first, onto the least loaded of ``n_parts`` partitions."""
 
-    Because posts_export.csv doesn't carry WIN/NEUTRAL/LOSS explicitly in the minimal contract,
-    we compute win_rate from the decision label:
-    - win: keep|scale
-    - not win: iterate|kill
+    parts: List[List[int]] = [[] for _ in range(max(1, min(n_parts, len(sizes))))]
+    loads = [0] * len(parts)
+    for sid in sorted(range(len(sizes)), key=lambda i: (-sizes[i], i)):
+        target = loads.index(min(loads))
+        parts[target].append(sid)
+        loads[target] += sizes[sid]
+    return parts
+
+
+def _score_partition(part: Tuple[array, array, array, array, array], engine: str) -> array:
+    rr, cc, ll, ss, local_ids = part
+    return _score_sets(rr, cc, ll, ss, local_ids, engine=engine)
+
+
+def _score_set_members(
+    rr: Sequence[float],
+    cc: Sequence[float],
+    ll: Sequence[float],
+    ss: Sequence[float],
+    members: Sequence[Sequence[int]],
+    *,
+    engine: str,
+    workers: int,
+) -> List[array]:
+    """Scores for each comparison set (``members[s]`` = row indexes of set s), one array per set.
+
+    Sets are independent, so with workers > 1 they are split into balanced partitions and
+    scored in a process pool. Results are gathered per partition in submission order, so
+    they are identical to a serial run regardless of which worker finishes first.
     """
 
+    parts = _partition_sets([len(m) for m in members], workers)
+    payloads = []
+    for part in parts:
+        idxs = array("I")
+        local_ids = array("I")
+        for local_id, sid in enumerate(part):
+            idxs.extend(members[sid])
+            local_ids.extend([local_id] * len(members[sid]))
+        payloads.append(tuple(array("d", (col[i] for i in idxs)) for col in (rr, cc, ll, ss)) + (local_ids,))
+
+    if len(parts) > 1:
+        with ProcessPoolExecutor(max_workers=len(parts)) as pool:
+            results = list(pool.map(_score_partition, payloads, [engine] * len(parts)))
+    else:
+        results = [_score_partition(payload, engine) for payload in payloads]
+
+    out: List[array] = [array("d") for _ in members]
+    for part, scores in zip(parts, results):
+        start = 0
+        for sid in part:
+            end = start + len(members[sid])
+            out[sid] = scores[start:end]
+            start = end
+    return out
+
+
+def _resolve_workers(workers: int) -> int:
+    if workers < 0:
+        raise SystemExit("--workers must be >= 0")
+    return workers or os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class DerivedMetrics:
+    """Derived metrics for valid rows, aligned with the PostColumns they came from.
+
+    Built once per run by _derive_metrics; scoring and every rollup pass read from it
+    instead of recomputing retention, save/share rate or duration band per pass.
+    """
+
+    retention_ratio: array
+    save_share_rate: array
+    duration_band: List[str]
+    # Comparison set = (platform, duration_band, block_id); set_keys[set_ids[i]] is row i's set.
+    set_ids: array
+    set_keys: List[Tuple[str, str, str]]
+    score: array
+    # Not part of the score; reported by --rollup-schema v02 rollups.
+    velocity: array
+    comment_rate: array
+    # Lift vs the block baseline (see _label_outcomes): OUTCOME_LABELS code or -1, and the
+    # per-row win outcome the rollups count (1 win, 0 not a win, -1 not counted).
+    lift_label: array
+    outcome: array
+    block_baselines: Dict[str, Tuple[float, float]]
+
+
+def _derive_metrics(
+    cols: PostColumns, *, engine: str = "stdlib", workers: int = 1, win_rate_source: str = "decision"
+) -> DerivedMetrics:
+    if engine == "numpy":
+        avg = np.frombuffer(cols.numeric["avg_view_duration_sec"], dtype=np.float64)
+        dur = np.frombuffer(cols.numeric["duration_sec"], dtype=np.float64)
+        views = np.frombuffer(cols.numeric["views_24h"], dtype=np.float64)
+        shares = np.frombuffer(cols.numeric["shares"], dtype=np.float64)
+        saves = np.frombuffer(cols.numeric["saves"], dtype=np.float64)
+        views_1h = np.frombuffer(cols.numeric["views_1h"], dtype=np.float64)
+        comments = np.frombuffer(cols.numeric["comments"], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rr_np = np.where((dur > 0) & ~np.isnan(avg), np.minimum(1.0, avg / dur), np.nan)
+            engaged = np.where(np.isnan(shares), 0.0, shares) + np.where(np.isnan(saves), 0.0, saves)
+            ss_np = np.where(views > 0, engaged / np.maximum(1.0, views), np.nan)
+            vel_np = (views - views_1h) / VELOCITY_HOURS
+            cr_np = np.where(views > 0, comments / np.maximum(1.0, views), np.nan)
+        rr = array("d", rr_np.tobytes())
+        ss = array("d", ss_np.tobytes())
+        velocity = array("d", vel_np.tobytes())
+        comment_rate = array("d", cr_np.tobytes())
+    else:
+        rr = _retention_ratio_column(cols)
+        ss = _save_share_rate_column(cols)
+        velocity, comment_rate = _velocity_comment_rate_columns(cols)
+
+    bands = _duration_band_column(cols)
+    platforms = cols.codes["platform"]
+    blocks = cols.codes["block_id"]
+
+    set_index: Dict[Tuple[int, str, int], int] = {}
+    set_keys: List[Tuple[str, str, str]] = []
+    set_ids = array("I", bytes(4 * len(cols)))
+    for idx in range(len(cols)):
+        key = (platforms[idx], bands[idx], blocks[idx])
+        sid = set_index.get(key)
+        if sid is None:
+            sid = set_index[key] = len(set_keys)
+            set_keys.append((cols.labels["platform"][key[0]], key[1], cols.labels["block_id"][key[2]]))
+        set_ids[idx] = sid
+
+    cc = cols.numeric["completion_pct"]
+    ll = cols.numeric["loop_pct"]
+    if workers > 1 and len(set_keys) > 1:
+        members: List[array] = [array("I") for _ in set_keys]
+        for idx, sid in enumerate(set_ids):
+            members[sid].append(idx)
+        score = array("d", bytes(8 * len(cols)))
+        for idxs, set_scores in zip(
+            members, _score_set_members(rr, cc, ll, ss, members, engine=engine, workers=workers)
+        ):
+            for i, v in zip(idxs, set_scores):
+                score[i] = v
+    else:
+        score = _score_sets(rr, cc, ll, ss, set_ids, engine=engine)
+
+    control_by_code = [_parse_bool(v) is True for v in cols.labels["is_control"]]
+    is_control = [control_by_code[c] for c in cols.codes["is_control"]]
+    decided_by_code = [_outcome_code(_decision_outcome(d)) for d in cols.labels["decision"]]
+    decided = [decided_by_code[c] for c in cols.codes["decision"]]
+    baselines = _block_baselines(zip(blocks, cc, ss, is_control))
+    lift_label, outcome = _label_outcomes(blocks, cc, ss, is_control, decided, baselines, source=win_rate_source)
+    return DerivedMetrics(
+        retention_ratio=rr,
+        save_share_rate=ss,
+        duration_band=bands,
+        set_ids=set_ids,
+        set_keys=set_keys,
+        score=score,
+        velocity=velocity,
+        comment_rate=comment_rate,
+        lift_label=lift_label,
+        outcome=outcome,
+        block_baselines={cols.labels["block_id"][code]: base for code, base in baselines.items()},
+    )
+
+
+def _decision_outcome(decision: str) -> Optional[bool]:
+    """Map a decision label to win (True), not win (False) or not counted (None)."""
+
+    d = decision.strip().lower()
+    if d in {"keep", "scale"}:
+        return True
+    if d in {"iterate", "kill"}:
+        return False
+    return None
+
+
+def _win_rate(outcomes: Iterable[Optional[bool]]) -> float:
+    """Share of counted outcomes (None = not counted) that are wins."""
+
     wins = 0
     total = 0
-    for r in rows:
-        d = r.decision.strip().lower()
-        if d == "invalid":
-            continue
-        if d not in {"keep", "iterate", "kill", "scale"}:
+    for outcome in outcomes:
+        if outcome is None:
             continue
         total += 1
-        if d in {"keep", "scale"}:
+        if outcome:
             wins += 1
     return 0.0 if total == 0 else wins / total
 
 
-def _group_rollups(
-    week_id: str,
-    rows: List[PostRow],
-    scores_by_idx: Dict[int, float],
-    group_field: str,
-) -> List[Dict[str, Any]]:
-    """Build rollup dict rows.
+# Outcome labels (analytics/schema.md §6.2), from lift vs the block's control baseline.
+# posts_export.csv carries no risk flag column; rows with a restriction_state or other
+# INVALID_REASON are already excluded before labeling.
+WIN_RATE_SOURCES = ("lift", "decision")
+OUTCOME_LABELS = ("LOSS", "NEUTRAL", "WIN")
+LIFT_EPSILON = 1e-9
+LIFT_WIN_MIN = 0.10
+LIFT_LOSS_MAX = -0.05
+_LABEL_WIN = OUTCOME_LABELS.index("WIN")
+_UNLABELED = -1
+
+
+def _outcome_code(outcome: Optional[bool]) -> int:
+    return _UNLABELED if outcome is None else int(outcome)
+
 
-    group_field: "hook_type" or "vertical".
+def _lift(value: float, baseline: float) -> float:
+    return (value - baseline) / max(LIFT_EPSILON, baseline)
+
+
+def _lift_label(completion: float, save_share: float, baseline: Tuple[float, float]) -> int:
+    """OUTCOME_LABELS code for a variant row against its block baseline; -1 if a value is missing."""
+
+    base_c, base_ss = baseline
+    if math.isnan(completion) or math.isnan(save_share) or math.isnan(base_c) or math.isnan(base_ss):
+        return _UNLABELED
+    lift_c = _lift(completion, base_c)
+    lift_ss = _lift(save_share, base_ss)
+    if lift_c >= LIFT_WIN_MIN and lift_ss >= LIFT_WIN_MIN:
+        return _LABEL_WIN
+    if lift_c <= LIFT_LOSS_MAX or lift_ss <= LIFT_LOSS_MAX:
+        return OUTCOME_LABELS.index("LOSS")
+    return OUTCOME_LABELS.index("NEUTRAL")
+
+
+def _block_baselines(rows: Iterable[Tuple[Any, float, float, bool]]) -> Dict[Any, Tuple[float, float]]:
+    """Median completion and save+share rate of each block's control rows.
+
+    ``rows`` yields (block, completion, save_share_rate, is_control). Blocks without a
+    control row get no entry; a metric with no control values is NaN.
     """
 
-    grouped: Dict[Tuple[str, str, str, str], List[int]] = {}
-    for idx, r in enumerate(rows):
-        key = (r.platform, _duration_band(r.duration_sec), r.block_id, getattr(r, group_field))
-        grouped.setdefault(key, []).append(idx)
-
-    out: List[Dict[str, Any]] = []
-    for (platform, band, block_id, group_val), idxs in sorted(grouped.items(), key=lambda x: x[0]):
-        g_rows = [rows[i] for i in idxs]
-        completions = [rows[i].completion_pct for i in idxs if rows[i].completion_pct is not None]
-        loops = [rows[i].loop_pct for i in idxs if rows[i].loop_pct is not None]
-        ret = [_retention_ratio(rows[i]) for i in idxs if _retention_ratio(rows[i]) is not None]
-        ssr = [_save_share_rate(rows[i]) for i in idxs if _save_share_rate(rows[i]) is not None]
-        score_vals = [scores_by_idx.get(i) for i in idxs if i in scores_by_idx]
-
-        row: Dict[str, Any] = {
-            "week_id": week_id,
-            "platform": platform,
-            "duration_band": band,
-            "block_id": block_id,
-            group_field: group_val,
-            f"{group_field}_samples" if group_field != "hook_type" else "hook_samples": len(idxs),
-        }
+    controls: Dict[Any, Tuple[List[float], List[float]]] = {}
+    for block, completion, save_share, is_control in rows:
+        if not is_control:
+            continue
+        c_vals, ss_vals = controls.setdefault(block, ([], []))
+        if not math.isnan(completion):
+            c_vals.append(completion)
+        if not math.isnan(save_share):
+            ss_vals.append(save_share)
+    return {
+        block: (_median_exact(c_vals) if c_vals else math.nan, _median_exact(ss_vals) if ss_vals else math.nan)
+        for block, (c_vals, ss_vals) in controls.items()
+    }
 
-        # Column names must match csv_appendix_schema.*
-        if group_field == "hook_type":
-            row.update(
-                {
-                    "hook_samples": len(idxs),
-                    "hook_win_rate": _win_rate(g_rows),
-                    "hook_median_completion": median(completions) if completions else None,
-                    "hook_median_loop": median(loops) if loops else None,
-                    "hook_median_retention_ratio": median(ret) if ret else None,
-                    "hook_median_save_share_rate": median(ssr) if ssr else None,
-                    "hook_score_median": (
-                        median([float(x) for x in score_vals if x is not None]) if score_vals else None
-                    ),
-                }
-            )
-        elif group_field == "vertical":
-            row.update(
-                {
-                    "vertical_samples": len(idxs),
-                    "vertical_win_rate": _win_rate(g_rows),
-                    "vertical_median_completion": median(completions) if completions else None,
-                    "vertical_median_loop": median(loops) if loops else None,
-                    "vertical_median_retention_ratio": median(ret) if ret else None,
-                    "vertical_median_save_share_rate": median(ssr) if ssr else None,
-                    "vertical_score_median": (
-                        median([float(x) for x in score_vals if x is not None]) if score_vals else None
-                    ),
-                }
-            )
+
+def _label_outcomes(
+    blocks: Iterable[Any],
+    completion: Sequence[float],
+    save_share: Sequence[float],
+    is_control: Sequence[bool],
+    decided: Sequence[int],
+    baselines: Dict[Any, Tuple[float, float]],
+    *,
+    source: str = "decision",
+) -> Tuple[array, array]:
+    """Label every row in one pass: (OUTCOME_LABELS codes, win outcome codes).
+
+    Baselines are looked up per row by block, so this is O(n) however many blocks there
+    are. Control rows and rows of blocks without a baseline stay unlabeled (-1).
+
+    Outcomes are 1 (win), 0 (not a win) or -1 (not counted), starting from ``decided``
+    (the decision heuristic, see _decision_outcome). With source "lift", rows of a block
+    that has a baseline are judged by their label instead: only WIN is a win, and the
+    controls themselves are not counted.
+    """
+
+    labels = array("b")
+    outcome = array("b", decided)
+    by_lift = source == "lift"
+    for i, (block, c, ss, control) in enumerate(zip(blocks, completion, save_share, is_control)):
+        baseline = baselines.get(block)
+        if baseline is None:
+            labels.append(_UNLABELED)
+            continue
+        label = _UNLABELED if control else _lift_label(c, ss, baseline)
+        labels.append(label)
+        if by_lift:
+            outcome[i] = _UNLABELED if label == _UNLABELED else int(label == _LABEL_WIN)
+    return labels, outcome
+
+
+def _win_rate_at(outcome: Sequence[int], idxs: Iterable[int]) -> float:
+    return _win_rate(None if outcome[i] == _UNLABELED else outcome[i] == 1 for i in idxs)
+
+
+def _outcome_label_counts(
+    labels: Iterable[int], block_ids: Iterable[str], baselines: Dict[str, Tuple[float, float]], source: str
+) -> Dict[str, Any]:
+    """The dataset_health.json "outcome_labels" block.
+
+    ``block_ids`` are the blocks of the valid rows; those without a baseline (no control
+    rows) are listed as decision_fallback_blocks, since their win rates use decision labels.
+    """
+
+    counts = [0] * len(OUTCOME_LABELS)
+    unlabeled = 0
+    for label in labels:
+        if label == _UNLABELED:
+            unlabeled += 1
         else:
-            raise ValueError(f"unsupported group_field: {group_field}")
+            counts[label] += 1
+    return {
+        "win_rate_source": source,
+        "blocks_with_baseline": len(baselines),
+        "decision_fallback_blocks": sorted(set(block_ids) - set(baselines)),
+        "labels": dict(zip(OUTCOME_LABELS, counts)),
+        "unlabeled": unlabeled,
+    }
 
-        out.append(row)
-    return out
 
+def _parse_rollup_dimension(spec: str) -> Tuple[str, ...]:
+    dim = tuple(f.strip() for f in spec.split("+") if f.strip())
+    unknown = [f for f in dim if f not in ROLLUP_DIMENSION_FIELDS]
+    if not dim or unknown or len(set(dim)) != len(dim):
+        raise SystemExit(
+            f"unsupported rollup dimension '{spec}' (use fields from {', '.join(ROLLUP_DIMENSION_FIELDS)}, joined by '+')"
+        )
+    return dim
 
-def _write_hooks_rollup(path: Path, rows: List[Dict[str, Any]]) -> None:
-    cols = [
-        "week_id",
-        "platform",
-        "duration_band",
-        "block_id",
-        "hook_type",
-        "hook_samples",
-        "hook_win_rate",
-        "hook_median_completion",
-        "hook_median_loop",
-        "hook_median_retention_ratio",
-        "hook_median_save_share_rate",
-        "hook_score_median",
-    ]
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=cols)
-        w.writeheader()
-        for r in rows:
-            out = dict(r)
-            for k in cols:
-                if isinstance(out.get(k), float) or out.get(k) is None:
-                    out[k] = _format_float(out.get(k))
-            w.writerow(out)
+
+def _rollup_name(dim: Tuple[str, ...]) -> str:
+    return "_".join(dim)
+
+
+def _rollup_prefix(dim: Tuple[str, ...]) -> str:
+    # Column names must match csv_appendix_schema.* for the published hook/vertical rollups.
+    return "hook" if dim == HOOKS_DIMENSION else _rollup_name(dim)
 
 
-def _write_verticals_rollup(path: Path, rows: List[Dict[str, Any]]) -> None:
-    cols = [
+def _rollup_columns(dim: Tuple[str, ...], schema: str = "v01") -> List[str]:
+    prefix = _rollup_prefix(dim)
+    columns = [
         "week_id",
         "platform",
         "duration_band",
         "block_id",
-        "vertical",
-        "vertical_samples",
-        "vertical_win_rate",
-        "vertical_median_completion",
-        "vertical_median_loop",
-        "vertical_median_retention_ratio",
-        "vertical_median_save_share_rate",
-        "vertical_score_median",
+        *dim,
+        f"{prefix}_samples",
+        f"{prefix}_win_rate",
+        f"{prefix}_median_completion",
+        f"{prefix}_median_loop",
+        f"{prefix}_median_retention_ratio",
+        f"{prefix}_median_save_share_rate",
+        f"{prefix}_score_median",
     ]
+    if schema != "v01":
+        columns += [f"{prefix}_median_velocity", f"{prefix}_median_comment_rate"]
+    return columns
+
+
+# Groups at least this large take a linear-time selection path instead of a full sort.
+_NP_SELECT_MIN = 4096
+_PY_SELECT_MIN = 500_000
+
+
+def _select(values: Sequence[float], k: int) -> float:
+    """k-th smallest value (0-based) by iterative quickselect with a median-of-three pivot."""
+
+    items = list(values)
+    while len(items) > 32:
+        pivot = sorted((items[0], items[len(items) // 2], items[-1]))[1]
+        lower = [x for x in items if x < pivot]
+        if k < len(lower):
+            items = lower
+            continue
+        upper = [x for x in items if x > pivot]
+        n_equal = len(items) - len(lower) - len(upper)
+        if k < len(lower) + n_equal:
+            return pivot
+        k -= len(lower) + n_equal
+        items = upper
+    return sorted(items)[k]
+
+
+def _median_exact(values: Sequence[float]) -> float:
+    """Same value as statistics.median, in linear time for large groups.
+
+    NumPy's introselect (np.partition) is used from _NP_SELECT_MIN values; without NumPy,
+    pure Python quickselect only beats the C sort for very large groups.
+    """
+
+    n = len(values)
+    mid = n // 2
+    if np is not None and n >= _NP_SELECT_MIN:
+        part = np.partition(np.fromiter(values, dtype=np.float64, count=n), [mid - 1, mid] if n % 2 == 0 else mid)
+        if n % 2:
+            return float(part[mid])
+        return (float(part[mid - 1]) + float(part[mid])) / 2
+    if n >= _PY_SELECT_MIN:
+        if n % 2:
+            return _select(values, mid)
+        return (_select(values, mid - 1) + _select(values, mid)) / 2
+    return median(values)
+
+
+def _rollup_row(
+    week_id: str,
+    dim: Tuple[str, ...],
+    set_key: Tuple[str, str, str],
+    group_vals: Tuple[str, ...],
+    *,
+    samples: int,
+    win_rate: float,
+    completions: List[float],
+    loops: List[float],
+    ret: List[float],
+    ssr: List[float],
+    score_vals: List[float],
+    velocity: Optional[List[float]] = None,
+    comment_rate: Optional[List[float]] = None,
+) -> Dict[str, Any]:
+    """Build one rollup dict row from a group's (already filtered) metric values.
+
+    ``velocity`` and ``comment_rate`` are passed only for --rollup-schema v02 rollups.
+    """
+
+    platform, band, block_id = set_key
+    row: Dict[str, Any] = {
+        "week_id": week_id,
+        "platform": platform,
+        "duration_band": band,
+        "block_id": block_id,
+    }
+    row.update(zip(dim, group_vals))
+
+    prefix = _rollup_prefix(dim)
+    row.update(
+        {
+            f"{prefix}_samples": samples,
+            f"{prefix}_win_rate": win_rate,
+            f"{prefix}_median_completion": _median_exact(completions) if completions else None,
+            f"{prefix}_median_loop": _median_exact(loops) if loops else None,
+            f"{prefix}_median_retention_ratio": _median_exact(ret) if ret else None,
+            f"{prefix}_median_save_share_rate": _median_exact(ssr) if ssr else None,
+            f"{prefix}_score_median": _median_exact(score_vals) if score_vals else None,
+        }
+    )
+    if velocity is not None:
+        row[f"{prefix}_median_velocity"] = _median_exact(velocity) if velocity else None
+    if comment_rate is not None:
+        row[f"{prefix}_median_comment_rate"] = _median_exact(comment_rate) if comment_rate else None
+    return row
+
+
+def _present(col: Sequence[float], idxs: Sequence[int]) -> List[float]:
+    """Column slice at ``idxs`` with missing (NaN) values dropped."""
+
+    return [x for x in (col[i] for i in idxs) if not math.isnan(x)]
+
+
+def _multi_rollups(
+    week_id: str,
+    cols: PostColumns,
+    derived: DerivedMetrics,
+    dims: Sequence[Tuple[str, ...]],
+    *,
+    schema: str = "v01",
+) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+    """Build rollup dict rows for every dimension in ``dims`` from one scan of the rows.
+
+    A dimension is a tuple of ROLLUP_DIMENSION_FIELDS; groups are keyed by comparison set
+    plus the dimension's label codes, and each rollup is sorted by its decoded key.
+    """
+
+    set_ids = derived.set_ids
+    code_cols = [[cols.codes[f] for f in dim] for dim in dims]
+    grouped: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in dims]
+
+    for idx in range(len(cols)):
+        sid = set_ids[idx]
+        for groups, dim_codes in zip(grouped, code_cols):
+            groups.setdefault((sid, *[c[idx] for c in dim_codes]), []).append(idx)
+
+    completion = cols.numeric["completion_pct"]
+    loop = cols.numeric["loop_pct"]
+    v01 = schema == "v01"
+
+    out: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for dim, groups in zip(dims, grouped):
+        labels = [cols.labels[f] for f in dim]
+        keyed = [
+            (derived.set_keys[key[0]], tuple(lbl[c] for lbl, c in zip(labels, key[1:])), idxs)
+            for key, idxs in groups.items()
+        ]
+        keyed.sort(key=lambda x: (x[0], x[1]))
+        out[dim] = [
+            _rollup_row(
+                week_id,
+                dim,
+                set_key,
+                group_vals,
+                samples=len(idxs),
+                win_rate=_win_rate_at(derived.outcome, idxs),
+                completions=_present(completion, idxs),
+                loops=_present(loop, idxs),
+                ret=_present(derived.retention_ratio, idxs),
+                ssr=_present(derived.save_share_rate, idxs),
+                score_vals=[derived.score[i] for i in idxs],
+                velocity=None if v01 else _present(derived.velocity, idxs),
+                comment_rate=None if v01 else _present(derived.comment_rate, idxs),
+            )
+            for set_key, group_vals, idxs in keyed
+        ]
+    return out
+
+
+class _ComparisonSetAccumulator:
+    """Per comparison set buffers for --streaming mode.
+
+    Median/MAD normalization needs every value in the comparison set, so the four score
+    inputs (plus velocity and comment rate for v02 rollups) are kept as compact float arrays
+    (NaN = missing) rather than whole rows. Win
+    outcomes need the block baseline, which is only known once every row has been seen, so
+    each row's control flag and decision outcome code are kept alongside.
+    """
+
+    __slots__ = ("rr", "cc", "ll", "ss", "vv", "cr", "control", "decided", "members")
+
+    def __init__(self, dims: Sequence[Tuple[str, ...]]) -> None:
+        self.rr = array("d")
+        self.cc = array("d")
+        self.ll = array("d")
+        self.ss = array("d")
+        self.vv = array("d")
+        self.cr = array("d")
+        self.control = array("b")
+        self.decided = array("b")
+        # dimension -> group values -> local positions within this set.
+        self.members: Dict[Tuple[str, ...], Dict[Tuple[str, ...], array]] = {dim: {} for dim in dims}
+
+    def add(self, row: PostRow) -> None:
+        pos = len(self.rr)
+        for buf, v in (
+            (self.rr, _retention_ratio(row)),
+            (self.cc, row.completion_pct),
+            (self.ll, row.loop_pct),
+            (self.ss, _save_share_rate(row)),
+            (self.vv, _velocity(row)),
+            (self.cr, _comment_rate(row)),
+        ):
+            buf.append(math.nan if v is None else v)
+        self.control.append(_parse_bool(row.is_control) is True)
+        self.decided.append(_outcome_code(_decision_outcome(row.decision)))
+
+        for dim, members in self.members.items():
+            members.setdefault(tuple(getattr(row, f) for f in dim), array("I")).append(pos)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "rr": _pack_array(self.rr),
+            "cc": _pack_array(self.cc),
+            "ll": _pack_array(self.ll),
+            "ss": _pack_array(self.ss),
+            "vv": _pack_array(self.vv),
+            "cr": _pack_array(self.cr),
+            "control": _pack_array(self.control),
+            "decided": _pack_array(self.decided),
+            "groups": [
+                {"dim": list(dim), "values": list(group_vals), "positions": _pack_array(positions)}
+                for dim, members in self.members.items()
+                for group_vals, positions in members.items()
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, dims: Sequence[Tuple[str, ...]], state: Dict[str, Any]) -> "_ComparisonSetAccumulator":
+        acc = cls(dims)
+        acc.rr = _unpack_array("d", state["rr"])
+        acc.cc = _unpack_array("d", state["cc"])
+        acc.ll = _unpack_array("d", state["ll"])
+        acc.ss = _unpack_array("d", state["ss"])
+        acc.vv = _unpack_array("d", state["vv"])
+        acc.cr = _unpack_array("d", state["cr"])
+        acc.control = _unpack_array("b", state["control"])
+        acc.decided = _unpack_array("b", state["decided"])
+        for g in state["groups"]:
+            members = acc.members.get(tuple(g["dim"]))
+            if members is not None:
+                members[tuple(g["values"])] = _unpack_array("I", g["positions"])
+        return acc
+
+    def merge(self, other: "_ComparisonSetAccumulator") -> None:
+        """Append ``other``'s rows after this set's own (positions are shifted accordingly)."""
+
+        shift = len(self.rr)
+        self.rr.extend(other.rr)
+        self.cc.extend(other.cc)
+        self.ll.extend(other.ll)
+        self.ss.extend(other.ss)
+        self.vv.extend(other.vv)
+        self.cr.extend(other.cr)
+        self.control.extend(other.control)
+        self.decided.extend(other.decided)
+        for dim, members in other.members.items():
+            for group_vals, positions in members.items():
+                mine = self.members[dim].setdefault(group_vals, array("I"))
+                mine.extend(p + shift for p in positions)
+
+
+class _StreamingAggregator:
+    """Single-pass aggregation over a row iterator.
+
+    Dataset health (validity counts, invalid reasons, date range, duration band flag)
+    updates incrementally; valid rows are folded into per comparison set accumulators and
+    then discarded, so no PostRow survives past its own iteration.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: str = "stdlib",
+        dims: Sequence[Tuple[str, ...]] = (HOOKS_DIMENSION, VERTICALS_DIMENSION),
+        workers: int = 1,
+        win_rate_source: str = "decision",
+    ) -> None:
+        self.engine = engine
+        self.workers = workers
+        self.win_rate_source = win_rate_source
+        self.dims = list(dims)
+        self.total_posts = 0
+        self.valid_posts = 0
+        self.missing_metrics_count = 0
+        self.reason_counts: Dict[str, int] = {}
+        self.min_date: Optional[dt.date] = None
+        self.max_date: Optional[dt.date] = None
+        self.duration_out_of_band = False
+        self.sets: Dict[Tuple[str, str, str], _ComparisonSetAccumulator] = {}
+        self._scores: Dict[Tuple[str, str, str], array] = {}
+        # Per set (lift labels, win outcomes); see _label_all_sets.
+        self._labels: Dict[Tuple[str, str, str], Tuple[array, array]] = {}
+        self.block_baselines: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, row: PostRow) -> None:
+        self._scores.clear()
+        self._labels.clear()
+        self.total_posts += 1
+
+        try:
+            d = dt.date.fromisoformat(row.date)
+        except Exception:
+            d = None
+        if d is not None:
+            if self.min_date is None or d < self.min_date:
+                self.min_date = d
+            if self.max_date is None or d > self.max_date:
+                self.max_date = d
+
+        is_valid, missing = _is_valid(row)
+        if missing:
+            self.missing_metrics_count += 1
+        if not is_valid:
+            reason = _extract_invalid_reason(row.decision, row.notes, missing)
+            if reason:
+                self.reason_counts[reason] = self.reason_counts.get(reason, 0) + 1
+            return
+
+        self.valid_posts += 1
+        band = _duration_band(row.duration_sec)
+        if band == "other":
+            self.duration_out_of_band = True
+        key = (row.platform, band, row.block_id)
+        acc = self.sets.get(key)
+        if acc is None:
+            acc = self.sets[key] = _ComparisonSetAccumulator(self.dims)
+        acc.add(row)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Everything add() has accumulated, as JSON-serializable data (see --incremental)."""
+
+        return {
+            "dims": [list(dim) for dim in self.dims],
+            "total_posts": self.total_posts,
+            "valid_posts": self.valid_posts,
+            "missing_metrics_count": self.missing_metrics_count,
+            "reason_counts": self.reason_counts,
+            "min_date": None if self.min_date is None else self.min_date.isoformat(),
+            "max_date": None if self.max_date is None else self.max_date.isoformat(),
+            "duration_out_of_band": self.duration_out_of_band,
+            "sets": [{"key": list(key), **acc.to_state()} for key, acc in self.sets.items()],
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Dict[str, Any],
+        *,
+        engine: str = "stdlib",
+        workers: int = 1,
+        win_rate_source: str = "decision",
+        dims: Optional[Sequence[Tuple[str, ...]]] = None,
+    ) -> "_StreamingAggregator":
+        """Rebuild from to_state(); ``dims`` keeps only those of the state's dimensions."""
+
+        dims = [tuple(dim) for dim in state["dims"]] if dims is None else list(dims)
+        agg = cls(engine=engine, dims=dims, workers=workers, win_rate_source=win_rate_source)
+        agg.total_posts = int(state["total_posts"])
+        agg.valid_posts = int(state["valid_posts"])
+        agg.missing_metrics_count = int(state["missing_metrics_count"])
+        agg.reason_counts = {str(k): int(v) for k, v in state["reason_counts"].items()}
+        agg.min_date = None if state["min_date"] is None else dt.date.fromisoformat(state["min_date"])
+        agg.max_date = None if state["max_date"] is None else dt.date.fromisoformat(state["max_date"])
+        agg.duration_out_of_band = bool(state["duration_out_of_band"])
+        for entry in state["sets"]:
+            platform, band, block_id = entry["key"]
+            agg.sets[(platform, band, block_id)] = _ComparisonSetAccumulator.from_state(dims, entry)
+        return agg
+
+    def merge(self, other: "_StreamingAggregator") -> None:
+        """Fold another aggregator (e.g. a different week's checkpoint) into this one."""
+
+        if list(other.dims) != self.dims:
+            raise ValueError("cannot merge aggregators with different rollup dimensions")
+        self._scores.clear()
+        self._labels.clear()
+        self.total_posts += other.total_posts
+        self.valid_posts += other.valid_posts
+        self.missing_metrics_count += other.missing_metrics_count
+        for reason, count in other.reason_counts.items():
+            self.reason_counts[reason] = self.reason_counts.get(reason, 0) + count
+        for d in (other.min_date, other.max_date):
+            if d is None:
+                continue
+            if self.min_date is None or d < self.min_date:
+                self.min_date = d
+            if self.max_date is None or d > self.max_date:
+                self.max_date = d
+        self.duration_out_of_band = self.duration_out_of_band or other.duration_out_of_band
+        for key, acc in other.sets.items():
+            mine = self.sets.get(key)
+            if mine is None:
+                mine = self.sets[key] = _ComparisonSetAccumulator(self.dims)
+            mine.merge(acc)
+
+    def posts_range(self) -> Optional[str]:
+        if self.min_date is None or self.max_date is None:
+            return None
+        return f"{self.min_date.isoformat()}..{self.max_date.isoformat()}"
+
+    def _score_all_sets(self) -> None:
+        pending = [key for key in self.sets if key not in self._scores]
+        if not pending:
+            return
+        if self.workers > 1 and len(pending) > 1:
+            # Concatenate the pending sets' buffers so they can be partitioned across the pool.
+            accs = [self.sets[key] for key in pending]
+            cols = [array("d"), array("d"), array("d"), array("d")]
+            members: List[range] = []
+            for acc in accs:
+                members.append(range(len(cols[0]), len(cols[0]) + len(acc.rr)))
+                for col, buf in zip(cols, (acc.rr, acc.cc, acc.ll, acc.ss)):
+                    col.extend(buf)
+            scored = _score_set_members(*cols, members, engine=self.engine, workers=self.workers)
+            self._scores.update(zip(pending, scored))
+            return
+        for key in pending:
+            acc = self.sets[key]
+            self._scores[key] = _score_sets(acc.rr, acc.cc, acc.ll, acc.ss, engine=self.engine)
+
+    def _label_all_sets(self) -> None:
+        if self._labels or not self.sets:
+            return
+        # A block spans every (platform, duration_band) set that shares its block_id.
+        self.block_baselines = _block_baselines(
+            row for key, acc in self.sets.items() for row in zip(itertools.repeat(key[2]), acc.cc, acc.ss, acc.control)
+        )
+        for key, acc in self.sets.items():
+            self._labels[key] = _label_outcomes(
+                itertools.repeat(key[2]),
+                acc.cc,
+                acc.ss,
+                acc.control,
+                acc.decided,
+                self.block_baselines,
+                source=self.win_rate_source,
+            )
+
+    def metric_histograms(self) -> metric_drift.Histograms:
+        import metric_drift
+
+        hists: metric_drift.Histograms = {}
+        for (platform, _, _), acc in self.sets.items():
+            metric_drift.add_values(hists, platform, "completion_pct", acc.cc)
+            metric_drift.add_values(hists, platform, "loop_pct", acc.ll)
+        return hists
+
+    def outcome_labels(self) -> Dict[str, Any]:
+        """The dataset_health.json "outcome_labels" block for every row seen so far."""
+
+        self._label_all_sets()
+        return _outcome_label_counts(
+            itertools.chain.from_iterable(labels for labels, _ in self._labels.values()),
+            (block_id for _, _, block_id in self.sets),
+            self.block_baselines,
+            self.win_rate_source,
+        )
+
+    def rollups(self, week_id: str, dim: Tuple[str, ...], schema: str = "v01") -> List[Dict[str, Any]]:
+        self._score_all_sets()
+        self._label_all_sets()
+        keyed = []
+        for set_key, acc in self.sets.items():
+            scores = self._scores[set_key]
+            outcome = self._labels[set_key][1]
+            for group_vals, positions in acc.members[dim].items():
+                keyed.append((set_key, group_vals, acc, scores, outcome, positions))
+        keyed.sort(key=lambda x: (x[0], x[1]))
+
+        out: List[Dict[str, Any]] = []
+        for set_key, group_vals, acc, scores, outcome, positions in keyed:
+            out.append(
+                _rollup_row(
+                    week_id,
+                    dim,
+                    set_key,
+                    group_vals,
+                    samples=len(positions),
+                    win_rate=_win_rate_at(outcome, positions),
+                    completions=_present(acc.cc, positions),
+                    loops=_present(acc.ll, positions),
+                    ret=_present(acc.rr, positions),
+                    ssr=_present(acc.ss, positions),
+                    score_vals=[scores[i] for i in positions],
+                    velocity=None if schema == "v01" else _present(acc.vv, positions),
+                    comment_rate=None if schema == "v01" else _present(acc.cr, positions),
+                )
+            )
+        return out
+
+
+def _write_rollup(
+    path: Path,
+    dim: Tuple[str, ...],
+    rows: List[Dict[str, Any]],
+    *,
+    leading_columns: Sequence[str] = (),
+    schema: str = "v01",
+) -> None:
+    cols = [*leading_columns, *_rollup_columns(dim, schema)]
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as f:
         w = csv.DictWriter(f, fieldnames=cols)
@@ -399,11 +1696,12 @@ def _write_verticals_rollup(path: Path, rows: List[Dict[str, Any]]) -> None:
             w.writerow(out)
 
 
-def _compute_date_range(rows: List[PostRow]) -> Optional[str]:
+def _compute_date_range(cols: PostColumns) -> Optional[str]:
+    # Dates are dictionary-encoded, so only distinct values need parsing.
     ds: List[dt.date] = []
-    for r in rows:
+    for d in cols.labels["date"]:
         try:
-            ds.append(dt.date.fromisoformat(r.date))
+            ds.append(dt.date.fromisoformat(d))
         except Exception:
             continue
     if not ds:
@@ -426,6 +1724,8 @@ def _write_dataset_health(
     incident_flags: List[str],
     notes: str,
     computed_at_utc: str,
+    outcome_labels: Optional[Dict[str, Any]] = None,
+    drift: Optional[Dict[str, Any]] = None,
 ) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     payload = {
@@ -447,6 +1747,10 @@ def _write_dataset_health(
         "notes": notes,
         "computed_at_utc": computed_at_utc,
     }
+    if outcome_labels is not None:
+        payload["outcome_labels"] = outcome_labels
+    if drift is not None:
+        payload["drift"] = drift
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
@@ -473,6 +1777,463 @@ def _resolve_run_paths(run_json_path: Path) -> Tuple[str, Path, Path, Path, Path
     return week_id, rp("posts_export"), rp("hooks_rollup"), rp("verticals_rollup"), rp("dataset_health"), posts_source
 
 
+# --incremental checkpoint, written next to run.json. Bump the version whenever the
+# accumulator state layout or row validity rules change; older checkpoints then trigger a
+# full recompute.
+AGGREGATE_STATE_FILENAME = "aggregate_state.json"
+_AGGREGATE_STATE_VERSION = 4
+
+
+def _pack_array(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack_array(typecode: str, packed: str) -> array:
+    out = array(typecode)
+    out.frombytes(base64.b64decode(packed))
+    return out
+
+
+def _array_layout() -> str:
+    # Packed arrays are raw machine bytes; a checkpoint is only reusable on the same layout.
+    return f"{sys.byteorder}:d{array('d').itemsize}:I{array('I').itemsize}"
+
+
+def _scan_export(path: Path, offset: int, size: int) -> Tuple[str, str, bool]:
+    """One read of the export: sha256 of bytes [0, offset), of [0, size), and whether it ends in a newline."""
+
+    h = hashlib.sha256()
+    at_offset: Optional[str] = None
+    last = b""
+    pos = 0
+    with path.open("rb") as f:
+        while pos < size:
+            chunk = f.read(min(1 << 20, size - pos))
+            if not chunk:
+                break
+            if at_offset is None and pos + len(chunk) >= offset:
+                cut = offset - pos
+                h.update(chunk[:cut])
+                at_offset = h.hexdigest()
+                h.update(chunk[cut:])
+            else:
+                h.update(chunk)
+            pos += len(chunk)
+            last = chunk[-1:]
+    if at_offset is None:
+        at_offset = h.hexdigest()
+    return at_offset, h.hexdigest(), last == b"\n"
+
+
+def _load_checkpoint(
+    state_path: Path, posts_export: Path, dims: Sequence[Tuple[str, ...]], *, allow_extra_dims: bool = False
+) -> Optional[Dict[str, Any]]:
+    """The checkpoint at ``state_path`` if it was written for this export and these rollup dimensions.
+
+    With ``allow_extra_dims`` a checkpoint holding more dimensions than ``dims`` also qualifies.
+    """
+
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(state, dict)
+        or state.get("version") != _AGGREGATE_STATE_VERSION
+        or state.get("layout") != _array_layout()
+        or state.get("posts_export") != posts_export.name
+    ):
+        return None
+    saved = [tuple(d) for d in (state.get("aggregator") or {}).get("dims", [])]
+    if saved != list(dims) and not (allow_extra_dims and set(dims) <= set(saved)):
+        return None
+    return state
+
+
+def _write_checkpoint(
+    state_path: Path, posts_export: Path, agg: "_StreamingAggregator", size: int, digest: str
+) -> None:
+    payload = {
+        "version": _AGGREGATE_STATE_VERSION,
+        "layout": _array_layout(),
+        "posts_export": posts_export.name,
+        "offset": size,
+        "prefix_sha256": digest,
+        "aggregator": agg.to_state(),
+    }
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n", encoding="utf-8")
+    os.replace(tmp, state_path)
+
+
+def _run_incremental(
+    posts_export: Path,
+    state_path: Path,
+    *,
+    engine: str,
+    dims: Sequence[Tuple[str, ...]],
+    workers: int = 1,
+    win_rate_source: str = "decision",
+) -> "_StreamingAggregator":
+    """Streaming aggregation that resumes from the checkpoint and ingests only appended rows.
+
+    The checkpoint is trusted only if the export still starts with the exact bytes it
+    covered (sha256 of the prefix); anything else falls back to a full pass. A new
+    checkpoint is written only when the export ends on a row boundary and did not change
+    while it was being read.
+    """
+
+    size = posts_export.stat().st_size
+    checkpoint = _load_checkpoint(state_path, posts_export, dims)
+    offset = int(checkpoint["offset"]) if checkpoint is not None else 0
+    if offset > size:
+        checkpoint, offset = None, 0
+
+    prefix_digest, full_digest, ends_on_row = _scan_export(posts_export, offset, size)
+    if checkpoint is not None and checkpoint.get("prefix_sha256") == prefix_digest:
+        agg = _StreamingAggregator.from_state(
+            checkpoint["aggregator"],
+            engine=engine,
+            workers=workers,
+            win_rate_source=win_rate_source,
+        )
+        print(f"Incremental: resuming {posts_export.name} at byte {offset} of {size}")
+    else:
+        agg = _StreamingAggregator(engine=engine, dims=dims, workers=workers, win_rate_source=win_rate_source)
+        offset = 0
+        print(f"Incremental: no usable checkpoint, full pass over {posts_export.name}")
+
+    for r in _iter_posts_csv(posts_export, start=offset):
+        agg.add(r)
+
+    if ends_on_row and posts_export.stat().st_size == size:
+        _write_checkpoint(state_path, posts_export, agg, size, full_digest)
+    else:
+        state_path.unlink(missing_ok=True)
+    return agg
+
+
+# Per-week partial aggregate (_StreamingAggregator state) in the export's cache directory.
+WEEKLY_PARTIAL_FILENAME = "weekly_partial.json"
+
+
+def _read_weekly_partial(path: Path, posts_export: Path, dims: Sequence[Tuple[str, ...]]) -> Optional[Dict[str, Any]]:
+    """Cached aggregator state for ``posts_export`` covering at least ``dims``, or None."""
+
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("version") != _AGGREGATE_STATE_VERSION or state.get("layout") != _array_layout():
+            return None
+        if not set(dims) <= {tuple(d) for d in state["aggregator"]["dims"]}:
+            return None
+        if not _source_matches(state.get("source") or {}, posts_export):
+            return None
+        return state["aggregator"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _load_run_aggregate(
+    posts_export: Path,
+    state_path: Path,
+    *,
+    engine: str,
+    dims: Sequence[Tuple[str, ...]],
+    workers: int = 1,
+    win_rate_source: str = "decision",
+) -> "_StreamingAggregator":
+    """Aggregate of another run's export (for --decision-history and rolling windows).
+
+    The week's partial in its cache directory (WEEKLY_PARTIAL_FILENAME) is used while the
+    export is unchanged. On a miss, the run's --incremental checkpoint is resumed when the
+    export still begins with the bytes it covered, else the export is parsed in full; the
+    result is then saved as the week's partial. Nothing is written into the run's directory.
+    """
+
+    cache_dir = _export_cache_dir(posts_export)
+    partial_path = None if cache_dir is None else cache_dir / WEEKLY_PARTIAL_FILENAME
+    if partial_path is not None:
+        cached = _read_weekly_partial(partial_path, posts_export, dims)
+        if cached is not None:
+            return _StreamingAggregator.from_state(
+                cached, engine=engine, workers=workers, win_rate_source=win_rate_source, dims=dims
+            )
+
+    st = posts_export.stat()
+    source: Dict[str, Any] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    agg: Optional[_StreamingAggregator] = None
+    checkpoint = _load_checkpoint(state_path, posts_export, dims, allow_extra_dims=True)
+    offset = int(checkpoint["offset"]) if checkpoint is not None else 0
+    if checkpoint is not None and offset <= st.st_size:
+        prefix_digest, source["sha256"], _ = _scan_export(posts_export, offset, st.st_size)
+        if checkpoint.get("prefix_sha256") == prefix_digest:
+            agg = _StreamingAggregator.from_state(
+                checkpoint["aggregator"],
+                engine=engine,
+                workers=workers,
+                win_rate_source=win_rate_source,
+                dims=dims,
+            )
+    if agg is None:
+        source.setdefault("sha256", _sha256_path(posts_export))
+        agg = _StreamingAggregator(engine=engine, dims=dims, workers=workers, win_rate_source=win_rate_source)
+        offset = 0
+    for r in _iter_posts_csv(posts_export, start=offset):
+        agg.add(r)
+
+    if partial_path is not None and posts_export.stat().st_mtime_ns == st.st_mtime_ns:
+        _write_cache_json(
+            partial_path,
+            {
+                "version": _AGGREGATE_STATE_VERSION,
+                "layout": _array_layout(),
+                "source": source,
+                "aggregator": agg.to_state(),
+            },
+        )
+    return agg
+
+
+_WEEK_ID_PATTERN = re.compile(r"^(\d{4})-W(\d{2})")
+
+
+def _week_monday(week_id: str) -> dt.date:
+    """Monday of the ISO week a run's week_id starts with (``2026-W04``, ``2099-W01-fixture``)."""
+
+    m = _WEEK_ID_PATTERN.match(week_id)
+    if not m:
+        raise SystemExit(f"week_id is not an ISO week (YYYY-Www...): {week_id}")
+    try:
+        return dt.date.fromisocalendar(int(m.group(1)), int(m.group(2)), 1)
+    except ValueError as exc:
+        raise SystemExit(f"invalid ISO week in week_id {week_id}: {exc}") from exc
+
+
+def _expand_run_jsons(patterns: Sequence[str]) -> List[Path]:
+    """run.json paths from run directories, run.json files, or glob patterns of either.
+
+    A pattern that yields no run.json is an error, so a mistyped history glob cannot pass
+    as an empty history.
+    """
+
+    out: List[Path] = []
+    for pattern in patterns:
+        found = []
+        for m in sorted(glob.glob(pattern)) or [pattern]:
+            path = Path(m)
+            run_json = path / "run.json" if path.is_dir() else path
+            if run_json.name == "run.json" and run_json.exists():
+                found.append(run_json.resolve())
+        if not found:
+            raise SystemExit(f"no run.json matches {pattern}")
+        out += found
+    return sorted(set(out))
+
+
+# Per-week drift histograms in the export's cache directory, reused while the export is unchanged.
+METRIC_HISTOGRAMS_FILENAME = "metric_histograms.json"
+_METRIC_HISTOGRAMS_VERSION = 1
+
+
+def _metric_histograms_path(posts_export: Path) -> Optional[Path]:
+    cache_dir = _export_cache_dir(posts_export)
+    return None if cache_dir is None else cache_dir / METRIC_HISTOGRAMS_FILENAME
+
+
+def _column_histograms(cols: PostColumns) -> metric_drift.Histograms:
+    """Drift histograms per platform for the rows in ``cols`` (valid rows only, by the caller)."""
+
+    import metric_drift
+
+    platforms = cols.labels["platform"]
+    codes = cols.codes["platform"]
+    bin_index = metric_drift.bin_index
+    out: metric_drift.Histograms = {}
+    for metric in metric_drift.DRIFT_METRICS:
+        per_code = [[0] * metric_drift.BINS for _ in platforms]
+        for code, v in zip(codes, cols.numeric[metric]):
+            if not math.isnan(v):
+                per_code[code][bin_index(v)] += 1
+        out.update(((platforms[c], metric), counts) for c, counts in enumerate(per_code) if any(counts))
+    return out
+
+
+_POSTS_RANGE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})$")
+
+
+def _snapshot_store_range(run_json_path: Path, week_id: str) -> Tuple[str, str]:
+    """Post dates to materialize: run.json inputs.posts_range when set, else the ISO week Monday..Sunday."""
+
+    posts_range = str((_load_run_json(run_json_path).get("inputs") or {}).get("posts_range") or "").strip()
+    m = _POSTS_RANGE_PATTERN.match(posts_range)
+    if m:
+        return m.group(1), m.group(2)
+    monday = _week_monday(week_id)
+    return monday.isoformat(), (monday + dt.timedelta(days=6)).isoformat()
+
+
+def _materialize_from_store(db_path: Path, posts_export: Path, run_json_path: Path, week_id: str) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"snapshot store not found: {db_path}")
+    import metrics_reconcile
+    import metrics_snapshot_store
+
+    date_from, date_to = _snapshot_store_range(run_json_path, week_id)
+    try:
+        conn = metrics_snapshot_store.connect(db_path)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    try:
+        report = metrics_reconcile.reconcile(conn, posts_export, date_from=date_from, date_to=date_to)
+    finally:
+        conn.close()
+    metrics_reconcile.write_report(posts_export.with_name(metrics_reconcile.RECONCILIATION_REPORT_FILENAME), report)
+    print(
+        f"Reconciled {report.posts} posts ({date_from}..{date_to}) from {db_path} into {posts_export}: "
+        f"{len(report.amendments)} amendments, {len(report.invalidated)} without W24H"
+    )
+
+
+def _export_source(posts_export: Path) -> Dict[str, Any]:
+    st = posts_export.stat()
+    return {"sha256": _sha256_path(posts_export), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_metric_histograms(posts_export: Path) -> Optional[metric_drift.Histograms]:
+    """Cached histograms for ``posts_export`` (same size+mtime_ns or sha256 check as the column cache)."""
+
+    import metric_drift
+
+    path = _metric_histograms_path(posts_export)
+    if path is None:
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("version") != _METRIC_HISTOGRAMS_VERSION or state.get("bins") != metric_drift.BINS:
+            return None
+        if not _source_matches(state.get("source") or {}, posts_export):
+            return None
+        return metric_drift.from_json(state["histograms"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _write_metric_histograms(posts_export: Path, hists: metric_drift.Histograms, source: Dict[str, Any]) -> None:
+    import metric_drift
+
+    path = _metric_histograms_path(posts_export)
+    if path is None:
+        return
+    payload = {
+        "version": _METRIC_HISTOGRAMS_VERSION,
+        "bins": metric_drift.BINS,
+        "source": source,
+        "histograms": metric_drift.to_json(hists),
+    }
+    _write_cache_json(path, payload)
+
+
+def _drift_history(
+    patterns: Sequence[str], current_run_json: Path, current_week: str, lookback_weeks: int
+) -> List[Tuple[int, str, metric_drift.Histograms]]:
+    """(age in weeks, week_id, histograms) for earlier runs within ``lookback_weeks`` of ``current_week``.
+
+    Histograms come from each export's cached METRIC_HISTOGRAMS_FILENAME; only a run whose
+    cache is missing or stale has its export loaded (through the column cache when present).
+    Nothing is written into the runs' directories.
+    """
+
+    current_monday = _week_monday(current_week)
+    out: List[Tuple[int, str, metric_drift.Histograms]] = []
+    for run_json_path in _expand_run_jsons(patterns):
+        if run_json_path == current_run_json:
+            continue
+        week_id, posts_export, _, _, _, _ = _resolve_run_paths(run_json_path)
+        age = (current_monday - _week_monday(week_id)).days // 7
+        if not 1 <= age <= lookback_weeks:
+            continue
+        hists = _read_metric_histograms(posts_export)
+        if hists is None:
+            if not posts_export.exists():
+                raise SystemExit(f"posts_export.csv not found: {posts_export}")
+            source = _export_source(posts_export)
+            cols = _load_posts_columns(posts_export)
+            valid_idx, _, _ = _split_valid(cols)
+            hists = _column_histograms(cols.take(valid_idx))
+            _write_metric_histograms(posts_export, hists, source)
+        out.append((age, week_id, hists))
+    out.sort(key=lambda h: h[0])
+    return out
+
+
+DECISIONS_PROPOSED_FILENAME = "decisions_proposed.csv"
+
+
+def _pattern_standings(
+    rollups: Dict[Tuple[str, ...], List[Dict[str, Any]]], baselines: Dict[str, Tuple[float, float]]
+) -> List[decision_triggers.PatternStanding]:
+    import decision_triggers
+
+    out: List[decision_triggers.PatternStanding] = []
+    for dim, pattern_type in ((HOOKS_DIMENSION, "hook"), (VERTICALS_DIMENSION, "vertical")):
+        out += decision_triggers.standings(
+            rollups[dim],
+            pattern_type=pattern_type,
+            pattern_field=dim[0],
+            prefix=_rollup_prefix(dim),
+            baselines=baselines,
+        )
+    return out
+
+
+def _decision_history(
+    patterns: Sequence[str],
+    current_run_json: Path,
+    *,
+    engine: str,
+    workers: int,
+    win_rate_source: str,
+) -> List[decision_triggers.PatternStanding]:
+    """Hook/vertical standings of earlier runs, read through _load_run_aggregate (never written to)."""
+
+    dims = [HOOKS_DIMENSION, VERTICALS_DIMENSION]
+    out: List[decision_triggers.PatternStanding] = []
+    for run_json_path in _expand_run_jsons(patterns):
+        if run_json_path == current_run_json:
+            continue
+        week_id, posts_export, _, _, _, _ = _resolve_run_paths(run_json_path)
+        if not posts_export.exists():
+            raise SystemExit(f"posts_export.csv not found: {posts_export}")
+        weekly = _load_run_aggregate(
+            posts_export,
+            run_json_path.parent / AGGREGATE_STATE_FILENAME,
+            engine=engine,
+            dims=dims,
+            workers=workers,
+            win_rate_source=win_rate_source,
+        )
+        rollups = {dim: weekly.rollups(week_id, dim) for dim in dims}
+        out += _pattern_standings(rollups, weekly.block_baselines)
+    return out
+
+
+def _resolve_rollup_paths(
+    run_json_path: Path,
+    dims: Sequence[Tuple[str, ...]],
+    hooks_rollup: Path,
+    verticals_rollup: Path,
+) -> Dict[Tuple[str, ...], Path]:
+    files = ((_load_run_json(run_json_path).get("inputs") or {}).get("files")) or {}
+    paths: Dict[Tuple[str, ...], Path] = {HOOKS_DIMENSION: hooks_rollup, VERTICALS_DIMENSION: verticals_rollup}
+    for dim in dims:
+        if dim in paths:
+            continue
+        name = f"{_rollup_name(dim)}_rollup"
+        rel = files.get(name)
+        paths[dim] = (run_json_path.parent / str(rel)).resolve() if rel else hooks_rollup.parent / f"{name}.csv"
+    return paths
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Aggregate weekly inputs from posts_export.csv")
     ap.add_argument("--run-json", required=True, help="Path to runs/<week>/run.json")
@@ -480,7 +2241,119 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     ap.add_argument(
         "--low-sample-threshold", type=int, default=10, help="Add a drift flag and note when valid_posts < N"
     )
+    ap.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Read posts_export.csv once as a stream and keep only per-group accumulators (large exports)",
+    )
+    ap.add_argument(
+        "--rollup-dimension",
+        action="append",
+        default=[],
+        metavar="FIELD[+FIELD...]",
+        help=(
+            "Extra rollup to emit alongside hooks/verticals, e.g. visual_style or experiment_id+variant_id "
+            "(repeatable). Written to inputs.files.<name>_rollup from run.json, else <name>_rollup.csv "
+            "next to hooks_rollup.csv."
+        ),
+    )
+    ap.add_argument(
+        "--rollup-schema",
+        choices=ROLLUP_SCHEMAS,
+        default="v01",
+        help="Rollup CSV layout: v01, or v02 which adds <prefix>_median_velocity and <prefix>_median_comment_rate",
+    )
+    ap.add_argument(
+        "--scoring-engine",
+        choices=SCORING_ENGINES,
+        default="auto",
+        help="Composite score engine: numpy (vectorized), stdlib, or auto (numpy when installed)",
+    )
+    ap.add_argument(
+        "--win-rate-source",
+        choices=WIN_RATE_SOURCES,
+        default="decision",
+        help=(
+            "Rollup win rates: decision (keep/scale vs iterate/kill, the default) or lift (WIN/NEUTRAL/LOSS vs "
+            "the block's is_control baseline, analytics/schema.md §6; blocks without controls fall back to the "
+            "decision label and are listed in dataset_health.json outcome_labels.decision_fallback_blocks)"
+        ),
+    )
+    ap.add_argument(
+        "--propose-decisions",
+        action="store_true",
+        help=(
+            "Also write machine-proposed kill/iterate/scale decisions (analytics/schema.md §9) to "
+            f"inputs.files.decisions_proposed from run.json, else {DECISIONS_PROPOSED_FILENAME} next to hooks_rollup.csv"
+        ),
+    )
+    ap.add_argument(
+        "--decision-history",
+        nargs="+",
+        default=[],
+        metavar="RUN",
+        help=(
+            "Earlier run directories, run.json files or globs whose hook/vertical standings feed the kill "
+            "(no improvement after 2 weeks), volatility and replication checks of --propose-decisions"
+        ),
+    )
+    ap.add_argument(
+        "--drift-history",
+        nargs="+",
+        default=[],
+        metavar="RUN",
+        help=(
+            "Earlier run directories, run.json files or globs to check completion_pct/loop_pct per platform "
+            f"against for distribution drift (histograms cached per export in {METRIC_HISTOGRAMS_FILENAME} "
+            f"under ${AGGREGATE_CACHE_DIR_ENV})"
+        ),
+    )
+    ap.add_argument(
+        "--drift-lookback-weeks", type=int, default=52, help="Ignore --drift-history runs older than N weeks"
+    )
+    ap.add_argument(
+        "--drift-halflife-weeks",
+        type=float,
+        default=None,
+        help="Half-life of the exponentially weighted drift reference (default 4 weeks)",
+    )
+    ap.add_argument(
+        "--drift-psi-threshold",
+        type=float,
+        default=None,
+        help=(
+            "Flag a platform/metric whose PSI vs the reference exceeds this "
+            "(default 0.25; KS is also checked at alpha 0.05)"
+        ),
+    )
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            f"Streaming mode that persists accumulator state to {AGGREGATE_STATE_FILENAME} next to run.json "
+            "and, on re-runs, parses only rows appended since that checkpoint"
+        ),
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Score comparison sets in N worker processes (0 = one per CPU; default 1 = in process)",
+    )
+    ap.add_argument(
+        "--no-column-cache",
+        action="store_true",
+        help=f"Always parse posts_export.csv as text; do not read or write its {COLUMN_CACHE_SUFFIX} cache",
+    )
+    ap.add_argument(
+        "--snapshot-store",
+        default=None,
+        help="Reconcile posts_export.csv from this metrics snapshot store (metrics_reconcile.py) "
+        "for run.json inputs.posts_range, else the run's ISO week, before aggregating",
+    )
     args = ap.parse_args(argv)
+    engine = _resolve_scoring_engine(args.scoring_engine)
+    workers = _resolve_workers(args.workers)
 
     run_json_path = Path(args.run_json).resolve()
     if not run_json_path.exists():
@@ -489,35 +2362,74 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     week_id, posts_export, hooks_rollup, verticals_rollup, dataset_health, posts_source = _resolve_run_paths(
         run_json_path
     )
+    if args.snapshot_store:
+        _materialize_from_store(Path(args.snapshot_store).resolve(), posts_export, run_json_path, week_id)
     if not posts_export.exists():
         raise SystemExit(f"posts_export.csv not found: {posts_export}")
 
-    all_rows = _parse_posts_csv(posts_export)
-    total_posts = len(all_rows)
-
-    invalid_reasons: List[str] = []
-    missing_metrics_count = 0
-    valid_rows: List[PostRow] = []
-
-    for r in all_rows:
-        is_valid, missing = _is_valid(r)
-        if missing:
-            missing_metrics_count += 1
-        if is_valid:
-            valid_rows.append(r)
+    dims: List[Tuple[str, ...]] = [HOOKS_DIMENSION, VERTICALS_DIMENSION]
+    for spec in args.rollup_dimension:
+        dim = _parse_rollup_dimension(spec)
+        if dim not in dims:
+            dims.append(dim)
+    rollup_paths = _resolve_rollup_paths(run_json_path, dims, hooks_rollup, verticals_rollup)
+
+    reason_counts: Dict[str, int]
+    outcome_labels: Dict[str, Any]
+    block_baselines: Dict[str, Tuple[float, float]]
+    current_histograms: Callable[[], metric_drift.Histograms]
+    rollups: Dict[Tuple[str, ...], List[Dict[str, Any]]]
+    if args.incremental or args.streaming:
+        if args.incremental:
+            agg = _run_incremental(
+                posts_export,
+                run_json_path.parent / AGGREGATE_STATE_FILENAME,
+                engine=engine,
+                dims=dims,
+                workers=workers,
+                win_rate_source=args.win_rate_source,
+            )
         else:
-            reason = _extract_invalid_reason(r.decision, r.notes, missing)
-            if reason:
-                invalid_reasons.append(reason)
+            agg = _StreamingAggregator(engine=engine, dims=dims, workers=workers, win_rate_source=args.win_rate_source)
+            for r in _iter_posts_csv(posts_export):
+                agg.add(r)
+        total_posts = agg.total_posts
+        valid_posts = agg.valid_posts
+        missing_metrics_count = agg.missing_metrics_count
+        reason_counts = agg.reason_counts
+        duration_out_of_band = agg.duration_out_of_band
+        posts_range = agg.posts_range()
+        rollups = {dim: agg.rollups(week_id, dim, args.rollup_schema) for dim in dims}
+        outcome_labels = agg.outcome_labels()
+        block_baselines = agg.block_baselines
+        current_histograms = agg.metric_histograms
+    else:
+        all_cols = _load_posts_columns(posts_export, use_cache=not args.no_column_cache)
+        total_posts = len(all_cols)
+
+        valid_idx, missing_metrics_count, reason_counts = _split_valid(all_cols)
+        valid_cols = all_cols.take(valid_idx)
+
+        valid_posts = len(valid_cols)
+        posts_range = _compute_date_range(all_cols)
+
+        # Compute rollups.
+        derived = _derive_metrics(valid_cols, engine=engine, workers=workers, win_rate_source=args.win_rate_source)
+        duration_out_of_band = "other" in derived.duration_band
+        rollups = _multi_rollups(week_id, valid_cols, derived, dims, schema=args.rollup_schema)
+        outcome_labels = _outcome_label_counts(
+            derived.lift_label,
+            (block_id for _, _, block_id in derived.set_keys),
+            derived.block_baselines,
+            args.win_rate_source,
+        )
+        block_baselines = derived.block_baselines
+        current_histograms = functools.partial(_column_histograms, valid_cols)
 
-    valid_posts = len(valid_rows)
     invalid_posts = total_posts - valid_posts
     missing_metrics_rate = 0.0 if total_posts == 0 else missing_metrics_count / total_posts
 
     # Top invalid reasons (stable ordering)
-    reason_counts: Dict[str, int] = {}
-    for r in invalid_reasons:
-        reason_counts[r] = reason_counts.get(r, 0) + 1
     top_invalid = [k for k, _ in sorted(reason_counts.items(), key=lambda kv: (-kv[1], kv[0]))][:5]
 
     drift_flags: List[str] = []
@@ -527,20 +2439,45 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     if valid_posts < int(args.low_sample_threshold):
         drift_flags.append("low_sample_size")
         note_parts.append(f"LOW CONFIDENCE: valid_posts={valid_posts} below threshold={int(args.low_sample_threshold)}")
-    if any(_duration_band(r.duration_sec) == "other" for r in valid_rows):
+    if duration_out_of_band:
         drift_flags.append("duration_out_of_band")
         note_parts.append("Some valid rows fall outside preferred duration bands; comparability reduced.")
 
-    computed_at_utc = args.computed_at_utc or dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-    posts_range = _compute_date_range(all_rows)
+    drift: Optional[Dict[str, Any]] = None
+    if args.drift_history:
+        import metric_drift
+
+        if args.drift_halflife_weeks is None:
+            args.drift_halflife_weeks = metric_drift.DEFAULT_HALFLIFE_WEEKS
+        if args.drift_psi_threshold is None:
+            args.drift_psi_threshold = metric_drift.DEFAULT_PSI_THRESHOLD
+        if args.drift_lookback_weeks < 1 or args.drift_halflife_weeks <= 0:
+            raise SystemExit("--drift-lookback-weeks must be >= 1 and --drift-halflife-weeks > 0")
+        history = _drift_history(args.drift_history, run_json_path, week_id, args.drift_lookback_weeks)
+        histograms = current_histograms()
+        # Cache this week too, so later runs can use it as history without re-reading the export.
+        _write_metric_histograms(posts_export, histograms, _export_source(posts_export))
+        shift_flags, checks = metric_drift.check_drift(
+            histograms,
+            [(age, hists) for age, _, hists in history],
+            halflife=args.drift_halflife_weeks,
+            psi_threshold=args.drift_psi_threshold,
+        )
+        drift_flags.extend(shift_flags)
+        if shift_flags:
+            note_parts.append(f"Distribution shift vs trailing weeks: {', '.join(shift_flags)}.")
+        drift = {
+            "reference_weeks": [w for _, w, _ in history],
+            "halflife_weeks": args.drift_halflife_weeks,
+            "psi_threshold": args.drift_psi_threshold,
+            "ks_alpha": metric_drift.DEFAULT_KS_ALPHA,
+            "checks": checks,
+        }
 
-    # Compute rollups.
-    scores = _compute_scores(valid_rows)
-    hooks = _group_rollups(week_id, valid_rows, scores, "hook_type")
-    verticals = _group_rollups(week_id, valid_rows, scores, "vertical")
+    computed_at_utc = args.computed_at_utc or dt.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
-    _write_hooks_rollup(hooks_rollup, hooks)
-    _write_verticals_rollup(verticals_rollup, verticals)
+    for dim in dims:
+        _write_rollup(rollup_paths[dim], dim, rollups[dim], schema=args.rollup_schema)
     _write_dataset_health(
         dataset_health,
         week_id=week_id,
@@ -555,12 +2492,37 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         incident_flags=incident_flags,
         notes=(" ".join(note_parts)).strip() or "Dataset health computed.",
         computed_at_utc=computed_at_utc,
+        outcome_labels=outcome_labels if args.win_rate_source == "lift" else None,
+        drift=drift,
     )
 
+    decisions_path: Optional[Path] = None
+    if args.propose_decisions:
+        import decision_triggers
+
+        files = ((_load_run_json(run_json_path).get("inputs") or {}).get("files")) or {}
+        rel = files.get("decisions_proposed")
+        decisions_path = (
+            (run_json_path.parent / str(rel)).resolve() if rel else hooks_rollup.parent / DECISIONS_PROPOSED_FILENAME
+        )
+        history = _decision_history(
+            args.decision_history,
+            run_json_path,
+            engine=engine,
+            workers=workers,
+            win_rate_source=args.win_rate_source,
+        )
+        proposed = decision_triggers.propose(
+            _pattern_standings(rollups, block_baselines), history, week_id=week_id, drift_flags=drift_flags
+        )
+        decision_triggers.write_decisions(decisions_path, proposed)
+
     print(f"OK week_id={week_id} total={total_posts} valid={valid_posts} invalid={invalid_posts}")
-    print(f"Wrote {hooks_rollup}")
-    print(f"Wrote {verticals_rollup}")
+    for dim in dims:
+        print(f"Wrote {rollup_paths[dim]}")
     print(f"Wrote {dataset_health}")
+    if decisions_path is not None:
+        print(f"Wrote {decisions_path}")
     return 0
 
 
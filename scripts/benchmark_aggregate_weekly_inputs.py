@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Benchmark aggregate_weekly_inputs.py stages on a synthetic posts export.
+
+Not part of CI. Run locally when changing the aggregator's hot paths:
+
+  python scripts/benchmark_aggregate_weekly_inputs.py --rows 1000000
+  python scripts/benchmark_aggregate_weekly_inputs.py --posts path/to/posts_export.csv --repeat 5
+
+Each case reports the best wall time over --repeat runs and the implied rows/sec.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import dataclasses
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import aggregate_weekly_inputs as agg
+
+POSTS_HEADER = [
+    "date",
+    "platform",
+    "vertical",
+    "hook_type",
+    "hook_text",
+    "duration_sec",
+    "visual_style",
+    "voice_style",
+    "block_id",
+    "experiment_id",
+    "variant_id",
+    "is_control",
+    "views_1h",
+    "views_24h",
+    "avg_view_duration_sec",
+    "completion_pct",
+    "loop_pct",
+    "shares",
+    "saves",
+    "comments",
+    "decision",
+    "notes",
+]
+
+
+def write_synthetic_posts_export(path: Path, rows: int, *, seed: int = 7) -> None:
+    """Write a deterministic posts_export.csv with realistic label cardinality and ~5% gaps."""
+
+    rng = random.Random(seed)
+    platforms = ["tiktok", "yt_shorts", "ig_reels", "fb_reels"]
+    verticals = [f"vertical_{i:02d}" for i in range(12)]
+    hooks = [f"hook_{i:02d}" for i in range(20)]
+    blocks = [f"B-{i:03d}" for i in range(40)]
+    durations = [15, 16, 17, 18, 19, 20, 22, 24, 26, 27, 28, 30, 32, 35, 40]
+    decisions = ["keep", "iterate", "kill", "scale", "keep", "iterate", "invalid"]
+
+    def maybe(v: object) -> object:
+        return "" if rng.random() < 0.01 else v
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(POSTS_HEADER)
+        for _ in range(rows):
+            duration = rng.choice(durations)
+            views_24h = rng.randint(50, 200_000)
+            w.writerow(
+                [
+                    f"2099-01-{rng.randint(1, 28):02d}",
+                    rng.choice(platforms),
+                    rng.choice(verticals),
+                    rng.choice(hooks),
+                    "synthetic hook",
+                    duration,
+                    rng.choice(["minimal_v1", "loop_v1", "kinetic_v2"]),
+                    rng.choice(["neutral_tts_v1", "warm_tts_v1"]),
+                    rng.choice(blocks),
+                    "EXP-001",
+                    rng.choice(["A", "B"]),
+                    "true" if rng.random() < 0.2 else "false",
+                    maybe(rng.randint(10, views_24h)),
+                    maybe(views_24h),
+                    maybe(round(rng.uniform(2.0, duration * 1.1), 2)),
+                    maybe(round(rng.uniform(0.05, 0.8), 4)),
+                    maybe(round(rng.uniform(0.0, 0.4), 4)),
+                    maybe(rng.randint(0, views_24h // 50)),
+                    maybe(rng.randint(0, views_24h // 40)),
+                    rng.randint(0, views_24h // 100),
+                    rng.choice(decisions),
+                    "",
+                ]
+            )
+
+
+def _time_best(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _report(results: List[Tuple[str, int, float]]) -> None:
+    width = max(len(name) for name, _, _ in results)
+    for name, rows, seconds in results:
+        rate = rows / seconds if seconds > 0 else float("inf")
+        print(f"{name:<{width}}  rows={rows:>9}  best={seconds:8.3f}s  rows/sec={rate:>12,.0f}")
+
+
+def run_benchmarks(posts: Path, *, repeat: int, engine: str, workers: int = 4) -> List[Tuple[str, int, float]]:
+    all_cols = agg._load_posts_columns(posts)  # also writes the column cache timed below
+    total = len(all_cols)
+    valid_idx, _, _ = agg._split_valid(all_cols)
+    cols = all_cols.take(valid_idx)
+    n = len(cols)
+    week_id = "2099-W01-bench"
+
+    hooks_and_verticals = [agg.HOOKS_DIMENSION, agg.VERTICALS_DIMENSION]
+    four_dims = hooks_and_verticals + [("visual_style",), ("voice_style",)]
+
+    def rollups_derived_once() -> None:
+        derived = agg._derive_metrics(cols, engine=engine)
+        agg._multi_rollups(week_id, cols, derived, hooks_and_verticals)
+
+    def rollups_derived_per_pass() -> None:
+        # Cost model of the pre-table pipeline: scoring ran once, but each rollup pass recomputed
+        # retention ratio, save/share rate and duration band for every row.
+        scored = agg._derive_metrics(cols, engine=engine)
+        for dim in hooks_and_verticals:
+            derived = dataclasses.replace(
+                scored,
+                retention_ratio=agg._retention_ratio_column(cols),
+                save_share_rate=agg._save_share_rate_column(cols),
+                duration_band=agg._duration_band_column(cols),
+            )
+            agg._multi_rollups(week_id, cols, derived, [dim])
+
+    derived = agg._derive_metrics(cols, engine=engine)
+
+    def rollups_4_dims_scan_per_dim() -> None:
+        for dim in four_dims:
+            agg._multi_rollups(week_id, cols, derived, [dim])
+
+    def rollups_4_dims_one_scan() -> None:
+        agg._multi_rollups(week_id, cols, derived, four_dims)
+
+    scores = list(derived.score)
+
+    def median_sorted() -> None:
+        statistics.median(scores)
+
+    def median_selection() -> None:
+        agg._median_exact(scores)
+
+    def score_serial() -> None:
+        agg._derive_metrics(cols, engine=engine)
+
+    def score_workers() -> None:
+        agg._derive_metrics(cols, engine=engine, workers=workers)
+
+    return [
+        ("parse_dictreader", total, _time_best(lambda: agg._parse_posts_csv_records(posts), repeat)),
+        ("parse_columnar", total, _time_best(lambda: agg._parse_posts_csv(posts), repeat)),
+        ("load_column_cache", total, _time_best(lambda: agg._load_posts_columns(posts), repeat)),
+        ("score_serial", n, _time_best(score_serial, repeat)),
+        (f"score_workers_{workers}", n, _time_best(score_workers, repeat)),
+        ("median_sorted", n, _time_best(median_sorted, repeat)),
+        ("median_selection", n, _time_best(median_selection, repeat)),
+        ("rollups_derived_per_pass", n, _time_best(rollups_derived_per_pass, repeat)),
+        ("rollups_derived_once", n, _time_best(rollups_derived_once, repeat)),
+        ("rollups_4_dims_scan_per_dim", n, _time_best(rollups_4_dims_scan_per_dim, repeat)),
+        ("rollups_4_dims_one_scan", n, _time_best(rollups_4_dims_one_scan, repeat)),
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark aggregate_weekly_inputs.py on a synthetic export")
+    ap.add_argument("--rows", type=int, default=1_000_000, help="Synthetic rows to generate (ignored with --posts)")
+    ap.add_argument("--posts", default=None, help="Benchmark an existing posts_export.csv instead of generating one")
+    ap.add_argument("--seed", type=int, default=7, help="Seed for the synthetic export")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per case; the best time is reported")
+    ap.add_argument("--scoring-engine", choices=agg.SCORING_ENGINES, default="auto")
+    ap.add_argument("--workers", type=int, default=4, help="Process count for the parallel scoring case")
+    args = ap.parse_args(argv)
+
+    engine = agg._resolve_scoring_engine(args.scoring_engine)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.posts:
+            posts = Path(args.posts).resolve()
+        else:
+            posts = Path(tmp) / "posts_export.csv"
+            t0 = time.perf_counter()
+            write_synthetic_posts_export(posts, args.rows, seed=args.seed)
+            print(
+                f"Generated {args.rows} synthetic rows in {time.perf_counter() - t0:.1f}s ({posts.stat().st_size:,} bytes)"
+            )
+
+        print(f"scoring_engine={engine}")
+        _report(
+            run_benchmarks(posts, repeat=max(1, args.repeat), engine=engine, workers=agg._resolve_workers(args.workers))
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Benchmark HTML -> PDF rendering: a browser per document vs the shared renderer pool.
+
+Not part of CI. Needs playwright + Chromium (pip install playwright && playwright install chromium):
+
+  python scripts/benchmark_pdf_render_pool.py --docs 12 --pages 1 2 4
+  python scripts/benchmark_pdf_render_pool.py --html build/release/**/*.html
+
+Each case reports wall time, throughput (docs/s) and per-document latency (p50/p95, from
+submission to PDF written).
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from product_build_utils import PDF_PRINT_OPTIONS, BuildError, HtmlPdfRenderer, html_escape, wrap_html_document
+
+
+def write_synthetic_documents(out_dir: Path, docs: int, *, sections: int = 40) -> List[Path]:
+    """Write ``docs`` multi-page report-like HTML files (tables, local-only fonts)."""
+
+    css = (
+        "@font-face { font-family: Body; src: local('DejaVu Sans'), local('Arial'); }\n"
+        "body { font-family: Body, sans-serif; font-size: 11pt; }\n"
+        "table { border-collapse: collapse; width: 100%; } td, th { border: 1px solid #999; padding: 2px 4px; }"
+    )
+    paths = []
+    for d in range(docs):
+        body = []
+        for s in range(sections):
+            rows = "".join(f"<tr><td>hook_{r:02d}</td><td>{(d * 31 + s * 7 + r) % 997}</td></tr>" for r in range(12))
+            body.append(f"<h2>{html_escape(f'Section {s}')}</h2><p>{'Signal text. ' * 40}</p><table>{rows}</table>")
+        path = out_dir / f"doc_{d:03d}.html"
+        path.write_text(wrap_html_document(title=f"Doc {d}", body_html="".join(body), css_text=css), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _summary(name: str, wall: float, latencies: Sequence[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    print(
+        f"{name:<28} {len(ordered):>5} docs  {wall:8.2f}s  {len(ordered) / wall:7.2f} docs/s  "
+        f"p50 {statistics.median(ordered) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms"
+    )
+
+
+def bench_browser_per_document(jobs: Sequence[Tuple[Path, Path]]) -> None:
+    """The previous write_html_to_pdf: launch, networkidle, fixed 500 ms sleep, print, close."""
+
+    from playwright.sync_api import sync_playwright
+
+    latencies = []
+    start = time.perf_counter()
+    for html_path, pdf_path in jobs:
+        t0 = time.perf_counter()
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            page.goto(html_path.resolve().as_uri(), wait_until="networkidle")
+            page.wait_for_timeout(500)
+            page.pdf(path=str(pdf_path), **PDF_PRINT_OPTIONS)
+            browser.close()
+        latencies.append(time.perf_counter() - t0)
+    _summary("browser per document", time.perf_counter() - start, latencies)
+
+
+def bench_pool(jobs: Sequence[Tuple[Path, Path]], pages: int) -> None:
+    start = time.perf_counter()
+    with HtmlPdfRenderer(pages=pages) as renderer:
+        launched = time.perf_counter()
+        results = renderer.render_many(jobs)
+        done = time.perf_counter()
+    latencies = [r.queued_sec + r.render_sec for r in results]
+    _summary(f"pool pages={pages}", done - start, latencies)
+    print(f"{'':<28} browser start {launched - start:.2f}s, render only {len(jobs) / (done - launched):.2f} docs/s")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark HTML -> PDF rendering with and without the renderer pool")
+    ap.add_argument("--docs", type=int, default=12, help="Synthetic documents to render (ignored with --html)")
+    ap.add_argument("--html", nargs="*", default=None, help="Benchmark existing HTML files instead")
+    ap.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4], help="Pool sizes to benchmark")
+    ap.add_argument("--skip-baseline", action="store_true", help="Skip the browser-per-document case")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        sources = [Path(p) for p in args.html] if args.html else write_synthetic_documents(tmp_dir, args.docs)
+        jobs = [(src, tmp_dir / f"{i:03d}_{src.stem}.pdf") for i, src in enumerate(sources)]
+        try:
+            if not args.skip_baseline:
+                bench_browser_per_document(jobs)
+            for pages in args.pages:
+                bench_pool(jobs, pages)
+        except ImportError as exc:
+            raise SystemExit(f"playwright is required for this benchmark ({exc})") from exc
+        except BuildError as exc:
+            raise SystemExit(str(exc)) from exc
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,12 +15,13 @@ from typing import Any, Dict, List, Sequence, Set
 
 from product_build_utils import (
     BuildError,
+    deferred_pdf_adapter_meta,
     ensure_dir,
     extract_allowlist_vars,
-    extract_template_vars,
     find_repo_root,
     git_head_commit,
     html_escape,
+    load_template,
     read_json,
     run_pdf_adapter,
     utc_now_iso,
@@ -28,6 +29,7 @@ from product_build_utils import (
     wrap_html_document,
     write_manifest,
     write_minimal_pdf,
+    write_pdf_job,
     write_text,
 )
 
@@ -70,6 +72,11 @@ def main(argv: Sequence[str]) -> int:
         default=None,
         help="Command template for --pdf-adapter=command. Use {html} and {pdf} placeholders.",
     )
+    ap.add_argument(
+        "--defer-pdf",
+        action="store_true",
+        help="With a PDF adapter, skip rendering and write pdf_job.json for release_products.py to render in one batch",
+    )
     args = ap.parse_args(list(argv))
 
     run_path = Path(args.run_json).resolve()
@@ -106,7 +113,7 @@ def main(argv: Sequence[str]) -> int:
 
     used_vars: Set[str] = set()
     for p in hook_paths + structure_paths + script_paths + caption_paths:
-        used_vars |= extract_template_vars(p.read_text(encoding="utf-8"))
+        used_vars |= load_template(p).variables
 
     extra = sorted(v for v in used_vars if v not in allowlisted)
     if extra:
@@ -174,6 +181,8 @@ def main(argv: Sequence[str]) -> int:
     )
     write_text(out_html, rendered_html)
 
+    defer_pdf = args.defer_pdf and args.pdf_adapter != "none"
+    pdf_adapter_meta = None
     if args.pdf_adapter == "none":
         write_minimal_pdf(
             out_pdf,
@@ -185,12 +194,20 @@ def main(argv: Sequence[str]) -> int:
                 f"Vars used by templates: {len(used_vars)}",
             ],
         )
+    elif defer_pdf:
+        pdf_adapter_meta = deferred_pdf_adapter_meta(args.pdf_adapter)
     else:
-        run_pdf_adapter(adapter=args.pdf_adapter, html_path=out_html, pdf_path=out_pdf, pdf_cmd=args.pdf_cmd)
+        pdf_adapter_meta = run_pdf_adapter(
+            adapter=args.pdf_adapter, html_path=out_html, pdf_path=out_pdf, pdf_cmd=args.pdf_cmd
+        )
 
     head_commit = git_head_commit(repo_root) or str(run.get("repo_commit", ""))
     manifest_schema_ref = f"artifacts/manifest.schema.json@{head_commit}"
 
+    output_files = [out_zip, out_html]
+    if not defer_pdf:
+        output_files.append(out_pdf)
+
     write_manifest(
         out_path=manifest_path,
         run_id=period_id,
@@ -203,12 +220,15 @@ def main(argv: Sequence[str]) -> int:
         builder_version=BUILDER_VERSION,
         manifest_schema_ref=manifest_schema_ref,
         input_files=[variables_md] + hook_paths + structure_paths + script_paths + caption_paths,
-        output_files=[out_zip, out_html, out_pdf],
+        output_files=output_files,
         unresolved_template_vars=[],
+        pdf_adapter=pdf_adapter_meta,
     )
 
     schema_path = repo_root / "artifacts" / "manifest.schema.json"
     validate_manifest_schema(read_json(manifest_path), schema_path)
+    if defer_pdf:
+        write_pdf_job(out_dir, html_path=out_html, pdf_path=out_pdf, manifest_path=manifest_path)
 
     print(f"Built artifacts to: {out_dir}")
     return 0
@@ -15,14 +15,17 @@ from typing import Any, Dict, Sequence
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from product_build_utils import (
+    PLAYWRIGHT_PDF_ADAPTER,
     BuildError,
     count_pdf_pages,
+    default_pdf_cache,
     ensure_dir,
     find_repo_root,
     git_head_commit,
+    playwright_version,
     read_json,
     utc_now_iso,
-    write_html_to_pdf,
+    write_html_to_pdf_batch,
     write_json,
     write_manifest,
 )
@@ -148,14 +151,16 @@ def main(argv: Sequence[str]) -> int:
     print("\nGenerating PDFs (this may take a moment)...")
     
     full_pdf_path = out_dir / f"displacement_risk_atlas_v{version}.pdf"
-    print(f"  Converting full atlas to PDF...")
-    write_html_to_pdf(full_html_path, full_pdf_path)
-    print(f"  ✓ {full_pdf_path.name} ({full_pdf_path.stat().st_size:,} bytes)")
-    
     preview_pdf_path = out_dir / "displacement_risk_atlas_preview.pdf"
-    print(f"  Converting preview to PDF...")
-    write_html_to_pdf(preview_html_path, preview_pdf_path)
-    print(f"  ✓ {preview_pdf_path.name} ({preview_pdf_path.stat().st_size:,} bytes)")
+    # Both documents go to one browser and render side by side; unchanged HTML is a cache hit.
+    print("  Converting full atlas and preview to PDF...")
+    pdf_results = write_html_to_pdf_batch(
+        [(full_html_path, full_pdf_path), (preview_html_path, preview_pdf_path)], cache=default_pdf_cache()
+    )
+    for result in pdf_results:
+        pdf_path = result.pdf_path
+        how = "cached" if result.cache_hit else f"{result.render_sec:.2f}s"
+        print(f"  ✓ {pdf_path.name} ({pdf_path.stat().st_size:,} bytes, {how})")
 
     # Verify page counts
     print("\nVerifying PDF page counts...")
@@ -194,6 +199,14 @@ def main(argv: Sequence[str]) -> int:
         input_files=input_files,
         output_files=output_files,
         unresolved_template_vars=[],
+        pdf_adapter={
+            "name": PLAYWRIGHT_PDF_ADAPTER,
+            "version": playwright_version(),
+            "documents": [
+                {"filename": r.pdf_path.name, "cache_hit": r.cache_hit, "render_sec": round(r.render_sec, 3)}
+                for r in pdf_results
+            ],
+        },
     )
 
     # Update run.json status
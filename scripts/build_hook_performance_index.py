@@ -25,6 +25,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+try:
+    # Persistent file-hash cache when run from the repo; the standalone kit hashes uncached.
+    from product_build_utils import default_hash_cache, sha256_files
+except ImportError:  # pragma: no cover - kit layout
+    default_hash_cache = sha256_files = None
+
 VAR_PATTERN = re.compile(r"{{\s*([a-zA-Z0-9_\-\.]+)\s*}}")
 
 BUILDER_NAME = "build_hook_performance_index"
@@ -55,6 +61,14 @@ def sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
+def sha256_many(paths: Sequence[Path]) -> List[str]:
+    """sha256 of each path (in order), through the repo's hash cache when available."""
+
+    if sha256_files is not None:
+        return sha256_files(paths, cache=default_hash_cache())
+    return [sha256_file(p) for p in paths]
+
+
 def git_head_commit(repo_root: Path) -> Optional[str]:
     try:
         out = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=str(repo_root), stderr=subprocess.DEVNULL)
@@ -85,22 +99,67 @@ def extract_allowlist_vars(allowlist_path: Path) -> Set[str]:
     return allowed
 
 
-def extract_template_vars(template_text: str) -> Set[str]:
-    return set(VAR_PATTERN.findall(template_text))
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal text and ``{{ var }}`` slots.
+
+    Mirrors product_build_utils.CompiledTemplate; this builder ships standalone in the kit.
+    """
+
+    sha256: str
+    literals: Tuple[str, ...]
+    keys: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, template_text: str, *, sha256: str = "") -> "CompiledTemplate":
+        literals: List[str] = []
+        keys: List[str] = []
+        placeholders: List[str] = []
+        pos = 0
+        for m in VAR_PATTERN.finditer(template_text):
+            literals.append(template_text[pos : m.start()])
+            keys.append(m.group(1))
+            placeholders.append(m.group(0))
+            pos = m.end()
+        literals.append(template_text[pos:])
+        return cls(sha256=sha256, literals=tuple(literals), keys=tuple(keys), placeholders=tuple(placeholders))
+
+    @property
+    def variables(self) -> Set[str]:
+        return set(self.keys)
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+        parts: List[str] = [self.literals[0]]
+        unresolved: Set[str] = set()
+        for key, placeholder, literal in zip(self.keys, self.placeholders, self.literals[1:]):
+            if key in values:
+                parts.append(str(values[key]))
+            else:
+                unresolved.add(key)
+                parts.append(placeholder)
+            parts.append(literal)
+        return "".join(parts), unresolved
+
+
+# Compiled templates by content sha256.
+_TEMPLATE_CACHE: Dict[str, CompiledTemplate] = {}
+
+
+def compile_template(template_text: str) -> CompiledTemplate:
+    digest = hashlib.sha256(template_text.encode("utf-8")).hexdigest()
+    compiled = _TEMPLATE_CACHE.get(digest)
+    if compiled is None:
+        compiled = _TEMPLATE_CACHE[digest] = CompiledTemplate.parse(template_text, sha256=digest)
+    return compiled
 
 
-def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
-    unresolved: Set[str] = set()
+def extract_template_vars(template_text: str) -> Set[str]:
+    return compile_template(template_text).variables
 
-    def repl(m: re.Match[str]) -> str:
-        key = m.group(1)
-        if key in values:
-            return str(values[key])
-        unresolved.add(key)
-        return m.group(0)
 
-    rendered = VAR_PATTERN.sub(repl, template_text)
-    return rendered, unresolved
+def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+    return compile_template(template_text).render(values)
 
 
 @dataclass(frozen=True)
@@ -239,7 +298,13 @@ def html_escape(s: str) -> str:
     )
 
 
+# Manifest validators by (resolved schema path, schema content sha256).
+_MANIFEST_VALIDATORS: Dict[Tuple[str, str], Any] = {}
+
+
 def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> None:
+    """Validate manifest against artifacts/manifest.schema.json; the validator is built once per schema content."""
+
     if not schema_path.exists():
         raise BuildError(f"Manifest schema not found: {schema_path}")
     try:
@@ -251,9 +316,18 @@ def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> Non
             f"({exc})"
         )
 
-    schema = read_json(schema_path)
+    raw = schema_path.read_bytes()
+    key = (str(schema_path.resolve()), hashlib.sha256(raw).hexdigest())
+    validator = _MANIFEST_VALIDATORS.get(key)
+    if validator is None:
+        try:
+            schema = json.loads(raw.decode("utf-8"))
+        except Exception as exc:
+            raise BuildError(f"Failed to read JSON: {schema_path} ({exc})")
+        validator = _MANIFEST_VALIDATORS.setdefault(key, jsonschema.Draft202012Validator(schema))
+
     try:
-        jsonschema.Draft202012Validator(schema).validate(manifest)
+        validator.validate(manifest)
     except jsonschema.ValidationError as exc:
         path_str = "/".join(str(p) for p in exc.path) if exc.path else "(root)"
         raise BuildError(f"Manifest failed schema validation at {path_str}: {exc.message}")
@@ -272,18 +346,21 @@ def write_manifest(
     builder_meta: Dict[str, str],
     manifest_schema_ref: str,
 ) -> None:
+    digests = sha256_many([*input_files, *output_files])
+    input_digests, output_digests = digests[: len(input_files)], digests[len(input_files) :]
+
     inputs = []
-    for p in input_files:
+    for p, digest in zip(input_files, input_digests):
         rel = p.resolve().relative_to(repo_root.resolve()).as_posix()
-        inputs.append({"name": p.name, "path": rel, "sha256": sha256_file(p)})
+        inputs.append({"name": p.name, "path": rel, "sha256": digest})
 
     outputs = []
-    for p in output_files:
+    for p, digest in zip(output_files, output_digests):
         outputs.append(
             {
                 "type": p.suffix.lstrip(".") or "file",
                 "filename": p.name,
-                "sha256": sha256_file(p),
+                "sha256": digest,
                 "size_bytes": p.stat().st_size,
                 "content_type": _content_type_for(p),
                 "storage": None,
@@ -374,11 +451,11 @@ def main(argv: Sequence[str]) -> int:
     html_template_path = template_dir / "hook_index_template.html"
     css_path = template_dir / "hook_index_styles.css"
 
-    md_template = md_template_path.read_text(encoding="utf-8")
-    html_template = html_template_path.read_text(encoding="utf-8")
+    md_template = compile_template(md_template_path.read_text(encoding="utf-8"))
+    html_template = compile_template(html_template_path.read_text(encoding="utf-8"))
 
     # Guardrail: templates must only use allowlisted vars.
-    used = extract_template_vars(md_template) | extract_template_vars(html_template)
+    used = md_template.variables | html_template.variables
     extra = sorted(v for v in used if v not in allowed)
     if extra:
         raise BuildError(f"Template uses non-allowlisted vars: {extra}")
@@ -392,8 +469,8 @@ def main(argv: Sequence[str]) -> int:
         "top_hooks_table_html": html_table,
     }
 
-    rendered_md, unresolved_md = render_template(md_template, ctx)
-    rendered_html, unresolved_html = render_template(html_template, ctx)
+    rendered_md, unresolved_md = md_template.render(ctx)
+    rendered_html, unresolved_html = html_template.render(ctx)
     unresolved = sorted(set(unresolved_md) | set(unresolved_html))
 
     out_dir = (
@@ -17,15 +17,15 @@ from typing import Any, Dict, List, Sequence
 
 from product_build_utils import (
     BuildError,
+    deferred_pdf_adapter_meta,
     ensure_dir,
     extract_allowlist_vars,
-    extract_template_vars,
     find_repo_root,
     flatten_values,
     git_head_commit,
     html_escape,
+    load_template,
     read_json,
-    render_template,
     run_pdf_adapter,
     utc_now_iso,
     validate_manifest_schema,
@@ -33,6 +33,7 @@ from product_build_utils import (
     write_json,
     write_manifest,
     write_minimal_pdf,
+    write_pdf_job,
     write_text,
 )
 
@@ -63,6 +64,11 @@ def main(argv: Sequence[str]) -> int:
         default=None,
         help="Command template for --pdf-adapter=command. Use {html} and {pdf} placeholders.",
     )
+    ap.add_argument(
+        "--defer-pdf",
+        action="store_true",
+        help="With a PDF adapter, skip rendering and write pdf_job.json for release_products.py to render in one batch",
+    )
     args = ap.parse_args(list(argv))
 
     run_path = Path(args.run_json).resolve()
@@ -111,14 +117,14 @@ def main(argv: Sequence[str]) -> int:
     template_path = template_dir / "pattern_report_template.md"
 
     allowed = extract_allowlist_vars(allowlist_path)
-    template = template_path.read_text(encoding="utf-8")
+    template = load_template(template_path)
 
-    used = extract_template_vars(template)
+    used = template.variables
     extra = sorted(v for v in used if v not in allowed)
     if extra:
         raise BuildError(f"Template uses non-allowlisted vars: {extra}")
 
-    rendered_md, unresolved = render_template(template, merged_ctx)
+    rendered_md, unresolved = template.render(merged_ctx)
     unresolved_sorted = sorted(unresolved)
 
     css_path = template_dir / "pattern_report_styles.css"
@@ -164,6 +170,8 @@ def main(argv: Sequence[str]) -> int:
     }
     write_json(out_data, data_appendix)
 
+    defer_pdf = args.defer_pdf and args.pdf_adapter != "none"
+    pdf_adapter_meta = None
     if args.pdf_adapter == "none":
         write_minimal_pdf(
             out_pdf,
@@ -174,12 +182,20 @@ def main(argv: Sequence[str]) -> int:
                 f"Unresolved vars: {len(unresolved_sorted)}",
             ],
         )
+    elif defer_pdf:
+        pdf_adapter_meta = deferred_pdf_adapter_meta(args.pdf_adapter)
     else:
-        run_pdf_adapter(adapter=args.pdf_adapter, html_path=out_html, pdf_path=out_pdf, pdf_cmd=args.pdf_cmd)
+        pdf_adapter_meta = run_pdf_adapter(
+            adapter=args.pdf_adapter, html_path=out_html, pdf_path=out_pdf, pdf_cmd=args.pdf_cmd
+        )
 
     head_commit = git_head_commit(repo_root) or str(run.get("repo_commit", ""))
     manifest_schema_ref = f"artifacts/manifest.schema.json@{head_commit}"
 
+    output_files = [out_md, out_html, out_data]
+    if not defer_pdf:
+        output_files.append(out_pdf)
+
     write_manifest(
         out_path=manifest_path,
         run_id=period_id,
@@ -192,12 +208,15 @@ def main(argv: Sequence[str]) -> int:
         builder_version=BUILDER_VERSION,
         manifest_schema_ref=manifest_schema_ref,
         input_files=input_paths,
-        output_files=[out_md, out_html, out_data, out_pdf],
+        output_files=output_files,
         unresolved_template_vars=unresolved_sorted,
+        pdf_adapter=pdf_adapter_meta,
     )
 
     schema_path = repo_root / "artifacts" / "manifest.schema.json"
     validate_manifest_schema(read_json(manifest_path), schema_path)
+    if defer_pdf:
+        write_pdf_job(out_dir, html_path=out_html, pdf_path=out_pdf, manifest_path=manifest_path)
 
     if unresolved_sorted:
         msg = "Unresolved template variables:\n" + "\n".join(f"- {v}" for v in unresolved_sorted)
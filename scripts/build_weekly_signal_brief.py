@@ -16,6 +16,7 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import functools
 import hashlib
 import json
 import os
@@ -23,16 +24,33 @@ import re
 import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+try:
+    # Content-addressed PDF cache and persistent file-hash cache, when run from the repo;
+    # the standalone kit renders and hashes uncached.
+    from product_build_utils import default_hash_cache, default_pdf_cache, sha256_files
+except ImportError:  # pragma: no cover - kit layout
+    default_hash_cache = default_pdf_cache = sha256_files = None
+
 VAR_PATTERN = re.compile(r"{{\s*([a-zA-Z0-9_\-\.]+)\s*}}")
 
 BUILDER_NAME = "build_weekly_signal_brief"
 BUILDER_VERSION = "v01"
 MANIFEST_SCHEMA_VERSION = "v01"
 
+# Written by aggregate_weekly_inputs.py --propose-decisions (its DECISIONS_PROPOSED_FILENAME),
+# next to hooks_rollup.csv unless run.json sets inputs.files.decisions_proposed.
+DECISIONS_PROPOSED_FILENAME = "decisions_proposed.csv"
+
+# Same job file as product_build_utils.PDF_JOB_FILENAME: --defer-pdf leaves the PDF to
+# release_products.py, which renders every deferred job in one batch.
+PDF_JOB_FILENAME = "pdf_job.json"
+
 MISSING_TOKEN_PREFIX = "[[MISSING:"
 MISSING_TOKEN_SUFFIX = "]]"
 
@@ -60,6 +78,17 @@ def sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
+def sha256_many(paths: Sequence[Path]) -> List[str]:
+    """sha256 of each path (in order), through the repo's hash cache when available."""
+
+    if sha256_files is not None:
+        return sha256_files(paths, cache=default_hash_cache())
+    if len(paths) < 2:
+        return [sha256_file(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1, len(paths))) as pool:
+        return list(pool.map(sha256_file, paths))
+
+
 def git_head_commit(repo_root: Path) -> Optional[str]:
     try:
         out = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=str(repo_root), stderr=subprocess.DEVNULL)
@@ -117,22 +146,67 @@ def extract_allowlist_vars(allowlist_path: Path) -> Set[str]:
     return allowed
 
 
-def extract_template_vars(template_text: str) -> Set[str]:
-    return set(VAR_PATTERN.findall(template_text))
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal text and ``{{ var }}`` slots.
 
+    Mirrors product_build_utils.CompiledTemplate; this builder ships standalone in the kit.
+    """
+
+    sha256: str
+    literals: Tuple[str, ...]
+    keys: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, template_text: str, *, sha256: str = "") -> "CompiledTemplate":
+        literals: List[str] = []
+        keys: List[str] = []
+        placeholders: List[str] = []
+        pos = 0
+        for m in VAR_PATTERN.finditer(template_text):
+            literals.append(template_text[pos : m.start()])
+            keys.append(m.group(1))
+            placeholders.append(m.group(0))
+            pos = m.end()
+        literals.append(template_text[pos:])
+        return cls(sha256=sha256, literals=tuple(literals), keys=tuple(keys), placeholders=tuple(placeholders))
+
+    @property
+    def variables(self) -> Set[str]:
+        return set(self.keys)
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+        parts: List[str] = [self.literals[0]]
+        unresolved: Set[str] = set()
+        for key, placeholder, literal in zip(self.keys, self.placeholders, self.literals[1:]):
+            if key in values:
+                parts.append(str(values[key]))
+            else:
+                unresolved.add(key)
+                parts.append(placeholder)
+            parts.append(literal)
+        return "".join(parts), unresolved
+
+
+# Compiled templates by content sha256.
+_TEMPLATE_CACHE: Dict[str, CompiledTemplate] = {}
+
+
+def compile_template(template_text: str) -> CompiledTemplate:
+    digest = hashlib.sha256(template_text.encode("utf-8")).hexdigest()
+    compiled = _TEMPLATE_CACHE.get(digest)
+    if compiled is None:
+        compiled = _TEMPLATE_CACHE[digest] = CompiledTemplate.parse(template_text, sha256=digest)
+    return compiled
 
-def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
-    unresolved: Set[str] = set()
 
-    def repl(m: re.Match[str]) -> str:
-        key = m.group(1)
-        if key in values:
-            return str(values[key])
-        unresolved.add(key)
-        return m.group(0)
+def extract_template_vars(template_text: str) -> Set[str]:
+    return compile_template(template_text).variables
 
-    rendered = VAR_PATTERN.sub(repl, template_text)
-    return rendered, unresolved
+
+def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+    return compile_template(template_text).render(values)
 
 
 def join_list(value: Any) -> str:
@@ -308,10 +382,15 @@ def apply_template_context_overlay(
     return out
 
 
+# Manifest validators by (resolved schema path, schema content sha256).
+_MANIFEST_VALIDATORS: Dict[Tuple[str, str], Any] = {}
+
+
 def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> None:
     """Validate manifest against artifacts/manifest.schema.json using jsonschema.
 
-    This is the enforcement point that prevents drift and corrupted manifests.
+    This is the enforcement point that prevents drift and corrupted manifests. The validator
+    is built once per schema content and reused for the rest of the process.
     """
 
     if not schema_path.exists():
@@ -326,23 +405,60 @@ def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> Non
             f"({exc})"
         )
 
-    schema = read_json(schema_path)
+    raw = schema_path.read_bytes()
+    key = (str(schema_path.resolve()), hashlib.sha256(raw).hexdigest())
+    validator = _MANIFEST_VALIDATORS.get(key)
+    if validator is None:
+        try:
+            schema = json.loads(raw.decode("utf-8"))
+        except Exception as exc:
+            raise BuildError(f"Failed to read JSON: {schema_path} ({exc})")
+        validator = _MANIFEST_VALIDATORS.setdefault(key, jsonschema.Draft202012Validator(schema))
 
     try:
-        jsonschema.Draft202012Validator(schema).validate(manifest)
+        validator.validate(manifest)
     except jsonschema.ValidationError as exc:
         path_str = "/".join(str(p) for p in exc.path) if exc.path else "(root)"
         raise BuildError(f"Manifest failed schema validation at {path_str}: {exc.message}")
 
 
+@functools.lru_cache(maxsize=None)
+def wkhtmltopdf_version(exe: str) -> Optional[str]:
+    """``wkhtmltopdf --version``, once per process (WKHTMLTOPDF_VERSION from a release run wins)."""
+
+    version = os.environ.get("WKHTMLTOPDF_VERSION")
+    if version is None:
+        try:
+            v = subprocess.check_output([exe, "--version"], stderr=subprocess.STDOUT)
+            version = v.decode("utf-8", errors="replace").strip()
+        except Exception:
+            version = None
+    return version or None
+
+
+def _pdf_cache_hit(cache: Any, meta: Dict[str, Any], html_path: Path, pdf_path: Path, *, settings: Any) -> bool:
+    if cache is None:
+        return False
+    key, hit = cache.lookup(html_path, pdf_path, adapter=meta["name"], version=meta["version"], settings=settings)
+    if key:
+        meta["cache_key"], meta["cache_hit"] = key, hit
+    if hit:
+        meta["command_executed"] = None
+    return hit
+
+
 def run_pdf_adapter(
     *,
     adapter: str,
     html_path: Path,
     pdf_path: Path,
     pdf_cmd: Optional[str],
+    cache: Any = None,
 ) -> Dict[str, Any]:
-    """Standard adapter seam: given (html_path, pdf_path) produce a PDF."""
+    """Standard adapter seam: given (html_path, pdf_path) produce a PDF.
+
+    ``cache`` is an optional product_build_utils.PdfCache; a hit skips the adapter entirely.
+    """
 
     meta: Dict[str, Any] = {
         "name": adapter,
@@ -394,12 +510,13 @@ def run_pdf_adapter(
             str(pdf_path),
         ]
         meta["command_executed"] = " ".join(cmd)
-        try:
-            v = subprocess.check_output([exe, "--version"], stderr=subprocess.STDOUT)
-            meta["version"] = v.decode("utf-8", errors="replace").strip()
-        except Exception:
-            meta["version"] = None
+        meta["version"] = wkhtmltopdf_version(exe)
+        if _pdf_cache_hit(cache, meta, html_path, pdf_path, settings=cmd[1:-2]):
+            return meta
+        meta["started_at_utc"] = utc_now_iso()
+        started = time.perf_counter()
         proc = subprocess.run(cmd, capture_output=True, text=True)
+        meta["duration_sec"] = round(time.perf_counter() - started, 3)
         meta["exit_code"] = proc.returncode
         stdout = proc.stdout or ""
         stderr = proc.stderr or ""
@@ -415,6 +532,8 @@ def run_pdf_adapter(
             raise BuildError(f"wkhtmltopdf failed (exit {proc.returncode}): {stderr.strip() or stdout.strip()}")
         if not pdf_path.exists() or pdf_path.stat().st_size == 0:
             raise BuildError("wkhtmltopdf reported success but PDF was not created")
+        if meta.get("cache_key"):
+            cache.store(meta["cache_key"], pdf_path)
         return meta
 
     if adapter == "command":
@@ -423,7 +542,12 @@ def run_pdf_adapter(
         meta["command_template"] = pdf_cmd
         cmd_str = pdf_cmd.format(html=str(html_path), pdf=str(pdf_path))
         meta["command_executed"] = cmd_str
+        if _pdf_cache_hit(cache, meta, html_path, pdf_path, settings={"command_template": pdf_cmd}):
+            return meta
+        meta["started_at_utc"] = utc_now_iso()
+        started = time.perf_counter()
         proc = subprocess.run(cmd_str, shell=True, capture_output=True, text=True)
+        meta["duration_sec"] = round(time.perf_counter() - started, 3)
         meta["exit_code"] = proc.returncode
         stdout = proc.stdout or ""
         stderr = proc.stderr or ""
@@ -439,6 +563,8 @@ def run_pdf_adapter(
             raise BuildError(f"pdf adapter command failed (exit {proc.returncode}): {stderr.strip() or stdout.strip()}")
         if not pdf_path.exists() or pdf_path.stat().st_size == 0:
             raise BuildError("PDF adapter reported success but PDF was not created")
+        if meta.get("cache_key"):
+            cache.store(meta["cache_key"], pdf_path)
         return meta
 
     raise BuildError(f"Unknown --pdf-adapter: {adapter}")
@@ -535,7 +661,10 @@ def write_manifest(
     if pdf_adapter_meta and pdf_adapter_meta.get("name") and pdf_adapter_meta.get("name") != "none":
         manifest["pdf_adapter"] = pdf_adapter_meta
 
-    for logical_name, path in input_files.items():
+    digests = sha256_many([*input_files.values(), *output_files])
+    input_digests, output_digests = digests[: len(input_files)], digests[len(input_files) :]
+
+    for (logical_name, path), digest in zip(input_files.items(), input_digests):
         try:
             display_path = str(path.relative_to(repo_root).as_posix())
         except Exception:
@@ -544,17 +673,17 @@ def write_manifest(
             {
                 "name": logical_name,
                 "path": display_path,
-                "sha256": sha256_file(path),
+                "sha256": digest,
             }
         )
 
-    for path in output_files:
+    for path, digest in zip(output_files, output_digests):
         st = path.stat()
         manifest["outputs"].append(
             {
                 "type": path.suffix.lstrip(".") or "file",
                 "filename": path.name,
-                "sha256": sha256_file(path),
+                "sha256": digest,
                 "size_bytes": st.st_size,
                 "content_type": guess_content_type(path.name),
                 "storage": None,
@@ -668,6 +797,14 @@ def main(argv: Sequence[str]) -> int:
         default="token",
         help="How to render allowlisted-but-missing variables when not strict (default: visible token)",
     )
+    parser.add_argument(
+        "--use-proposed-decisions",
+        action="store_true",
+        help=(
+            "Use the machine-proposed decisions from aggregate_weekly_inputs.py --propose-decisions "
+            f"(inputs.files.decisions_proposed, else {DECISIONS_PROPOSED_FILENAME} next to hooks_rollup.csv)"
+        ),
+    )
     parser.add_argument(
         "--manifest-schema",
         default=None,
@@ -689,6 +826,14 @@ def main(argv: Sequence[str]) -> int:
         default=None,
         help="Command template for --pdf-adapter=command. Use {html} and {pdf} placeholders.",
     )
+    parser.add_argument(
+        "--defer-pdf",
+        action="store_true",
+        help=(
+            f"With a PDF adapter, skip rendering and write {PDF_JOB_FILENAME} "
+            "for release_products.py to render in one batch"
+        ),
+    )
     args = parser.parse_args(argv)
 
     # Alias: strict-context is the same enforcement as fail-on-unresolved.
@@ -734,6 +879,16 @@ def main(argv: Sequence[str]) -> int:
             raise BuildError(f"run.json inputs.files missing '{fkey}' ({run_file})")
 
     input_paths: Dict[str, Path] = {k: (run_root / Path(v)).resolve() for k, v in files.items()}
+    # Proposals are an optional aggregator output, not a required input: never checked below.
+    proposed = input_paths.pop("decisions_proposed", None)
+    if args.use_proposed_decisions:
+        if proposed is None:
+            proposed = input_paths["hooks_rollup"].with_name(DECISIONS_PROPOSED_FILENAME)
+        if not proposed.exists():
+            raise BuildError(
+                f"--use-proposed-decisions: {proposed} not found (run aggregate_weekly_inputs.py --propose-decisions)"
+            )
+        input_paths["decisions"] = proposed
 
     for k, p in input_paths.items():
         if not p.exists():
@@ -835,10 +990,10 @@ def main(argv: Sequence[str]) -> int:
 
     allowed_vars = extract_allowlist_vars(allowlist_path)
 
-    md_template_text = md_template_path.read_text(encoding="utf-8")
-    html_template_text = html_template_path.read_text(encoding="utf-8")
+    md_template = compile_template(md_template_path.read_text(encoding="utf-8"))
+    html_template = compile_template(html_template_path.read_text(encoding="utf-8"))
 
-    used_vars = extract_template_vars(md_template_text) | extract_template_vars(html_template_text)
+    used_vars = md_template.variables | html_template.variables
     unknown_vars = sorted(v for v in used_vars if v not in allowed_vars)
     if unknown_vars:
         raise BuildError(
@@ -865,8 +1020,8 @@ def main(argv: Sequence[str]) -> int:
         raise BuildError("Missing template context values (strict):\n" + "\n".join(f"- {v}" for v in missing_vars))
 
     # Render artifacts
-    rendered_md, unresolved_md = render_template(md_template_text, ctx)
-    rendered_html, unresolved_html = render_template(html_template_text, ctx)
+    rendered_md, unresolved_md = md_template.render(ctx)
+    rendered_html, unresolved_html = html_template.render(ctx)
 
     unresolved = sorted(set(unresolved_md) | set(unresolved_html))
 
@@ -895,17 +1050,23 @@ def main(argv: Sequence[str]) -> int:
 
     pdf_adapter_meta: Optional[Dict[str, Any]] = None
     out_pdf: Optional[Path] = None
+    defer_pdf = args.defer_pdf and args.pdf_adapter != "none"
     if args.pdf_adapter != "none":
         out_pdf = (
             Path(args.pdf_path).resolve()
             if args.pdf_path
             else (out_dir / f"weekly_signal_brief_{run['week_id']}_{BUILDER_VERSION}.pdf")
         )
+    if defer_pdf:
+        # Filled in (with the PDF output) once release_products.py has rendered the batch.
+        pdf_adapter_meta = {"name": args.pdf_adapter, "version": None, "exit_code": None, "deferred": True}
+    elif out_pdf is not None:
         pdf_adapter_meta = run_pdf_adapter(
             adapter=args.pdf_adapter,
             html_path=out_html,
             pdf_path=out_pdf,
             pdf_cmd=args.pdf_cmd,
+            cache=default_pdf_cache() if default_pdf_cache is not None else None,
         )
 
     # Manifest
@@ -924,7 +1085,7 @@ def main(argv: Sequence[str]) -> int:
         out_decisions,
         out_dataset_health,
     ]
-    if out_pdf and out_pdf.exists():
+    if out_pdf and out_pdf.exists() and not defer_pdf:
         output_files.append(out_pdf)
 
     write_manifest(
@@ -944,6 +1105,9 @@ def main(argv: Sequence[str]) -> int:
 
     manifest_obj = read_json(manifest_path)
     validate_manifest_schema(manifest_obj, schema_path)
+    if defer_pdf:
+        job = {"html": str(out_html), "pdf": str(out_pdf), "manifest": str(manifest_path)}
+        (out_dir / PDF_JOB_FILENAME).write_text(json.dumps(job, indent=2) + "\n", encoding="utf-8")
 
     if unresolved:
         msg = "Unresolved template variables:\n" + "\n".join(f"- {v}" for v in unresolved)
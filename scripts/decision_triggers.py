@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Machine-proposed kill / iterate / scale decisions (analytics/schema.md §9).
+
+Stdlib-only. Reads hook/vertical rollup rows as aggregate_weekly_inputs.py builds them,
+optionally with the same pattern's standing in earlier weeks, and emits rows in the
+decisions.csv layout (templates/csv_appendix_schema.md, Table 3) for review.
+
+posts_export.csv carries no policy/monetization risk flags, so that part of the scale
+trigger cannot be checked here; a human still signs off on every proposal.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime as dt
+import math
+import re
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+DECISIONS_COLUMNS = [
+    "week_id",
+    "decision_type",
+    "pattern_type",
+    "pattern_id",
+    "block_id",
+    "evidence_summary",
+    "next_action",
+    "followup_week",
+]
+
+# §9.1 minimum valid samples before any structural decision.
+MIN_SAMPLES = {"hook": 6, "vertical": 10}
+# §9.4 win rate a top-quartile pattern needs to be scaled.
+SCALE_MIN_WIN_RATE = 0.60
+# §9.2 "no improvement after 2 iterations": consecutive earlier weeks below baseline before a kill.
+KILL_AFTER_WEEKS = 2
+
+_EPSILON = 1e-9
+_WEEK_ID_PATTERN = re.compile(r"^(\d{4})-W(\d{2})")
+
+
+@dataclass(frozen=True)
+class PatternStanding:
+    """One pattern (hook type or vertical) within one comparison set for one week."""
+
+    week_id: str
+    pattern_type: str
+    pattern_id: str
+    platform: str
+    duration_band: str
+    block_id: str
+    samples: int
+    win_rate: float
+    score: Optional[float]
+    # Quartile of the pattern's score median within its comparison set: "top", "mid" or
+    # "bottom"; None when the set has fewer than two scored patterns.
+    quartile: Optional[str]
+    # Lift of the pattern's median completion and save+share rate vs the baseline.
+    completion_lift: Optional[float]
+    save_share_lift: Optional[float]
+
+    @property
+    def key(self) -> Tuple[str, str, str, str]:
+        """Identity across weeks: blocks change from week to week, the pattern and its platform/band do not."""
+
+        return (self.pattern_type, self.pattern_id, self.platform, self.duration_band)
+
+    @property
+    def meets_minimum(self) -> bool:
+        return self.samples >= MIN_SAMPLES.get(self.pattern_type, 0)
+
+    @property
+    def below_baseline(self) -> bool:
+        return (
+            self.completion_lift is not None
+            and self.save_share_lift is not None
+            and self.completion_lift < 0
+            and self.save_share_lift < 0
+        )
+
+    @property
+    def scale_candidate(self) -> bool:
+        return self.meets_minimum and self.quartile == "top" and self.win_rate >= SCALE_MIN_WIN_RATE
+
+
+def _num(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(f) else f
+
+
+def _lift(value: Optional[float], baseline: Optional[float]) -> Optional[float]:
+    if value is None or baseline is None:
+        return None
+    return (value - baseline) / max(_EPSILON, baseline)
+
+
+def _median_or_none(values: Iterable[Optional[float]]) -> Optional[float]:
+    present = [v for v in values if v is not None]
+    return statistics.median(present) if present else None
+
+
+def standings(
+    rows: Sequence[Dict[str, Any]],
+    *,
+    pattern_type: str,
+    pattern_field: str,
+    prefix: str,
+    baselines: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> List[PatternStanding]:
+    """Rank each comparison set's patterns once, then place every row against its set.
+
+    Quartile cut points are computed once per comparison set from its patterns' score
+    medians, so classifying a row is O(1). ``baselines`` maps block_id to the control
+    baseline (median completion, median save+share rate); a block without one is compared
+    with the median pattern of its comparison set.
+    """
+
+    by_set: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+    for r in rows:
+        by_set.setdefault((str(r["platform"]), str(r["duration_band"]), str(r["block_id"])), []).append(r)
+
+    completion_col = f"{prefix}_median_completion"
+    save_share_col = f"{prefix}_median_save_share_rate"
+    score_col = f"{prefix}_score_median"
+
+    out: List[PatternStanding] = []
+    for (platform, band, block_id), members in by_set.items():
+        scores = [s for s in (_num(r.get(score_col)) for r in members) if s is not None]
+        cuts = statistics.quantiles(scores, n=4, method="inclusive") if len(scores) >= 2 else None
+
+        baseline = (baselines or {}).get(block_id)
+        if baseline is not None:
+            base_c, base_ss = _num(baseline[0]), _num(baseline[1])
+        else:
+            base_c = _median_or_none(_num(r.get(completion_col)) for r in members)
+            base_ss = _median_or_none(_num(r.get(save_share_col)) for r in members)
+
+        for r in members:
+            score = _num(r.get(score_col))
+            quartile: Optional[str] = None
+            if cuts is not None and score is not None:
+                quartile = "top" if score >= cuts[2] else "bottom" if score <= cuts[0] else "mid"
+            out.append(
+                PatternStanding(
+                    week_id=str(r["week_id"]),
+                    pattern_type=pattern_type,
+                    pattern_id=str(r[pattern_field]),
+                    platform=platform,
+                    duration_band=band,
+                    block_id=block_id,
+                    samples=int(r[f"{prefix}_samples"]),
+                    win_rate=_num(r.get(f"{prefix}_win_rate")) or 0.0,
+                    score=score,
+                    quartile=quartile,
+                    completion_lift=_lift(_num(r.get(completion_col)), base_c),
+                    save_share_lift=_lift(_num(r.get(save_share_col)), base_ss),
+                )
+            )
+    return out
+
+
+def _week_key(week_id: str) -> Tuple[int, int]:
+    m = _WEEK_ID_PATTERN.match(week_id)
+    if not m:
+        raise ValueError(f"week_id is not an ISO week (YYYY-Www...): {week_id}")
+    return int(m.group(1)), int(m.group(2))
+
+
+def followup_week(week_id: str) -> str:
+    year, week = _week_key(week_id)
+    monday = dt.date.fromisocalendar(year, week, 1) + dt.timedelta(weeks=1)
+    y, w, _ = monday.isocalendar()
+    return f"{y}-W{w:02d}"
+
+
+def _trailing_weeks_below(prior: Sequence[PatternStanding]) -> int:
+    """Consecutive most recent earlier weeks in which every standing of the pattern was below baseline."""
+
+    by_week: Dict[Tuple[int, int], bool] = {}
+    for p in prior:
+        wk = _week_key(p.week_id)
+        by_week[wk] = by_week.get(wk, True) and p.below_baseline
+    count = 0
+    for wk in sorted(by_week, reverse=True):
+        if not by_week[wk]:
+            break
+        count += 1
+    return count
+
+
+def _pct(v: Optional[float]) -> str:
+    return "n/a" if v is None else f"{v:+.0%}"
+
+
+def _evidence(s: PatternStanding, reason: str) -> str:
+    return (
+        f"{reason}; {s.platform} {s.duration_band}: n={s.samples}, win_rate={s.win_rate:.2f}, "
+        f"score quartile={s.quartile or 'n/a'}, completion lift={_pct(s.completion_lift)}, "
+        f"save+share lift={_pct(s.save_share_lift)}"
+    )
+
+
+def propose(
+    current: Sequence[PatternStanding],
+    history: Sequence[PatternStanding] = (),
+    *,
+    week_id: str,
+    drift_flags: Sequence[str] = (),
+) -> List[Dict[str, str]]:
+    """Decision rows for the patterns in ``current`` that trigger §9.
+
+    ``history`` holds standings from other weeks; only weeks before ``week_id`` are used.
+    Patterns below the §9.1 minimum are skipped. With drift flagged, neither a kill nor a
+    volatility call is made, because drift could explain the change.
+    """
+
+    this_week = _week_key(week_id)
+    prior: Dict[Tuple[str, str, str, str], List[PatternStanding]] = {}
+    for p in history:
+        if _week_key(p.week_id) < this_week:
+            prior.setdefault(p.key, []).append(p)
+
+    # Blocks in which each pattern meets the scale bar this week, for the replication check.
+    candidate_blocks: Dict[Tuple[str, str, str, str], Set[str]] = {}
+    for s in current:
+        if s.scale_candidate:
+            candidate_blocks.setdefault(s.key, set()).add(s.block_id)
+
+    follow = followup_week(week_id)
+    out: List[Dict[str, str]] = []
+    order = {t: i for i, t in enumerate(MIN_SAMPLES)}
+    for s in sorted(
+        current,
+        key=lambda s: (order.get(s.pattern_type, len(order)), s.pattern_id, s.block_id, s.platform, s.duration_band),
+    ):
+        if not s.meets_minimum:
+            continue
+        past = prior.get(s.key, [])
+        quartiles_seen = {p.quartile for p in past} | {s.quartile}
+        volatile = not drift_flags and {"top", "bottom"} <= quartiles_seen
+
+        if s.below_baseline:
+            weeks_below = _trailing_weeks_below(past)
+            if weeks_below >= KILL_AFTER_WEEKS and not drift_flags:
+                decision = ("kill", "retire", f"below baseline now and in the previous {weeks_below} weeks")
+            else:
+                decision = ("iterate", "change one variable", "below-baseline completion and save+share")
+        elif volatile:
+            decision = ("iterate", "change one variable", "volatile: top and bottom quartile across weeks")
+        elif s.scale_candidate:
+            replicated = bool(candidate_blocks[s.key] - {s.block_id}) or any(p.scale_candidate for p in past)
+            if replicated:
+                decision = ("scale", "scale", f"top quartile with win_rate >= {SCALE_MIN_WIN_RATE:.2f}, replicated")
+            else:
+                decision = (
+                    "keep",
+                    "replicate in a confirmatory block",
+                    f"top quartile with win_rate >= {SCALE_MIN_WIN_RATE:.2f}",
+                )
+        elif (
+            s.completion_lift is not None
+            and s.save_share_lift is not None
+            and s.completion_lift >= 0 > s.save_share_lift
+        ):
+            decision = ("iterate", "change one variable", "strong completion, weak save+share (distribution intent)")
+        elif (
+            s.completion_lift is not None
+            and s.save_share_lift is not None
+            and s.save_share_lift >= 0 > s.completion_lift
+        ):
+            decision = ("iterate", "change one variable", "strong save+share, weak completion (packaging mismatch)")
+        else:
+            continue
+
+        decision_type, next_action, reason = decision
+        out.append(
+            {
+                "week_id": week_id,
+                "decision_type": decision_type,
+                "pattern_type": s.pattern_type,
+                "pattern_id": s.pattern_id,
+                "block_id": s.block_id,
+                "evidence_summary": _evidence(s, reason),
+                "next_action": next_action,
+                "followup_week": follow,
+            }
+        )
+    return out
+
+
+def write_decisions(path: Path, rows: Sequence[Dict[str, str]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=DECISIONS_COLUMNS)
+        w.writeheader()
+        w.writerows(rows)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Week-over-week distribution drift for per-platform metrics.
+
+Stdlib-only. Each week is summarized as fixed-bin histograms of completion_pct and
+loop_pct per platform (valid rows only). A week's histograms are small and mergeable, so
+aggregate_weekly_inputs.py caches them per export (outside the run directories) and a
+long lookback never re-reads old exports.
+
+The current week is compared with an exponentially weighted reference built from the
+earlier weeks (half-life in weeks), using PSI and the two-sample KS statistic on the
+binned CDFs.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DRIFT_METRICS: Tuple[str, ...] = ("completion_pct", "loop_pct")
+
+# Both metrics are fractions: [0, 1] in equal-width bins, out-of-range values clamped to the edge bins.
+BINS = 20
+
+# PSI > 0.25 is the conventional "significant shift"; KS is compared with its critical value at ALPHA.
+DEFAULT_PSI_THRESHOLD = 0.25
+DEFAULT_KS_ALPHA = 0.05
+DEFAULT_HALFLIFE_WEEKS = 4.0
+# Minimum rows on each side before a platform/metric pair is tested at all.
+MIN_SAMPLES = 30
+
+# Floor for empty-bin proportions so PSI stays finite.
+_PSI_FLOOR = 1e-4
+
+# (platform, metric) -> bin counts.
+Histograms = Dict[Tuple[str, str], List[int]]
+
+
+def bin_index(value: float) -> int:
+    return min(BINS - 1, max(0, int(value * BINS)))
+
+
+def add_values(hists: Histograms, platform: str, metric: str, values: Iterable[float]) -> None:
+    """Count non-NaN ``values`` into the (platform, metric) histogram."""
+
+    counts = hists.setdefault((platform, metric), [0] * BINS)
+    for v in values:
+        if not math.isnan(v):
+            counts[bin_index(v)] += 1
+
+
+def to_json(hists: Histograms) -> List[Dict[str, object]]:
+    return [{"platform": p, "metric": m, "counts": counts} for (p, m), counts in sorted(hists.items())]
+
+
+def from_json(entries: Sequence[Dict[str, object]]) -> Histograms:
+    out: Histograms = {}
+    for e in entries:
+        counts = [int(c) for c in e["counts"]]  # type: ignore[union-attr]
+        if len(counts) != BINS:
+            raise ValueError(f"histogram has {len(counts)} bins, expected {BINS}")
+        out[(str(e["platform"]), str(e["metric"]))] = counts
+    return out
+
+
+def weighted_reference(weeks: Sequence[Tuple[int, Histograms]], halflife: float) -> Dict[Tuple[str, str], List[float]]:
+    """Exponentially weighted bin counts over earlier weeks; ``weeks`` holds (age in weeks >= 1, histograms).
+
+    A week ``age`` weeks back weighs 0.5 ** ((age - 1) / halflife), so last week counts fully.
+    """
+
+    out: Dict[Tuple[str, str], List[float]] = {}
+    for age, hists in weeks:
+        w = 0.5 ** ((age - 1) / halflife)
+        for key, counts in hists.items():
+            acc = out.setdefault(key, [0.0] * BINS)
+            for i, c in enumerate(counts):
+                acc[i] += w * c
+    return out
+
+
+def _proportions(counts: Sequence[float]) -> List[float]:
+    total = float(sum(counts))
+    return [c / total for c in counts]
+
+
+def psi(current: Sequence[float], reference: Sequence[float]) -> float:
+    """Population stability index of ``current`` against ``reference`` (both bin counts)."""
+
+    out = 0.0
+    for a, e in zip(_proportions(current), _proportions(reference)):
+        a = max(a, _PSI_FLOOR)
+        e = max(e, _PSI_FLOOR)
+        out += (a - e) * math.log(a / e)
+    return out
+
+
+def ks_statistic(current: Sequence[float], reference: Sequence[float]) -> float:
+    """Largest gap between the two binned CDFs (a lower bound on the exact KS statistic)."""
+
+    gap = cdf_a = cdf_b = 0.0
+    for a, b in zip(_proportions(current), _proportions(reference)):
+        cdf_a += a
+        cdf_b += b
+        gap = max(gap, abs(cdf_a - cdf_b))
+    return gap
+
+
+def ks_critical(n: float, m: float, alpha: float = DEFAULT_KS_ALPHA) -> float:
+    """Asymptotic two-sample KS critical value; ``m`` may be an effective (weighted) size."""
+
+    return math.sqrt(-0.5 * math.log(alpha / 2.0)) * math.sqrt((n + m) / (n * m))
+
+
+def check_drift(
+    current: Histograms,
+    earlier_weeks: Sequence[Tuple[int, Histograms]],
+    *,
+    halflife: float = DEFAULT_HALFLIFE_WEEKS,
+    psi_threshold: float = DEFAULT_PSI_THRESHOLD,
+    ks_alpha: float = DEFAULT_KS_ALPHA,
+) -> Tuple[List[str], List[Dict[str, object]]]:
+    """(drift flags, per platform/metric details) for ``current`` against the weighted reference.
+
+    A pair is flagged ``distribution_shift:<platform>:<metric>`` when PSI exceeds
+    ``psi_threshold`` or KS exceeds its critical value.
+    """
+
+    reference = weighted_reference(earlier_weeks, halflife)
+    flags: List[str] = []
+    details: List[Dict[str, object]] = []
+    for key in sorted(current):
+        ref = reference.get(key)
+        n = sum(current[key])
+        m = 0.0 if ref is None else sum(ref)
+        if n < MIN_SAMPLES or m < MIN_SAMPLES:
+            continue
+        platform, metric = key
+        p = psi(current[key], ref)
+        ks = ks_statistic(current[key], ref)
+        critical = ks_critical(n, m, ks_alpha)
+        shifted = p > psi_threshold or ks > critical
+        details.append(
+            {
+                "platform": platform,
+                "metric": metric,
+                "samples": n,
+                "reference_weight": round(m, 1),
+                "psi": round(p, 4),
+                "ks": round(ks, 4),
+                "ks_critical": round(critical, 4),
+                "flagged": shifted,
+            }
+        )
+        if shifted:
+            flags.append(f"distribution_shift:{platform}:{metric}")
+    return flags, details
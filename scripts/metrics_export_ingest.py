@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""Bulk ingester for platform analytics exports (automation/metrics_pull.md §2.2 export/manual mode).
+
+Stdlib-first (NumPy vectorizes the checks when installed). Each export CSV is streamed
+in chunks of CHUNK_ROWS rows, so memory stays flat however large the file is. Per chunk:
+
+1. §5 mapping: export columns are renamed to snapshot fields by an ExportMapping, and
+   percents/durations are scaled to §5.2 units (percent 0-100, seconds).
+2. §6 validation runs column-wise over the whole chunk: non-negative metrics, percent
+   fields within 0-100, plausible durations, and capture time within the window's grace.
+3. Every row with a complete identity is stored as a snapshot (rejected ones carrying
+   their errors, §6 "store the snapshot with an error flag"); rejected rows are also
+   appended to ``<export>.rejected.csv`` for the operator.
+
+Usage:
+  python scripts/metrics_export_ingest.py --db metrics.sqlite --run-id RUN-2026-01-23-x \\
+      --mapping tiktok_export_mapping.json --window W24H exports/tiktok_*.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import metrics_snapshot_store as store
+from metrics_snapshot_store import GRACE_SEC, METRIC_FIELDS, WINDOW_OFFSET_SEC
+
+try:  # Optional: vectorized checks.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None  # type: ignore[assignment]
+
+CHECK_ENGINES = ("auto", "numpy", "stdlib")
+CHUNK_ROWS = 20000
+
+PERCENT_FIELDS = ("completion_pct", "loop_pct")
+REQUIRED_IDENTITY = ("canonical_post_id", "platform", "window", "captured_at_utc")
+IDENTITY_FIELDS = REQUIRED_IDENTITY + ("account_id", "post_url", "publish_time_utc", "attempt")
+REJECTED_SUFFIX = ".rejected.csv"
+
+
+@dataclass(frozen=True)
+class ExportMapping:
+    """§5.1 mapping from one export layout to snapshot fields.
+
+    JSON layout (every key optional)::
+
+        {"columns": {"Video ID": "canonical_post_id", "avgWatchTime": "avg_view_duration_sec",
+                     "completionRate": "completion_pct", "replays": "loop_pct"},
+         "percent_scale": 100,          # export percents are fractions (0.42)
+         "duration_scale": 0.001,       # export durations are milliseconds
+         "field_warnings": {"loop_pct": "LOOP_DEFINITION_DIFF"},
+         "defaults": {"platform": "tiktok", "window": "W24H"}}
+
+    Columns already named like a snapshot field need no entry (manual-mode CSVs).
+    """
+
+    columns: Dict[str, str] = field(default_factory=dict)
+    percent_scale: float = 1.0
+    duration_scale: float = 1.0
+    field_warnings: Dict[str, str] = field(default_factory=dict)
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportMapping":
+        spec = json.loads(path.read_text(encoding="utf-8"))
+        mapping = cls(
+            columns={str(k): str(v) for k, v in (spec.get("columns") or {}).items()},
+            percent_scale=float(spec.get("percent_scale", 1.0)),
+            duration_scale=float(spec.get("duration_scale", 1.0)),
+            field_warnings={str(k): str(v) for k, v in (spec.get("field_warnings") or {}).items()},
+            defaults={str(k): str(v) for k, v in (spec.get("defaults") or {}).items()},
+        )
+        unknown = sorted(set(mapping.columns.values()) - set(IDENTITY_FIELDS) - set(METRIC_FIELDS))
+        if unknown:
+            raise ValueError(f"{path}: mapping targets unknown fields: {', '.join(unknown)}")
+        return mapping
+
+    @property
+    def version(self) -> str:
+        """Stable id of the mapping rules, recorded as the snapshot adapter_version (§12)."""
+
+        spec = [
+            sorted(self.columns.items()),
+            self.percent_scale,
+            self.duration_scale,
+            sorted(self.field_warnings.items()),
+        ]
+        return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()[:12]
+
+    def with_defaults(self, **defaults: Optional[str]) -> "ExportMapping":
+        merged = dict(self.defaults, **{k: v for k, v in defaults.items() if v})
+        return ExportMapping(self.columns, self.percent_scale, self.duration_scale, self.field_warnings, merged)
+
+    def field_indexes(self, header: Sequence[str]) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for i, name in enumerate(header):
+            target = self.columns.get(name.strip(), name.strip())
+            if target in IDENTITY_FIELDS or target in METRIC_FIELDS:
+                out.setdefault(target, i)
+        return out
+
+
+@dataclass
+class FileReport:
+    path: str
+    rows: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    stored: int = 0
+    duplicates: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    def to_json(self) -> Dict[str, Any]:
+        rate = self.rows / self.seconds if self.seconds else 0.0
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "rows_per_sec": round(rate, 1),
+            "mb_per_sec": round(self.bytes / 1e6 / self.seconds, 2) if self.seconds else 0.0,
+        }
+
+
+def _resolve_check_engine(name: str) -> str:
+    if name == "auto":
+        return "stdlib" if np is None else "numpy"
+    if name == "numpy" and np is None:
+        raise SystemExit("--engine numpy requires NumPy (pip install numpy)")
+    if name not in CHECK_ENGINES:
+        raise SystemExit(f"unknown check engine: {name}")
+    return name
+
+
+@dataclass
+class _Chunk:
+    """One chunk of export rows, column-wise: identity text, metric floats (NaN = blank)."""
+
+    rows: List[List[str]]
+    identity: Dict[str, List[Optional[str]]] = field(default_factory=dict)
+    metrics: Dict[str, array] = field(default_factory=dict)
+    # Seconds from the window's target time to capture; NaN when either timestamp is missing.
+    lag: array = field(default_factory=lambda: array("d"))
+    grace: array = field(default_factory=lambda: array("d"))
+    # Per-row errors (parse errors first, then the §6 checks) and blank metric fields.
+    errors: List[List[str]] = field(default_factory=list)
+    missing: List[List[str]] = field(default_factory=list)
+
+
+def _floats(col: List[str], scale: float) -> Tuple[array, List[int]]:
+    """(values, indexes of unparseable cells); blanks and bad cells are NaN."""
+
+    nan = math.nan
+    try:
+        values = array("d", [float(v) if v else nan for v in col])
+        bad: List[int] = []
+    except ValueError:
+        values, bad = array("d"), []
+        for i, v in enumerate(col):
+            try:
+                values.append(float(v) if v else nan)
+            except ValueError:
+                values.append(nan)
+                bad.append(i)
+    if scale != 1.0:
+        values = array("d", [v * scale for v in values])
+    return values, bad
+
+
+def _epochs(col: List[Optional[str]], cache: Dict[str, Optional[float]]) -> List[Optional[float]]:
+    """Epoch seconds per cell (None when blank or unparseable); exports repeat timestamps a lot."""
+
+    out: List[Optional[float]] = []
+    for v in col:
+        if v is None:
+            out.append(None)
+            continue
+        t = cache.get(v, math.inf)
+        if t == math.inf:
+            try:
+                t = store.parse_utc(v)
+            except ValueError:
+                t = None
+            cache[v] = t
+        out.append(t)
+    return out
+
+
+def _parse_chunk(rows: List[List[str]], idx: Dict[str, int], mapping: ExportMapping) -> _Chunk:
+    n = len(rows)
+    chunk = _Chunk(rows=rows, errors=[[] for _ in range(n)], missing=[[] for _ in range(n)])
+    errors = chunk.errors
+
+    def column(f: str) -> List[str]:
+        i = idx.get(f)
+        return [""] * n if i is None else [r[i].strip() for r in rows]
+
+    for f in IDENTITY_FIELDS:
+        default = mapping.defaults.get(f) or None
+        chunk.identity[f] = [v or default for v in column(f)]
+    for f in REQUIRED_IDENTITY:
+        for i, v in enumerate(chunk.identity[f]):
+            if v is None:
+                errors[i].append(f"MISSING_IDENTITY:{f}")
+    windows = chunk.identity["window"]
+    for i, w in enumerate(windows):
+        if w is not None and w not in WINDOW_OFFSET_SEC:
+            errors[i].append(f"UNKNOWN_WINDOW:{w}")
+
+    scale = {f: mapping.percent_scale for f in PERCENT_FIELDS}
+    scale["avg_view_duration_sec"] = mapping.duration_scale
+    for f in METRIC_FIELDS:
+        col = column(f)
+        chunk.metrics[f], bad = _floats(col, scale.get(f, 1.0))
+        for i in bad:
+            errors[i].append(f"UNPARSEABLE:{f}")
+        for i, v in enumerate(col):
+            if not v:
+                chunk.missing[i].append(f)
+
+    cache: Dict[str, Optional[float]] = {}
+    captured = _epochs(chunk.identity["captured_at_utc"], cache)
+    published = _epochs(chunk.identity["publish_time_utc"], cache)
+    nan = math.nan
+    for i, (c, p, w) in enumerate(zip(captured, published, windows)):
+        lag = grace = nan
+        if c is None and chunk.identity["captured_at_utc"][i] is not None:
+            errors[i].append("UNPARSEABLE:captured_at_utc")
+        if p is None:
+            errors[i].append(
+                "PUBLISH_TIME_MISSING"
+                if chunk.identity["publish_time_utc"][i] is None
+                else "UNPARSEABLE:publish_time_utc"
+            )
+        elif c is not None and w in WINDOW_OFFSET_SEC:
+            lag = c - p - WINDOW_OFFSET_SEC[w]
+            grace = GRACE_SEC[w]
+        chunk.lag.append(lag)
+        chunk.grace.append(grace)
+    return chunk
+
+
+def _check_masks(chunk: _Chunk, engine: str) -> List[Tuple[str, Sequence[int]]]:
+    """(error code, row indexes) for every §6 check, evaluated column-wise over the chunk.
+
+    Codes per metric follow metrics_snapshot_store.validation_errors, so a row gets the
+    same errors here as from the scalar validator.
+    """
+
+    checks: List[Tuple[str, Sequence[int]]] = []
+    if engine == "numpy":
+        for f in METRIC_FIELDS:
+            v = np.frombuffer(chunk.metrics[f], dtype=np.float64)
+            checks.append((f"NEGATIVE_METRIC:{f}", np.flatnonzero(v < 0).tolist()))
+            if f in PERCENT_FIELDS:
+                checks.append((f"PERCENT_OUT_OF_RANGE:{f}", np.flatnonzero(v > 100).tolist()))
+            elif f == "avg_view_duration_sec":
+                checks.append(
+                    (f"DURATION_OUT_OF_RANGE:{f}", np.flatnonzero(v > store.MAX_AVG_VIEW_DURATION_SEC).tolist())
+                )
+        lag = np.frombuffer(chunk.lag, dtype=np.float64)
+        grace = np.frombuffer(chunk.grace, dtype=np.float64)
+        checks.append(("BEFORE_WINDOW", np.flatnonzero(lag < 0).tolist()))
+        checks.append(("OUTSIDE_GRACE", np.flatnonzero(lag > grace).tolist()))
+        return checks
+
+    def where(col: Sequence[float], test: Any) -> List[int]:
+        return [i for i, v in enumerate(col) if test(v)]
+
+    for f in METRIC_FIELDS:
+        col = chunk.metrics[f]
+        checks.append((f"NEGATIVE_METRIC:{f}", where(col, lambda v: v < 0)))
+        if f in PERCENT_FIELDS:
+            checks.append((f"PERCENT_OUT_OF_RANGE:{f}", where(col, lambda v: v > 100)))
+        elif f == "avg_view_duration_sec":
+            checks.append((f"DURATION_OUT_OF_RANGE:{f}", where(col, lambda v: v > store.MAX_AVG_VIEW_DURATION_SEC)))
+    checks.append(("BEFORE_WINDOW", where(chunk.lag, lambda v: v < 0)))
+    checks.append(("OUTSIDE_GRACE", [i for i, (v, g) in enumerate(zip(chunk.lag, chunk.grace)) if v > g]))
+    return checks
+
+
+def _snapshots(
+    chunk: _Chunk, header: Sequence[str], mapping: ExportMapping, *, run_id: str, source_mode: str, adapter_version: str
+) -> Iterator[Tuple[int, Optional[store.MetricsSnapshot]]]:
+    ident = chunk.identity
+    # Metric columns with None for blanks, the way MetricsSnapshot stores them.
+    metrics = {f: [None if v != v else v for v in chunk.metrics[f]] for f in METRIC_FIELDS}
+    warned = [(metrics[f], w) for f, w in mapping.field_warnings.items() if f in metrics]
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for i, row in enumerate(chunk.rows):
+        errors = chunk.errors[i]
+        if errors and any(e.startswith(("MISSING_IDENTITY:", "UNKNOWN_WINDOW:")) for e in errors):
+            yield i, None
+            continue
+        attempt = ident["attempt"][i]
+        yield i, store.MetricsSnapshot(
+            run_id=run_id,
+            captured_at_utc=str(ident["captured_at_utc"][i]),
+            platform=str(ident["platform"][i]),
+            account_id=ident["account_id"][i] or "UNKNOWN",
+            canonical_post_id=str(ident["canonical_post_id"][i]),
+            window=str(ident["window"][i]),
+            adapter_version=adapter_version,
+            source_mode=source_mode,
+            raw=encode(dict(zip(header, row))),
+            attempt=int(attempt) if attempt and attempt.isdigit() else 1,
+            post_url=ident["post_url"][i],
+            publish_time_utc=ident["publish_time_utc"][i],
+            views=metrics["views"][i],
+            avg_view_duration_sec=metrics["avg_view_duration_sec"][i],
+            completion_pct=metrics["completion_pct"][i],
+            loop_pct=metrics["loop_pct"][i],
+            shares=metrics["shares"][i],
+            saves=metrics["saves"][i],
+            comments=metrics["comments"][i],
+            missing_fields=tuple(chunk.missing[i]),
+            warnings=tuple(w for col, w in warned if col[i] is not None),
+            errors=tuple(errors),
+        )
+
+
+def _read_chunks(reader: Iterator[List[str]], size: int, width: int) -> Iterator[List[List[str]]]:
+    """Rows in lists of ``size``; short rows are padded to the header ``width``."""
+
+    chunk: List[List[str]] = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ingest_file(
+    conn: Any,
+    path: Path,
+    mapping: ExportMapping,
+    *,
+    run_id: str,
+    source_mode: str = "export",
+    engine: str = "stdlib",
+    rejected_dir: Optional[Path] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> FileReport:
+    """Stream one export into the store; returns its throughput report."""
+
+    if source_mode not in store.SOURCE_MODES:
+        raise ValueError(f"unknown source_mode {source_mode!r}")
+    report = FileReport(path=str(path), bytes=path.stat().st_size)
+    rejected_path = (rejected_dir or path.parent) / (path.stem + REJECTED_SUFFIX)
+    adapter_version = f"{source_mode}-mapping@{mapping.version}"
+    started = time.perf_counter()
+    rejected_out = None
+    try:
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError(f"{path}: empty export")
+            idx = mapping.field_indexes(header)
+            for rows in _read_chunks(reader, chunk_rows, len(header)):
+                chunk = _parse_chunk(rows, idx, mapping)
+                for code, hits in _check_masks(chunk, engine):
+                    for i in hits:
+                        chunk.errors[i].append(code)
+
+                batch: List[store.MetricsSnapshot] = []
+                rejected: List[List[str]] = []
+                for i, snapshot in _snapshots(
+                    chunk, header, mapping, run_id=run_id, source_mode=source_mode, adapter_version=adapter_version
+                ):
+                    if snapshot is not None:
+                        batch.append(snapshot)
+                    if chunk.errors[i]:
+                        rejected.append(chunk.rows[i] + [";".join(chunk.errors[i])])
+                result = store.ingest_snapshots(conn, batch)
+                report.rows += len(rows)
+                report.rejected += len(rejected)
+                report.accepted += len(rows) - len(rejected)
+                report.stored += result.inserted
+                report.duplicates += result.duplicates
+                if rejected:
+                    if rejected_out is None:
+                        rejected_path.parent.mkdir(parents=True, exist_ok=True)
+                        rejected_out = rejected_path.open("w", encoding="utf-8", newline="")
+                        writer = csv.writer(rejected_out)
+                        writer.writerow(list(header) + ["errors"])
+                    writer.writerows(rejected)
+    finally:
+        if rejected_out is not None:
+            rejected_out.close()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Ingest platform analytics exports into the metrics snapshot store")
+    ap.add_argument("exports", nargs="+", help="Export CSV files")
+    ap.add_argument("--db", required=True, help="Metrics snapshot store (metrics_snapshot_store.py)")
+    ap.add_argument("--run-id", required=True, help="Snapshot run_id (e.g. RUN-2026-01-23-x)")
+    ap.add_argument("--mapping", default=None, help="ExportMapping JSON (default: columns named like the fields)")
+    ap.add_argument("--source-mode", choices=("export", "manual"), default="export")
+    ap.add_argument("--platform", default=None, help="Platform for exports without a platform column")
+    ap.add_argument("--window", choices=store.WINDOWS, default=None, help="Window for exports without one")
+    ap.add_argument("--captured-at", default=None, help="captured_at_utc for exports without one (export time)")
+    ap.add_argument("--rejected-dir", default=None, help=f"Where <export>{REJECTED_SUFFIX} goes (default: beside it)")
+    ap.add_argument(
+        "--engine",
+        choices=CHECK_ENGINES,
+        default="auto",
+        help="Validation engine: numpy (vectorized), stdlib, or auto (numpy when installed)",
+    )
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows parsed, checked and stored per batch")
+    ap.add_argument("--report", default=None, help="Write per-file throughput reports (JSON) here")
+    args = ap.parse_args(argv)
+    engine = _resolve_check_engine(args.engine)
+
+    try:
+        mapping = ExportMapping.load(Path(args.mapping)) if args.mapping else ExportMapping()
+        conn = store.connect(Path(args.db))
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    mapping = mapping.with_defaults(platform=args.platform, window=args.window, captured_at_utc=args.captured_at)
+    reports: List[FileReport] = []
+    try:
+        for export in args.exports:
+            path = Path(export)
+            if not path.exists():
+                raise SystemExit(f"export not found: {path}")
+            try:
+                r = ingest_file(
+                    conn,
+                    path,
+                    mapping,
+                    run_id=args.run_id,
+                    source_mode=args.source_mode,
+                    engine=engine,
+                    rejected_dir=Path(args.rejected_dir) if args.rejected_dir else None,
+                    chunk_rows=args.chunk_rows,
+                )
+            except ValueError as exc:
+                raise SystemExit(str(exc)) from exc
+            reports.append(r)
+            j = r.to_json()
+            print(
+                f"{path.name}: {r.rows} rows ({r.accepted} accepted, {r.rejected} rejected, "
+                f"{r.duplicates} duplicates) in {j['seconds']}s, {j['rows_per_sec']} rows/s, {j['mb_per_sec']} MB/s"
+            )
+    finally:
+        conn.close()
+    if args.report:
+        Path(args.report).write_text(json.dumps([r.to_json() for r in reports], indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
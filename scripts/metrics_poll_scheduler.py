@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Asyncio polling scheduler for W1H/W24H metric windows (automation/metrics_pull.md §4).
+
+Stdlib-only. Every pending (post, window) pull sits in one heap ordered by due time;
+a single loop pops due pulls, checks the platform's token bucket and starts at most
+``concurrency`` adapter calls at once. Results come back to the same loop, which stores
+each attempt in the snapshot store (scripts/metrics_snapshot_store.py) and schedules the
+§4.3 re-poll when the pull failed:
+
+- attempt 1 at the window (publish + 1h / + 24h)
+- attempt 2 at +10 minutes (W1H) / +30 minutes (W24H)
+- attempt 3 at the end of grace (+30 minutes / +2 hours)
+
+Nothing is polled past grace (§11.3); a window without a valid snapshot by then is
+reported as missed. Adapters implement the §2.1 interface as coroutines:
+
+- ``resolve_post(post_ref) -> canonical_post_id``
+- ``fetch_metrics(canonical_post_id, window) -> (raw, parsed)``
+
+FileAdapter replays canned responses from a JSON file, so the scheduler runs offline.
+
+Usage:
+  python scripts/metrics_poll_scheduler.py --db metrics.sqlite --posts pending.csv \\
+      --adapter-file tiktok_fake.json --run-id RUN-2026-01-23-a --rate-limit tiktok=5 --simulate
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import heapq
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Set, Tuple
+
+import metrics_snapshot_store as store
+from metrics_snapshot_store import GRACE_SEC, WINDOW_OFFSET_SEC
+
+# §4.3 attempt-2 delay after the window, in seconds.
+RETRY_DELAY_SEC = {"W1H": 10 * 60.0, "W24H": 30 * 60.0}
+MAX_ATTEMPTS = 3
+
+DEFAULT_CONCURRENCY = 32
+# Snapshots buffered before a store transaction; on the wall clock the buffer is also
+# written whenever the loop is about to idle for IDLE_FLUSH_SEC or more.
+STORE_BATCH = 500
+IDLE_FLUSH_SEC = 1.0
+
+Parsed = Dict[str, Any]
+
+
+class AdapterError(Exception):
+    """A pull that produced no usable payload (HTTP error, unknown post, ...)."""
+
+
+class MetricsAdapter(Protocol):
+    platform: str
+    adapter_version: str
+    source_mode: str
+
+    async def resolve_post(self, post_ref: str) -> str: ...
+
+    async def fetch_metrics(self, canonical_post_id: str, window: str) -> Tuple[Any, Parsed]: ...
+
+
+class FileAdapter:
+    """Replays canned responses from a JSON file (offline fake of a platform adapter).
+
+    Layout::
+
+        {"platform": "tiktok", "adapter_version": "fake@1", "source_mode": "api",
+         "latency_sec": 0.0,
+         "posts": {"<post_ref>": {"canonical_post_id": "TT-1",
+                                  "responses": {"W1H": [{"raw": {...}, "parsed": {...}},
+                                                        {"error": "HTTP 503"}]}}}}
+
+    The n-th fetch of a (post, window) returns ``responses[window][n]``, repeating the
+    last entry once the list runs out; ``{"error": ...}`` raises AdapterError.
+    """
+
+    def __init__(self, path: Path) -> None:
+        spec = json.loads(path.read_text(encoding="utf-8"))
+        self.platform = str(spec["platform"])
+        self.adapter_version = str(spec.get("adapter_version") or f"file:{path.name}")
+        self.source_mode = str(spec.get("source_mode") or "api")
+        self.latency_sec = float(spec.get("latency_sec") or 0.0)
+        self._refs = {str(ref): str(p["canonical_post_id"]) for ref, p in spec["posts"].items()}
+        self._responses = {str(p["canonical_post_id"]): p.get("responses") or {} for p in spec["posts"].values()}
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def resolve_post(self, post_ref: str) -> str:
+        if post_ref in self._refs:
+            return self._refs[post_ref]
+        if post_ref in self._responses:
+            return post_ref
+        raise AdapterError(f"unknown post {post_ref!r}")
+
+    async def fetch_metrics(self, canonical_post_id: str, window: str) -> Tuple[Any, Parsed]:
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            if self.latency_sec:
+                await asyncio.sleep(self.latency_sec)
+            responses = self._responses.get(canonical_post_id, {}).get(window) or []
+            if not responses:
+                raise AdapterError(f"no {window} data for {canonical_post_id}")
+            n = self._calls.get((canonical_post_id, window), 0)
+            self._calls[(canonical_post_id, window)] = n + 1
+            response = responses[min(n, len(responses) - 1)]
+            if "error" in response:
+                raise AdapterError(str(response["error"]))
+            return response.get("raw", {}), dict(response.get("parsed") or {})
+        finally:
+            self.inflight -= 1
+
+
+class TokenBucket:
+    """Per-platform rate limit: ``rate`` pulls per second, bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate limit must be positive")
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._last: Optional[float] = None
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return ``now``, or return the time the next token is available."""
+
+        if self._last is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens >= 1.0 - 1e-9:
+            self._tokens -= 1.0
+            return now
+        return now + (1.0 - self._tokens) / self.rate
+
+
+class RealClock:
+    realtime = True
+
+    def now(self) -> float:
+        return time.time()
+
+    async def wait(self, deadline: Optional[float], inflight: Set["asyncio.Task[Any]"]) -> None:
+        timeout = None if deadline is None else max(0.0, deadline - self.now())
+        if inflight:
+            await asyncio.wait(inflight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        elif timeout is not None:
+            await asyncio.sleep(timeout)
+
+
+class VirtualClock:
+    """Simulated time: waits finish in-flight pulls first, then jump straight to the next due time."""
+
+    realtime = False
+
+    def __init__(self, start: float) -> None:
+        self._now = start
+
+    def now(self) -> float:
+        return self._now
+
+    async def wait(self, deadline: Optional[float], inflight: Set["asyncio.Task[Any]"]) -> None:
+        if inflight:
+            await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+        elif deadline is not None:
+            self._now = max(self._now, deadline)
+
+
+@dataclass
+class PendingPost:
+    platform: str
+    post_ref: str
+    publish_time: float
+    account_id: str
+    post_url: Optional[str] = None
+    canonical_post_id: Optional[str] = None
+
+
+@dataclass
+class _Pull:
+    post: PendingPost
+    window: str
+    attempt: int = 1
+
+    @property
+    def target(self) -> float:
+        return self.post.publish_time + WINDOW_OFFSET_SEC[self.window]
+
+    @property
+    def deadline(self) -> float:
+        return self.target + GRACE_SEC[self.window]
+
+    def attempt_time(self, attempt: int) -> float:
+        if attempt == 1:
+            return self.target
+        if attempt == 2:
+            return self.target + RETRY_DELAY_SEC[self.window]
+        return self.deadline
+
+
+@dataclass
+class PollReport:
+    attempts: int = 0
+    retries: int = 0
+    stored: int = 0
+    duplicates: int = 0
+    accepted: int = 0
+    # (post_ref, window) with no valid snapshot by the end of grace.
+    missed: List[Tuple[str, str]] = field(default_factory=list)
+    # post_refs the adapter could not resolve to a canonical_post_id (§7.3).
+    unresolved: List[str] = field(default_factory=list)
+    max_inflight: int = 0
+    elapsed_sec: float = 0.0
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "accepted": self.accepted,
+            "missed": [{"post_ref": p, "window": w} for p, w in sorted(self.missed)],
+            "unresolved": sorted(self.unresolved),
+            "max_inflight": self.max_inflight,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+        }
+
+
+class PollScheduler:
+    """Drives every (post, window) pull of one run through its adapter and into the store."""
+
+    def __init__(
+        self,
+        conn: Any,
+        adapters: Dict[str, MetricsAdapter],
+        *,
+        run_id: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_limits: Optional[Dict[str, TokenBucket]] = None,
+        clock: Any = None,
+        windows: Sequence[str] = store.WINDOWS,
+        store_batch: int = STORE_BATCH,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.conn = conn
+        self.adapters = adapters
+        self.run_id = run_id
+        self.concurrency = concurrency
+        self.rate_limits = rate_limits or {}
+        self.clock = clock or RealClock()
+        self.windows = tuple(windows)
+        self.store_batch = store_batch
+        self._heap: List[Tuple[float, int, _Pull]] = []
+        self._seq = itertools.count()
+        self._buffer: List[store.MetricsSnapshot] = []
+        self.report = PollReport()
+
+    def _push(self, due: float, pull: _Pull) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), pull))
+
+    def add_posts(self, posts: Sequence[PendingPost]) -> None:
+        for post in posts:
+            if post.platform not in self.adapters:
+                raise ValueError(f"no adapter for platform {post.platform!r} ({post.post_ref})")
+            for window in self.windows:
+                pull = _Pull(post, window)
+                self._push(pull.target, pull)
+
+    async def _pull(self, pull: _Pull) -> Tuple[_Pull, Optional[store.MetricsSnapshot]]:
+        post = pull.post
+        adapter = self.adapters[post.platform]
+        if post.canonical_post_id is None:
+            try:
+                post.canonical_post_id = await adapter.resolve_post(post.post_ref)
+            except Exception:
+                return pull, None
+        try:
+            raw, parsed = await adapter.fetch_metrics(post.canonical_post_id, pull.window)
+            errors = list(parsed.get("errors") or ()) + store.validation_errors(parsed)
+        except AdapterError as exc:
+            raw, parsed, errors = "", {}, [f"FETCH_FAILED: {exc}"]
+        except Exception as exc:
+            # An adapter bug fails this pull only (§6 error, re-polled like any failure),
+            # never the run and the snapshots already buffered.
+            raw, parsed, errors = "", {}, [f"ADAPTER_EXCEPTION: {type(exc).__name__}: {exc}"]
+        captured = self.clock.now()
+        if captured > pull.deadline:
+            errors.append("OUTSIDE_GRACE")
+        snapshot = store.MetricsSnapshot.from_dict(
+            {
+                "run_id": self.run_id,
+                "captured_at_utc": store.format_utc(captured),
+                "platform": post.platform,
+                "account_id": post.account_id,
+                "canonical_post_id": post.canonical_post_id,
+                "post_url": post.post_url,
+                "publish_time_utc": store.format_utc(post.publish_time),
+                "window": pull.window,
+                "adapter_version": adapter.adapter_version,
+                "source_mode": adapter.source_mode,
+                "attempt": pull.attempt,
+                "raw": raw,
+                "parsed": dict(parsed, errors=errors),
+            }
+        )
+        return pull, snapshot
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        result = store.ingest_snapshots(self.conn, self._buffer)
+        self.report.stored += result.inserted
+        self.report.duplicates += result.duplicates
+        self._buffer = []
+
+    def _finish(self, pull: _Pull, snapshot: Optional[store.MetricsSnapshot], now: float) -> None:
+        if snapshot is not None:
+            self._buffer.append(snapshot)
+            if not snapshot.errors:
+                self.report.accepted += 1
+                return
+        next_attempt = pull.attempt + 1
+        due = max(now, pull.attempt_time(next_attempt))
+        if next_attempt <= MAX_ATTEMPTS and due <= pull.deadline:
+            self.report.retries += 1
+            self._push(due, _Pull(pull.post, pull.window, next_attempt))
+        elif snapshot is None:
+            if pull.post.post_ref not in self.report.unresolved:
+                self.report.unresolved.append(pull.post.post_ref)
+        else:
+            self.report.missed.append((pull.post.post_ref, pull.window))
+
+    async def run(self) -> PollReport:
+        started = time.perf_counter()
+        inflight: Set["asyncio.Task[Tuple[_Pull, Optional[store.MetricsSnapshot]]]"] = set()
+        try:
+            await self._loop(inflight)
+        finally:
+            for task in inflight:
+                task.cancel()
+            # Pulls already finished reach the store even if the loop is interrupted.
+            self._flush()
+            self.report.elapsed_sec = time.perf_counter() - started
+        return self.report
+
+    async def _loop(self, inflight: Set["asyncio.Task[Tuple[_Pull, Optional[store.MetricsSnapshot]]]"]) -> None:
+        while self._heap or inflight:
+            now = self.clock.now()
+            while self._heap and self._heap[0][0] <= now and len(inflight) < self.concurrency:
+                _, _, pull = heapq.heappop(self._heap)
+                if now > pull.deadline:
+                    # Never due before grace ran out (scheduler started late): §11.3, do not poll.
+                    self.report.missed.append((pull.post.post_ref, pull.window))
+                    continue
+                bucket = self.rate_limits.get(pull.post.platform)
+                ready = now if bucket is None else bucket.reserve(now)
+                if ready > now:
+                    self._push(ready, pull)
+                    continue
+                self.report.attempts += 1
+                inflight.add(asyncio.ensure_future(self._pull(pull)))
+            self.report.max_inflight = max(self.report.max_inflight, len(inflight))
+
+            full = len(inflight) >= self.concurrency
+            deadline = None if full or not self._heap else self._heap[0][0]
+            idle = deadline is not None and deadline - now >= IDLE_FLUSH_SEC
+            if len(self._buffer) >= self.store_batch or (idle and self.clock.realtime):
+                self._flush()
+            if not inflight and deadline is None:
+                break
+            await self.clock.wait(deadline, inflight)
+            for task in [t for t in inflight if t.done()]:
+                inflight.discard(task)
+                self._finish(*task.result(), self.clock.now())
+
+
+def read_pending_posts(path: Path) -> List[PendingPost]:
+    """Pending posts CSV: platform, post_ref, publish_time_utc, account_id[, post_url, canonical_post_id]."""
+
+    posts: List[PendingPost] = []
+    with path.open(encoding="utf-8", newline="") as f:
+        for line_no, r in enumerate(csv.DictReader(f), 2):
+            try:
+                posts.append(
+                    PendingPost(
+                        platform=r["platform"].strip(),
+                        post_ref=r["post_ref"].strip(),
+                        publish_time=store.parse_utc(r["publish_time_utc"]),
+                        account_id=(r.get("account_id") or "").strip() or "UNKNOWN",
+                        post_url=(r.get("post_url") or "").strip() or None,
+                        canonical_post_id=(r.get("canonical_post_id") or "").strip() or None,
+                    )
+                )
+            except (KeyError, AttributeError, ValueError) as exc:
+                raise SystemExit(f"{path}:{line_no}: invalid pending post: {exc}") from exc
+    return posts
+
+
+def _parse_rate_limit(spec: str) -> Tuple[str, TokenBucket]:
+    platform, sep, rate = spec.partition("=")
+    try:
+        if not sep or not platform:
+            raise ValueError(spec)
+        return platform.strip(), TokenBucket(float(rate))
+    except ValueError as exc:
+        raise SystemExit(f"--rate-limit expects PLATFORM=PULLS_PER_SEC (got {spec!r})") from exc
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Poll W1H/W24H metric windows into the snapshot store")
+    ap.add_argument("--db", required=True, help="Metrics snapshot store (metrics_snapshot_store.py)")
+    ap.add_argument("--posts", required=True, help="Pending posts CSV (platform, post_ref, publish_time_utc, ...)")
+    ap.add_argument(
+        "--adapter-file", action="append", required=True, help="FileAdapter JSON; one per platform (repeatable)"
+    )
+    ap.add_argument("--run-id", required=True, help="Snapshot run_id (e.g. RUN-2026-01-23-a)")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Pulls in flight at once")
+    ap.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        help="Per-platform limit PLATFORM=PULLS_PER_SEC (repeatable; default unlimited)",
+    )
+    ap.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Run on simulated time from the earliest due pull instead of waiting for the wall clock",
+    )
+    ap.add_argument("--report", default=None, help="Write the poll report JSON here")
+    args = ap.parse_args(argv)
+
+    adapters: Dict[str, MetricsAdapter] = {}
+    for path in args.adapter_file:
+        adapter = FileAdapter(Path(path))
+        adapters[adapter.platform] = adapter
+    posts = read_pending_posts(Path(args.posts))
+    clock: Any = RealClock()
+    if args.simulate and posts:
+        clock = VirtualClock(min(p.publish_time for p in posts) + min(WINDOW_OFFSET_SEC.values()))
+
+    try:
+        conn = store.connect(Path(args.db))
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    try:
+        scheduler = PollScheduler(
+            conn,
+            adapters,
+            run_id=args.run_id,
+            concurrency=args.concurrency,
+            rate_limits=dict(_parse_rate_limit(s) for s in args.rate_limit),
+            clock=clock,
+        )
+        try:
+            scheduler.add_posts(posts)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        report = asyncio.run(scheduler.run())
+    finally:
+        conn.close()
+
+    print(
+        f"Polled {len(posts)} posts: {report.attempts} attempts, {report.accepted} accepted, "
+        f"{report.retries} retries, {len(report.missed)} missed windows, {len(report.unresolved)} unresolved"
+    )
+    if args.report:
+        Path(args.report).write_text(json.dumps(report.to_json(), indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
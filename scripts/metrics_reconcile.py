@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Reconcile snapshots into tracker rows (automation/metrics_pull.md §7, §10, §11).
+
+Stdlib-only. One ordered pass over the snapshot store: tracker posts in the date range are
+read in (date, id) order and joined to their snapshots through the (post, window,
+captured_at, attempt) index, so rows arrive grouped by post and each group is reduced as
+it streams by.
+
+For every (post, window):
+
+- the accepted snapshot is the first error-free pull inside the window's grace, in
+  capture then attempt order (§10.1); pulls past grace are diagnostics only (§11.3);
+- any later valid pull that moves views by more than 2% or a percent field by more than
+  one point is reported as an amendment with a RECONCILIATION_DELTA flag (§11.2); the
+  accepted value is never overwritten.
+
+Tracker rows follow the §10.2 mapping (views@W1H, everything else @W24H) and are written
+as posts_export.csv. A post without an accepted W24H snapshot is marked invalid (§7.3).
+
+Usage:
+  python scripts/metrics_reconcile.py --db metrics.sqlite --from 2026-01-19 --to 2026-01-25 \\
+      --out products/weekly_signal_brief/runs/2026-W04/inputs/posts_export.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import operator
+import os
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import metrics_snapshot_store as store
+from metrics_snapshot_store import GRACE_SEC, POSTS_EXPORT_COLUMNS, WINDOW_OFFSET_SEC
+
+RECONCILIATION_REPORT_FILENAME = "reconciliation_report.json"
+
+# §11.2 amendment thresholds.
+VIEWS_AMEND_FRACTION = 0.02
+PERCENT_AMEND_POINTS = 1.0
+
+MISSING_METRICS_NOTE = "INVALID_REASON: missing_metrics"
+
+_POST_COLUMNS = ("canonical_post_id",) + store.POST_FIELDS
+_SNAPSHOT_COLUMNS = (
+    "snapshot_id",
+    "run_id",
+    "window",
+    "captured_at_utc",
+    "attempt",
+    "publish_time_utc",
+    "errors",
+) + store.METRIC_FIELDS
+
+# posts_date yields posts in (date, id) order, so the stream can be grouped by post as it is
+# read; each post's few snapshots come from snapshots_post_window and are ordered in _groups.
+_JOIN = f"""
+SELECT {", ".join(f"p.{c}" for c in _POST_COLUMNS)}, {", ".join(f"s.{c}" for c in _SNAPSHOT_COLUMNS)}
+FROM posts AS p
+LEFT JOIN snapshots AS s ON s.canonical_post_id = p.canonical_post_id
+WHERE p.date >= ? AND p.date <= ?
+ORDER BY p.date, p.canonical_post_id
+"""
+
+# Orphans have no tracker date, so they are scoped by the UTC publish date on the snapshot
+# (capture date when the pull carried none).
+_ORPHANS = """
+SELECT COUNT(DISTINCT s.canonical_post_id) FROM snapshots AS s
+WHERE substr(COALESCE(s.publish_time_utc, s.captured_at_utc), 1, 10) BETWEEN ? AND ?
+AND NOT EXISTS (SELECT 1 FROM posts AS p WHERE p.canonical_post_id = s.canonical_post_id)
+"""
+
+_N_POST = len(_POST_COLUMNS)
+_S = {c: _N_POST + i for i, c in enumerate(_SNAPSHOT_COLUMNS)}
+# Capture time, then attempt, then insertion order.
+_PULL_ORDER = operator.itemgetter(_S["captured_at_utc"], _S["attempt"], _S["snapshot_id"])
+
+
+@dataclass
+class WindowCounts:
+    snapshots: int = 0
+    accepted: int = 0
+    # Snapshots carrying §6 errors.
+    rejected: int = 0
+    # Valid snapshots captured past grace (kept for diagnostics only).
+    late: int = 0
+    # Posts with no accepted snapshot for the window.
+    missing: int = 0
+
+
+@dataclass
+class ReconciliationReport:
+    date_from: str
+    date_to: str
+    posts: int = 0
+    windows: Dict[str, WindowCounts] = field(default_factory=lambda: {w: WindowCounts() for w in store.WINDOWS})
+    amendments: List[Dict[str, Any]] = field(default_factory=list)
+    # canonical_post_ids marked invalid for a missing W24H snapshot.
+    invalidated: List[str] = field(default_factory=list)
+    # Posts published in the date range that have snapshots but no tracker row (cannot be
+    # reconciled, §7.3).
+    orphan_posts: int = 0
+
+    @property
+    def flags(self) -> List[str]:
+        return ["RECONCILIATION_DELTA"] if self.amendments else []
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "date_range": f"{self.date_from}..{self.date_to}",
+            "posts": self.posts,
+            "windows": {w: vars(c) for w, c in self.windows.items()},
+            "flags": self.flags,
+            "amendments": self.amendments,
+            "invalidated": self.invalidated,
+            "orphan_posts": self.orphan_posts,
+        }
+
+
+def _in_grace(row: Sequence[Any], window: str) -> bool:
+    published = row[_S["publish_time_utc"]]
+    if not published:
+        # No publish time on the snapshot: rely on the grace check done at capture (§6 errors).
+        return True
+    try:
+        lag = store.parse_utc(row[_S["captured_at_utc"]]) - store.parse_utc(published) - WINDOW_OFFSET_SEC[window]
+    except ValueError:
+        return False
+    return 0.0 <= lag <= GRACE_SEC[window]
+
+
+def _deltas(accepted: Sequence[Any], later: Sequence[Any]) -> List[Tuple[str, Any, Any]]:
+    out: List[Tuple[str, Any, Any]] = []
+    for f in store.METRIC_FIELDS:
+        before, after = accepted[_S[f]], later[_S[f]]
+        if before is None or after is None or before == after:
+            continue
+        if f == "views":
+            moved = abs(after - before) > VIEWS_AMEND_FRACTION * max(abs(before), 1.0)
+        elif f in ("completion_pct", "loop_pct"):
+            moved = abs(after - before) > PERCENT_AMEND_POINTS
+        else:
+            moved = False
+        if moved:
+            out.append((f, before, after))
+    return out
+
+
+def _select(
+    post_id: str, window: str, rows: List[Sequence[Any]], report: ReconciliationReport
+) -> Optional[Sequence[Any]]:
+    """The accepted snapshot of one (post, window) group, recording counts and amendments."""
+
+    counts = report.windows[window]
+    accepted: Optional[Sequence[Any]] = None
+    for row in rows:
+        counts.snapshots += 1
+        if row[_S["errors"]] != "[]":
+            counts.rejected += 1
+            continue
+        if not _in_grace(row, window):
+            counts.late += 1
+            if accepted is None:
+                continue
+        if accepted is None:
+            accepted = row
+            counts.accepted += 1
+            continue
+        for f, before, after in _deltas(accepted, row):
+            report.amendments.append(
+                {
+                    "canonical_post_id": post_id,
+                    "window": window,
+                    "field": f,
+                    "before": before,
+                    "after": after,
+                    "accepted_run_id": accepted[_S["run_id"]],
+                    "amending_run_id": row[_S["run_id"]],
+                    "captured_at_utc": row[_S["captured_at_utc"]],
+                }
+            )
+    if accepted is None:
+        counts.missing += 1
+    return accepted
+
+
+def _csv_value(v: Any, column: str) -> str:
+    if v is None:
+        return ""
+    if column == "is_control":
+        return "true" if v else "false"
+    if isinstance(v, float):
+        return str(int(v)) if v.is_integer() else format(v, ".10g")
+    return str(v)
+
+
+def _tracker_row(post: Sequence[Any], w1h: Optional[Sequence[Any]], w24h: Optional[Sequence[Any]]) -> List[str]:
+    values = dict(zip(_POST_COLUMNS, post))
+
+    def metric(snapshot: Optional[Sequence[Any]], f: str, scale: float = 1.0) -> Optional[float]:
+        v = None if snapshot is None else snapshot[_S[f]]
+        return None if v is None else v / scale
+
+    values["views_1h"] = metric(w1h, "views")
+    values["views_24h"] = metric(w24h, "views")
+    for f in ("avg_view_duration_sec", "shares", "saves", "comments"):
+        values[f] = metric(w24h, f)
+    # §5.2 percents (0-100) back to the fractions posts_export.csv uses.
+    values["completion_pct"] = metric(w24h, "completion_pct", 100.0)
+    values["loop_pct"] = metric(w24h, "loop_pct", 100.0)
+    if w24h is None:
+        values["decision"] = "invalid"
+        notes = values.get("notes") or ""
+        if MISSING_METRICS_NOTE not in notes:
+            values["notes"] = f"{notes}; {MISSING_METRICS_NOTE}" if notes else MISSING_METRICS_NOTE
+    return [_csv_value(values.get(c), c) for c in POSTS_EXPORT_COLUMNS]
+
+
+def _groups(cursor: sqlite3.Cursor) -> Iterator[Tuple[Sequence[Any], Dict[str, List[Sequence[Any]]]]]:
+    """(post columns, window -> snapshot rows) per post, straight off the ordered join."""
+
+    def rows() -> Iterator[Sequence[Any]]:
+        while True:
+            chunk = cursor.fetchmany(store.INGEST_BATCH_ROWS)
+            if not chunk:
+                return
+            yield from chunk
+
+    for _, post_rows in itertools.groupby(rows(), key=lambda r: r[0]):
+        first = next(post_rows)
+        by_window: Dict[str, List[Sequence[Any]]] = {}
+        for r in itertools.chain([first], post_rows):
+            if r[_S["snapshot_id"]] is not None:
+                by_window.setdefault(r[_S["window"]], []).append(r)
+        for snapshots in by_window.values():
+            snapshots.sort(key=_PULL_ORDER)
+        yield first[:_N_POST], by_window
+
+
+def reconcile(conn: sqlite3.Connection, out_path: Path, *, date_from: str, date_to: str) -> ReconciliationReport:
+    """Write posts_export.csv for posts dated ``date_from``..``date_to`` and return the report."""
+
+    report = ReconciliationReport(date_from=date_from, date_to=date_to)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(POSTS_EXPORT_COLUMNS)
+        for post, by_window in _groups(conn.execute(_JOIN, (date_from, date_to))):
+            report.posts += 1
+            post_id = post[0]
+            selected = {win: _select(post_id, win, by_window.get(win, []), report) for win in store.WINDOWS}
+            if selected["W24H"] is None:
+                report.invalidated.append(post_id)
+            w.writerow(_tracker_row(post, selected["W1H"], selected["W24H"]))
+    os.replace(tmp, out_path)
+    report.orphan_posts = conn.execute(_ORPHANS, (date_from, date_to)).fetchone()[0]
+    return report
+
+
+def write_report(path: Path, report: ReconciliationReport) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report.to_json(), indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Reconcile metrics snapshots into posts_export.csv tracker rows")
+    ap.add_argument("--db", required=True, help="Metrics snapshot store (metrics_snapshot_store.py)")
+    ap.add_argument("--from", dest="date_from", required=True, help="First post date (YYYY-MM-DD)")
+    ap.add_argument("--to", dest="date_to", required=True, help="Last post date (YYYY-MM-DD)")
+    ap.add_argument("--out", required=True, help="posts_export.csv to write")
+    ap.add_argument(
+        "--report", default=None, help=f"Report JSON (default: {RECONCILIATION_REPORT_FILENAME} beside --out)"
+    )
+    args = ap.parse_args(argv)
+
+    out = Path(args.out)
+    try:
+        conn = store.connect(Path(args.db))
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    try:
+        report = reconcile(conn, out, date_from=args.date_from, date_to=args.date_to)
+    finally:
+        conn.close()
+    write_report(Path(args.report) if args.report else out.with_name(RECONCILIATION_REPORT_FILENAME), report)
+    print(
+        f"Reconciled {report.posts} posts into {out}: {len(report.amendments)} amendments, "
+        f"{len(report.invalidated)} invalidated (no W24H), {report.orphan_posts} orphan posts"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""Local store for immutable metrics snapshots (automation/metrics_pull.md §3).
+
+Stdlib-only (sqlite3, WAL journal). Two tables:
+
+- ``snapshots``: one row per pull, keyed by (run_id, canonical_post_id, window,
+  adapter_version, source_mode, attempt). Rows are never updated or deleted; triggers
+  reject both. Parsed metrics follow §5.2 units (percent fields on the 0-100 scale).
+- ``posts``: the tracker registry (one row per canonical_post_id) with the non-metric
+  posts_export.csv columns: date, platform, vertical, hook, block, decision, notes, ...
+
+scripts/metrics_reconcile.py turns snapshots into posts_export.csv tracker rows.
+
+Usage:
+  python scripts/metrics_snapshot_store.py --db metrics.sqlite import-posts tracker.csv
+  python scripts/metrics_snapshot_store.py --db metrics.sqlite import-snapshots pulls.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime as dt
+import json
+import operator
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SOURCE_MODES = ("api", "partner", "export", "manual")
+WINDOWS = ("W1H", "W24H")
+# §4.1 window offsets from publish and §4.2 grace after the window, in seconds.
+WINDOW_OFFSET_SEC = {"W1H": 3600.0, "W24H": 24 * 3600.0}
+GRACE_SEC = {"W1H": 30 * 60.0, "W24H": 2 * 3600.0}
+METRIC_FIELDS = ("views", "avg_view_duration_sec", "completion_pct", "loop_pct", "shares", "saves", "comments")
+
+# Column order of posts_export.csv (build_weekly_signal_brief.py validates this header).
+POSTS_EXPORT_COLUMNS = [
+    "date",
+    "platform",
+    "vertical",
+    "hook_type",
+    "hook_text",
+    "duration_sec",
+    "visual_style",
+    "voice_style",
+    "block_id",
+    "experiment_id",
+    "variant_id",
+    "is_control",
+    "views_1h",
+    "views_24h",
+    "avg_view_duration_sec",
+    "completion_pct",
+    "loop_pct",
+    "shares",
+    "saves",
+    "comments",
+    "decision",
+    "notes",
+]
+# posts_export.csv columns that come from the tracker registry rather than snapshots.
+POST_FIELDS = (
+    "date",
+    "platform",
+    "vertical",
+    "hook_type",
+    "hook_text",
+    "duration_sec",
+    "visual_style",
+    "voice_style",
+    "block_id",
+    "experiment_id",
+    "variant_id",
+    "is_control",
+    "decision",
+    "notes",
+)
+
+INGEST_BATCH_ROWS = 5000
+# PRAGMA user_version of the layout below. A store at a version listed in _MIGRATIONS is
+# upgraded in place on connect(); anything older is refused and re-ingested into a new file.
+STORE_SCHEMA_VERSION = 3
+
+# from-version -> script that brings the store to from-version + 1 (before _SCHEMA is applied).
+_MIGRATIONS = {
+    # v3 replaces the partial valid-only index with snapshots_post_window (metrics_reconcile.py).
+    2: "DROP INDEX IF EXISTS snapshots_valid_post_window;",
+}
+
+# §6 plausibility bound for avg_view_duration_sec (short-form video).
+MAX_AVG_VIEW_DURATION_SEC = 600.0
+
+_CONTROL_VALUES = {"true": 1, "1": 1, "yes": 1, "false": 0, "0": 0, "no": 0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    captured_at_utc TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    canonical_post_id TEXT NOT NULL,
+    post_url TEXT,
+    publish_time_utc TEXT,
+    window TEXT NOT NULL,
+    adapter_version TEXT NOT NULL,
+    source_mode TEXT NOT NULL CHECK (source_mode IN ('api', 'partner', 'export', 'manual')),
+    -- §4.3 re-poll attempt (1-3) within one run.
+    attempt INTEGER NOT NULL DEFAULT 1,
+    views REAL,
+    avg_view_duration_sec REAL,
+    completion_pct REAL,
+    loop_pct REAL,
+    shares REAL,
+    saves REAL,
+    comments REAL,
+    missing_fields TEXT NOT NULL DEFAULT '[]',
+    warnings TEXT NOT NULL DEFAULT '[]',
+    errors TEXT NOT NULL DEFAULT '[]',
+    raw TEXT NOT NULL,
+    UNIQUE (run_id, canonical_post_id, window, adapter_version, source_mode, attempt)
+);
+-- Every pull of a (post, window) in capture then attempt order, for metrics_reconcile.py.
+CREATE INDEX IF NOT EXISTS snapshots_post_window ON snapshots (canonical_post_id, window, captured_at_utc, attempt);
+CREATE INDEX IF NOT EXISTS snapshots_run ON snapshots (run_id);
+CREATE TRIGGER IF NOT EXISTS snapshots_no_update BEFORE UPDATE ON snapshots
+    BEGIN SELECT RAISE(ABORT, 'snapshots are immutable'); END;
+CREATE TRIGGER IF NOT EXISTS snapshots_no_delete BEFORE DELETE ON snapshots
+    BEGIN SELECT RAISE(ABORT, 'snapshots are immutable'); END;
+
+CREATE TABLE IF NOT EXISTS posts (
+    canonical_post_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    vertical TEXT,
+    hook_type TEXT,
+    hook_text TEXT,
+    duration_sec REAL,
+    visual_style TEXT,
+    voice_style TEXT,
+    block_id TEXT,
+    experiment_id TEXT,
+    variant_id TEXT,
+    is_control INTEGER,
+    decision TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS posts_date ON posts (date, canonical_post_id);
+"""
+
+_SNAPSHOT_COLUMNS = (
+    "run_id",
+    "captured_at_utc",
+    "platform",
+    "account_id",
+    "canonical_post_id",
+    "post_url",
+    "publish_time_utc",
+    "window",
+    "adapter_version",
+    "source_mode",
+    "attempt",
+    *METRIC_FIELDS,
+    "missing_fields",
+    "warnings",
+    "errors",
+    "raw",
+)
+
+_FLAG_COLUMNS = ("missing_fields", "warnings", "errors")
+_plain_values = operator.attrgetter(*_SNAPSHOT_COLUMNS[: -len(_FLAG_COLUMNS) - 1])
+_flag_values = operator.attrgetter(*_FLAG_COLUMNS)
+
+_INSERT_SNAPSHOT = (
+    f"INSERT INTO snapshots ({', '.join(_SNAPSHOT_COLUMNS)}) VALUES ({', '.join('?' for _ in _SNAPSHOT_COLUMNS)}) "
+    "ON CONFLICT (run_id, canonical_post_id, window, adapter_version, source_mode, attempt) DO NOTHING"
+)
+
+_UPSERT_POST = (
+    f"INSERT INTO posts (canonical_post_id, {', '.join(POST_FIELDS)}) "
+    f"VALUES ({', '.join('?' for _ in range(len(POST_FIELDS) + 1))}) "
+    "ON CONFLICT (canonical_post_id) DO UPDATE SET " + ", ".join(f"{f} = excluded.{f}" for f in POST_FIELDS)
+)
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """One pull for one (post, window): §3.1 identity, §3.3 parsed fields and quality flags."""
+
+    run_id: str
+    captured_at_utc: str
+    platform: str
+    account_id: str
+    canonical_post_id: str
+    window: str
+    adapter_version: str
+    source_mode: str
+    raw: str
+    attempt: int = 1
+    post_url: Optional[str] = None
+    publish_time_utc: Optional[str] = None
+    views: Optional[float] = None
+    avg_view_duration_sec: Optional[float] = None
+    completion_pct: Optional[float] = None
+    loop_pct: Optional[float] = None
+    shares: Optional[float] = None
+    saves: Optional[float] = None
+    comments: Optional[float] = None
+    missing_fields: Tuple[str, ...] = field(default_factory=tuple)
+    warnings: Tuple[str, ...] = field(default_factory=tuple)
+    errors: Tuple[str, ...] = field(default_factory=tuple)
+
+    def as_row(self) -> Tuple[Any, ...]:
+        flags = tuple("[]" if not v else json.dumps(list(v)) for v in _flag_values(self))
+        return _plain_values(self) + flags + (self.raw,)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "MetricsSnapshot":
+        parsed = d.get("parsed") or {}
+        raw = d.get("raw", "")
+        return cls(
+            run_id=str(d["run_id"]),
+            captured_at_utc=str(d["captured_at_utc"]),
+            platform=str(d["platform"]),
+            account_id=str(d["account_id"]),
+            canonical_post_id=str(d["canonical_post_id"]),
+            window=str(d["window"]),
+            adapter_version=str(d["adapter_version"]),
+            source_mode=str(d["source_mode"]),
+            raw=raw if isinstance(raw, str) else json.dumps(raw, sort_keys=True),
+            attempt=int(d.get("attempt") or 1),
+            post_url=d.get("post_url"),
+            publish_time_utc=d.get("publish_time_utc"),
+            **{f: (None if parsed.get(f) is None else float(parsed[f])) for f in METRIC_FIELDS},
+            missing_fields=tuple(parsed.get("missing_fields") or ()),
+            warnings=tuple(parsed.get("warnings") or ()),
+            errors=tuple(parsed.get("errors") or ()),
+        )
+
+
+def parse_utc(value: str) -> float:
+    """Epoch seconds of an ISO 8601 timestamp (``Z`` suffix accepted; naive means UTC)."""
+
+    t = dt.datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=dt.timezone.utc)
+    return t.timestamp()
+
+
+def format_utc(ts: float) -> str:
+    return dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def validation_errors(parsed: Dict[str, Any]) -> List[str]:
+    """§6 checks on one parsed payload (§5.2 units); an empty list means the values are usable."""
+
+    errors: List[str] = []
+    for f in METRIC_FIELDS:
+        v = parsed.get(f)
+        if v is None:
+            continue
+        if v < 0:
+            errors.append(f"NEGATIVE_METRIC:{f}")
+        elif f in ("completion_pct", "loop_pct") and v > 100:
+            errors.append(f"PERCENT_OUT_OF_RANGE:{f}")
+        elif f == "avg_view_duration_sec" and v > MAX_AVG_VIEW_DURATION_SEC:
+            errors.append(f"DURATION_OUT_OF_RANGE:{f}")
+    return errors
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    inserted: int
+    # Same identity key as a stored snapshot; the stored one is kept (immutability).
+    duplicates: int
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) a store: WAL journal, schema and indexes in place.
+
+    Older stores are migrated through _MIGRATIONS in one transaction. Raises ValueError for a
+    store at a version with no migration path (or newer than STORE_SCHEMA_VERSION).
+    """
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    existing = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshots'").fetchone()
+    if existing and version != STORE_SCHEMA_VERSION:
+        if version > STORE_SCHEMA_VERSION or any(v not in _MIGRATIONS for v in range(version, STORE_SCHEMA_VERSION)):
+            conn.close()
+            raise ValueError(f"{db_path}: snapshot store schema v{version}, expected v{STORE_SCHEMA_VERSION}")
+        conn.executescript(
+            "BEGIN;\n"
+            + "\n".join(_MIGRATIONS[v] for v in range(version, STORE_SCHEMA_VERSION))
+            + f"\nPRAGMA user_version = {STORE_SCHEMA_VERSION};\nCOMMIT;"
+        )
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    conn.execute(f"PRAGMA user_version = {STORE_SCHEMA_VERSION}")
+    return conn
+
+
+def ingest_snapshots(
+    conn: sqlite3.Connection, snapshots: Iterable[MetricsSnapshot], *, batch_rows: int = INGEST_BATCH_ROWS
+) -> IngestResult:
+    """Insert snapshots in one transaction (all or nothing), ``batch_rows`` per executemany."""
+
+    inserted = seen = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for batch in _batches(snapshots, batch_rows):
+            for s in batch:
+                if s.window not in WINDOWS:
+                    raise ValueError(f"unknown window {s.window!r} for {s.canonical_post_id}")
+            before = conn.total_changes
+            conn.executemany(_INSERT_SNAPSHOT, [s.as_row() for s in batch])
+            inserted += conn.total_changes - before
+            seen += len(batch)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return IngestResult(inserted=inserted, duplicates=seen - inserted)
+
+
+def _post_row(r: Dict[str, Any]) -> Tuple[Any, ...]:
+    def text(f: str) -> Optional[str]:
+        v = r.get(f)
+        return None if v is None or str(v).strip() == "" else str(v).strip()
+
+    values: List[Any] = [text("canonical_post_id")]
+    for f in POST_FIELDS:
+        v = text(f)
+        if v is not None and f == "duration_sec":
+            values.append(float(v))
+        elif f == "is_control":
+            values.append(_CONTROL_VALUES.get((v or "").lower()))
+        else:
+            values.append(v)
+    return tuple(values)
+
+
+def upsert_posts(
+    conn: sqlite3.Connection, rows: Iterable[Dict[str, Any]], *, batch_rows: int = INGEST_BATCH_ROWS
+) -> int:
+    """Insert or update tracker registry rows (canonical_post_id + POST_FIELDS) in one transaction."""
+
+    count = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for batch in _batches(rows, batch_rows):
+            values = [_post_row(r) for r in batch]
+            for v in values:
+                if not v[0] or not v[1] or not v[2]:
+                    raise ValueError(f"tracker row needs canonical_post_id, date and platform: {v[:3]}")
+            conn.executemany(_UPSERT_POST, values)
+            count += len(values)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+    return count
+
+
+def _read_jsonl(path: Path) -> Iterator[MetricsSnapshot]:
+    with path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield MetricsSnapshot.from_dict(json.loads(line))
+            except (KeyError, TypeError, ValueError) as exc:
+                raise SystemExit(f"{path}:{line_no}: invalid snapshot: {exc}") from exc
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Immutable metrics snapshot store (automation/metrics_pull.md §3)")
+    ap.add_argument("--db", required=True, help="SQLite store path (created if missing)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_posts = sub.add_parser("import-posts", help="Upsert tracker rows from a CSV with canonical_post_id")
+    p_posts.add_argument("csv", help="CSV with canonical_post_id plus posts_export.csv tracker columns")
+    p_snap = sub.add_parser("import-snapshots", help="Ingest snapshots from JSON Lines (one snapshot per line)")
+    p_snap.add_argument("jsonl")
+    args = ap.parse_args(argv)
+
+    try:
+        conn = connect(Path(args.db))
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    try:
+        if args.command == "import-posts":
+            with Path(args.csv).open(encoding="utf-8", newline="") as f:
+                try:
+                    n = upsert_posts(conn, csv.DictReader(f))
+                except ValueError as exc:
+                    raise SystemExit(str(exc)) from exc
+            print(f"Upserted {n} tracker rows into {args.db}")
+        else:
+            try:
+                result = ingest_snapshots(conn, _read_jsonl(Path(args.jsonl)))
+            except (ValueError, sqlite3.IntegrityError) as exc:
+                raise SystemExit(f"ingest rolled back: {exc}") from exc
+            print(f"Inserted {result.inserted} snapshots ({result.duplicates} duplicates kept as stored)")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import datetime as dt
+import functools
 import hashlib
+import importlib.metadata
 import json
 import os
 import re
 import shutil
+import sqlite3
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 VAR_PATTERN = re.compile(r"{{\s*([a-zA-Z0-9_\-\.]+)\s*}}")
 
@@ -54,6 +63,114 @@ def sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
+HASH_CACHE_PATH_ENV = "HASH_CACHE_PATH"
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# A digest is only remembered once its file is this old: a rewrite within the same mtime
+# tick (and at the same size) would otherwise keep serving the old digest.
+_HASH_CACHE_MIN_AGE_NS = 2_000_000_000
+
+_FileKey = Tuple[str, int, int, int]
+
+
+def _file_key(path: Path) -> _FileKey:
+    st = path.stat()
+    return (str(path.resolve()), st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class HashCache:
+    """sha256 digests keyed by (path, size, mtime_ns, inode), persisted in a SQLite file.
+
+    Any change to a file's size, mtime or inode (including replace-by-rename) is a miss.
+    Store errors degrade to uncached hashing.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS file_hashes (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        inode INTEGER NOT NULL,
+        sha256 TEXT NOT NULL
+    )
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(self._SCHEMA)
+        return conn
+
+    def lookup(self, keys: Sequence[_FileKey]) -> Dict[_FileKey, str]:
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError):
+            return {}
+        found: Dict[_FileKey, str] = {}
+        try:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT size, mtime_ns, inode, sha256 FROM file_hashes WHERE path = ?", (key[0],)
+                ).fetchone()
+                if row is not None and tuple(row[:3]) == key[1:]:
+                    found[key] = row[3]
+        except sqlite3.Error:
+            return {}
+        finally:
+            conn.close()
+        return found
+
+    def store(self, entries: Sequence[Tuple[_FileKey, str]]) -> None:
+        if not entries:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, sha256) VALUES (?, ?, ?, ?, ?)",
+                        [(*key, digest) for key, digest in entries],
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+
+def default_hash_cache() -> Optional[HashCache]:
+    """The builders' cache: $HASH_CACHE_PATH (empty disables it), else build/hash_cache.sqlite."""
+
+    path = os.environ.get(HASH_CACHE_PATH_ENV)
+    if path == "":
+        return None
+    return HashCache(Path(path) if path else Path(__file__).resolve().parents[1] / "build" / "hash_cache.sqlite")
+
+
+def sha256_files(
+    paths: Sequence[Path], *, cache: Optional[HashCache] = None, max_workers: int = DEFAULT_HASH_WORKERS
+) -> List[str]:
+    """sha256 of each path (in order); cache misses are hashed concurrently in a thread pool."""
+
+    keys = [_file_key(p) for p in paths]
+    known = cache.lookup(keys) if cache is not None else {}
+    todo = {key: path for key, path in zip(keys, paths) if key not in known}
+    if len(todo) > 1 and max_workers > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as pool:
+            fresh = dict(zip(todo, pool.map(sha256_file, todo.values())))
+    else:
+        fresh = {key: sha256_file(path) for key, path in todo.items()}
+    if cache is not None and fresh:
+        settled = time.time_ns() - _HASH_CACHE_MIN_AGE_NS
+        # Re-stat so a file rewritten while it was being hashed is not remembered.
+        cache.store([(k, d) for k, d in fresh.items() if k[2] < settled and _file_key(todo[k]) == k])
+    known.update(fresh)
+    return [known[key] for key in keys]
+
+
 def git_head_commit(repo_root: Path) -> Optional[str]:
     try:
         out = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=str(repo_root), stderr=subprocess.DEVNULL)
@@ -80,22 +197,76 @@ def extract_allowlist_vars(allowlist_path: Path) -> Set[str]:
     return allowed
 
 
-def extract_template_vars(template_text: str) -> Set[str]:
-    return set(VAR_PATTERN.findall(template_text))
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A template split once into literal text and ``{{ var }}`` slots.
 
+    ``literals`` has one more entry than ``keys``: rendering interleaves them in a single
+    join. ``placeholders`` keeps each slot's original text so unresolved slots render as-is.
+    """
+
+    sha256: str
+    literals: Tuple[str, ...]
+    keys: Tuple[str, ...]
+    placeholders: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, template_text: str, *, sha256: str = "") -> "CompiledTemplate":
+        literals: List[str] = []
+        keys: List[str] = []
+        placeholders: List[str] = []
+        pos = 0
+        for m in VAR_PATTERN.finditer(template_text):
+            literals.append(template_text[pos : m.start()])
+            keys.append(m.group(1))
+            placeholders.append(m.group(0))
+            pos = m.end()
+        literals.append(template_text[pos:])
+        return cls(sha256=sha256, literals=tuple(literals), keys=tuple(keys), placeholders=tuple(placeholders))
+
+    @property
+    def variables(self) -> Set[str]:
+        return set(self.keys)
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+        parts: List[str] = [self.literals[0]]
+        unresolved: Set[str] = set()
+        for key, placeholder, literal in zip(self.keys, self.placeholders, self.literals[1:]):
+            if key in values:
+                parts.append(str(values[key]))
+            else:
+                unresolved.add(key)
+                parts.append(placeholder)
+            parts.append(literal)
+        return "".join(parts), unresolved
+
+
+# Compiled templates by content sha256, shared by every builder in this process.
+_TEMPLATE_CACHE: Dict[str, CompiledTemplate] = {}
+
+
+def compile_template(template_text: str) -> CompiledTemplate:
+    digest = hashlib.sha256(template_text.encode("utf-8")).hexdigest()
+    compiled = _TEMPLATE_CACHE.get(digest)
+    if compiled is None:
+        compiled = _TEMPLATE_CACHE[digest] = CompiledTemplate.parse(template_text, sha256=digest)
+    return compiled
+
+
+def load_template(path: Path) -> CompiledTemplate:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise BuildError(f"Failed to read template: {path} ({exc})")
+    return compile_template(text)
 
-def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
-    unresolved: Set[str] = set()
 
-    def repl(m: re.Match[str]) -> str:
-        key = m.group(1)
-        if key in values:
-            return str(values[key])
-        unresolved.add(key)
-        return m.group(0)
+def extract_template_vars(template_text: str) -> Set[str]:
+    return compile_template(template_text).variables
+
 
-    rendered = VAR_PATTERN.sub(repl, template_text)
-    return rendered, unresolved
+def render_template(template_text: str, values: Dict[str, str]) -> Tuple[str, Set[str]]:
+    return compile_template(template_text).render(values)
 
 
 def wrap_html_document(*, title: str, body_html: str, css_text: str | None = None) -> str:
@@ -116,6 +287,277 @@ def wrap_html_document(*, title: str, body_html: str, css_text: str | None = Non
     )
 
 
+PDF_CACHE_DIR_ENV = "PDF_CACHE_DIR"
+PDF_CACHE_MAX_BYTES_ENV = "PDF_CACHE_MAX_BYTES"
+DEFAULT_PDF_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_STYLESHEET_LINK = re.compile(r"<link\b[^>]*\brel=[\"']?stylesheet\b[^>]*>", re.IGNORECASE)
+_HREF = re.compile(r"\bhref=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+
+class PdfCache:
+    """Rendered PDFs addressed by sha256(HTML + linked CSS + adapter + version + settings).
+
+    Entries live under ``root`` as ``<key[:2]>/<key>.pdf``. A hit copies the entry to the
+    output path (outputs get rewritten in place by later builds, so they never share an
+    inode with the cache) and bumps its mtime; each store evicts least recently used
+    entries past ``max_bytes``. Cache I/O failures are treated as misses.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: int = DEFAULT_PDF_CACHE_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(html_path: Path, *, adapter: str, version: Optional[str], settings: Any) -> str:
+        h = hashlib.sha256()
+
+        def feed(label: str, data: bytes) -> None:
+            h.update(f"{label}:{len(data)}:".encode("utf-8"))
+            h.update(data)
+
+        html = html_path.read_bytes()
+        feed("html", html)
+        for link in _STYLESHEET_LINK.findall(html.decode("utf-8", errors="replace")):
+            m = _HREF.search(link)
+            if not m:
+                continue
+            href = m.group(1)
+            css_path = html_path.parent / href.split("?", 1)[0].split("#", 1)[0]
+            local = "://" not in href and not href.startswith("data:") and css_path.is_file()
+            feed("css", href.encode("utf-8") + b"\0" + (css_path.read_bytes() if local else b""))
+        feed("adapter", adapter.encode("utf-8"))
+        feed("version", (version or "").encode("utf-8"))
+        feed("settings", json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pdf"
+
+    def fetch(self, key: str, pdf_path: Path) -> bool:
+        entry = self._entry(key)
+        try:
+            shutil.copyfile(entry, pdf_path)
+            os.utime(entry)
+        except OSError:
+            return False
+        return True
+
+    def lookup(
+        self, html_path: Path, pdf_path: Path, *, adapter: str, version: Optional[str], settings: Any
+    ) -> Tuple[Optional[str], bool]:
+        """(key, hit) for one document; on a hit ``pdf_path`` already holds the cached PDF."""
+
+        try:
+            key = self.key(html_path, adapter=adapter, version=version, settings=settings)
+        except OSError:
+            return None, False
+        return key, self.fetch(key, pdf_path)
+
+    def store(self, key: str, pdf_path: Path) -> None:
+        entry = self._entry(key)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(pdf_path, tmp)
+            os.replace(tmp, entry)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+
+        entries = []
+        for p in self.root.glob("*/*.pdf"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def default_pdf_cache() -> Optional[PdfCache]:
+    """The builders' cache: $PDF_CACHE_DIR (empty disables it), else build/pdf_cache in the repo."""
+
+    root = os.environ.get(PDF_CACHE_DIR_ENV)
+    if root == "":
+        return None
+    path = Path(root) if root else Path(__file__).resolve().parents[1] / "build" / "pdf_cache"
+    max_bytes = int(os.environ.get(PDF_CACHE_MAX_BYTES_ENV) or DEFAULT_PDF_CACHE_MAX_BYTES)
+    return PdfCache(path, max_bytes=max_bytes)
+
+
+# Concurrent adapter subprocesses per batch (each job is one external process). Builders
+# render one PDF each through run_pdf_adapter(); the pool is for callers with several.
+DEFAULT_PDF_ADAPTER_WORKERS = min(4, os.cpu_count() or 1)
+
+_WKHTMLTOPDF_ARGS = [
+    "--enable-local-file-access",
+    "--load-error-handling",
+    "ignore",
+    "--load-media-error-handling",
+    "ignore",
+]
+
+
+def _find_wkhtmltopdf() -> str | None:
+    exe = shutil.which("wkhtmltopdf")
+    if exe:
+        return exe
+
+    env_path = os.environ.get("WKHTMLTOPDF_PATH") or os.environ.get("WKHTMLTOPDF")
+    if env_path:
+        p = Path(env_path)
+        if p.exists():
+            return str(p)
+
+    candidates = [
+        Path(r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"),
+        Path(r"C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe"),
+        Path(r"C:\Program Files\wkhtmltopdf\wkhtmltopdf.exe"),
+        Path(r"C:\Program Files (x86)\wkhtmltopdf\wkhtmltopdf.exe"),
+    ]
+    for c in candidates:
+        if c.exists():
+            return str(c)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_wkhtmltopdf() -> Tuple[str, Optional[str]]:
+    """(executable, version) of wkhtmltopdf, resolved once per process.
+
+    A parent that already resolved them (release_products.py) passes WKHTMLTOPDF_PATH and
+    WKHTMLTOPDF_VERSION so child builders skip the ``--version`` subprocess.
+    """
+
+    exe = _find_wkhtmltopdf()
+    if not exe:
+        raise BuildError(
+            "wkhtmltopdf not found on PATH. Install it or set WKHTMLTOPDF_PATH to the wkhtmltopdf executable."
+        )
+    version = os.environ.get("WKHTMLTOPDF_VERSION")
+    if version is None:
+        try:
+            v = subprocess.check_output([exe, "--version"], stderr=subprocess.STDOUT)
+            version = v.decode("utf-8", errors="replace").strip()
+        except Exception:  # noqa: BLE001
+            version = None
+    return exe, version or None
+
+
+def _run_adapter_job(meta: Dict[str, Any], argv: Any, *, shell: bool) -> Dict[str, Any]:
+    meta["started_at_utc"] = utc_now_iso()
+    started = time.perf_counter()
+    proc = subprocess.run(argv, shell=shell, capture_output=True, text=True)
+    meta["duration_sec"] = round(time.perf_counter() - started, 3)
+    meta["exit_code"] = proc.returncode
+    meta["stdout_tail"] = (proc.stdout or "")[-4000:]
+    meta["stderr_tail"] = (proc.stderr or "")[-4000:]
+    return meta
+
+
+def run_pdf_adapter_batch(
+    *,
+    adapter: str,
+    jobs: Sequence[Tuple[Path, Path]],
+    pdf_cmd: str | None = None,
+    max_workers: int = DEFAULT_PDF_ADAPTER_WORKERS,
+    cache: Optional[PdfCache] = None,
+) -> List[Dict[str, Any]]:
+    """Produce a PDF for every (html_path, pdf_path) pair, at most ``max_workers`` at a time.
+
+    Returns one adapter meta block per job, in input order, with its timing and exit status.
+    Every job runs to completion before the first failure (in input order) is raised. With a
+    ``cache``, hits are copied out instead of rendered and each block records ``cache_hit``.
+    """
+
+    def base_meta() -> Dict[str, Any]:
+        return {
+            "name": adapter,
+            "version": None,
+            "command_template": None,
+            "command_executed": None,
+            "exit_code": None,
+            "stdout_tail": None,
+            "stderr_tail": None,
+        }
+
+    if adapter == "none":
+        return [base_meta() for _ in jobs]
+
+    commands: List[Tuple[Dict[str, Any], Any, bool]] = []
+    if adapter == "wkhtmltopdf":
+        tool = "wkhtmltopdf"
+        exe, version = resolve_wkhtmltopdf()
+        settings: Any = _WKHTMLTOPDF_ARGS
+        for html_path, pdf_path in jobs:
+            cmd = [exe, *_WKHTMLTOPDF_ARGS, str(html_path), str(pdf_path)]
+            meta = base_meta()
+            meta["version"] = version
+            meta["command_executed"] = " ".join(cmd)
+            commands.append((meta, cmd, False))
+    elif adapter == "command":
+        tool = "pdf adapter command"
+        if not pdf_cmd:
+            raise BuildError("--pdf-cmd is required when --pdf-adapter=command")
+        settings = {"command_template": pdf_cmd}
+        for html_path, pdf_path in jobs:
+            cmd_str = pdf_cmd.format(html=str(html_path), pdf=str(pdf_path))
+            meta = base_meta()
+            meta["command_template"] = pdf_cmd
+            meta["command_executed"] = cmd_str
+            commands.append((meta, cmd_str, True))
+    else:
+        raise BuildError(f"Unknown --pdf-adapter: {adapter}")
+
+    pending = []
+    for (meta, argv, shell), (html_path, pdf_path) in zip(commands, jobs):
+        if cache is not None:
+            key, hit = cache.lookup(html_path, pdf_path, adapter=adapter, version=meta["version"], settings=settings)
+            if key:
+                meta["cache_key"], meta["cache_hit"] = key, hit
+            if hit:
+                meta["command_executed"] = None
+                continue
+        pending.append((meta, argv, shell))
+
+    if len(pending) <= 1 or max_workers <= 1:
+        for meta, argv, shell in pending:
+            _run_adapter_job(meta, argv, shell=shell)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for f in [pool.submit(_run_adapter_job, meta, argv, shell=shell) for meta, argv, shell in pending]:
+                f.result()
+
+    metas = [meta for meta, _, _ in commands]
+    for meta, (_, pdf_path) in zip(metas, jobs):
+        if meta.get("cache_hit"):
+            continue
+        if meta["exit_code"] != 0:
+            detail = (meta["stderr_tail"] or meta["stdout_tail"] or "").strip()
+            raise BuildError(f"{tool} failed (exit {meta['exit_code']}) for {pdf_path.name}: {detail}")
+        if not pdf_path.exists() or pdf_path.stat().st_size == 0:
+            raise BuildError(f"{tool} reported success but PDF was not created: {pdf_path}")
+        if cache is not None and meta.get("cache_key"):
+            cache.store(meta["cache_key"], pdf_path)
+    return metas
+
+
 def run_pdf_adapter(
     *,
     adapter: str,
@@ -123,99 +565,68 @@ def run_pdf_adapter(
     pdf_path: Path,
     pdf_cmd: str | None = None,
 ) -> Dict[str, Any]:
-    """Standard adapter seam: given (html_path, pdf_path) produce a PDF."""
-
-    meta: Dict[str, Any] = {
-        "name": adapter,
-        "version": None,
-        "command_template": None,
-        "command_executed": None,
-        "exit_code": None,
-        "stdout_tail": None,
-        "stderr_tail": None,
-    }
+    """Standard adapter seam: given (html_path, pdf_path) produce a PDF (through the default cache)."""
 
-    if adapter == "none":
-        return meta
+    jobs = [(html_path, pdf_path)]
+    return run_pdf_adapter_batch(adapter=adapter, jobs=jobs, pdf_cmd=pdf_cmd, cache=default_pdf_cache())[0]
 
-    if adapter == "wkhtmltopdf":
 
-        def _find_wkhtmltopdf() -> str | None:
-            exe = shutil.which("wkhtmltopdf")
-            if exe:
-                return exe
-
-            env_path = os.environ.get("WKHTMLTOPDF_PATH") or os.environ.get("WKHTMLTOPDF")
-            if env_path:
-                p = Path(env_path)
-                if p.exists():
-                    return str(p)
-
-            candidates = [
-                Path(r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe"),
-                Path(r"C:\Program Files (x86)\wkhtmltopdf\bin\wkhtmltopdf.exe"),
-                Path(r"C:\Program Files\wkhtmltopdf\wkhtmltopdf.exe"),
-                Path(r"C:\Program Files (x86)\wkhtmltopdf\wkhtmltopdf.exe"),
-            ]
-            for c in candidates:
-                if c.exists():
-                    return str(c)
-            return None
-
-        exe = _find_wkhtmltopdf()
-        if not exe:
-            raise BuildError(
-                "wkhtmltopdf not found on PATH. Install it or set WKHTMLTOPDF_PATH to the wkhtmltopdf executable."
-            )
+# Written next to the outputs by a builder run with --defer-pdf: the (html, pdf) pair it did
+# not render and the manifest waiting for it. release_products.py renders every deferred job
+# in one run_pdf_adapter_batch call and then fills each manifest in with finish_deferred_pdf.
+PDF_JOB_FILENAME = "pdf_job.json"
 
-        cmd = [
-            exe,
-            "--enable-local-file-access",
-            "--load-error-handling",
-            "ignore",
-            "--load-media-error-handling",
-            "ignore",
-            str(html_path),
-            str(pdf_path),
-        ]
-        meta["command_executed"] = " ".join(cmd)
-        try:
-            v = subprocess.check_output([exe, "--version"], stderr=subprocess.STDOUT)
-            meta["version"] = v.decode("utf-8", errors="replace").strip()
-        except Exception:  # noqa: BLE001
-            meta["version"] = None
-
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        meta["exit_code"] = proc.returncode
-        meta["stdout_tail"] = (proc.stdout or "")[-4000:]
-        meta["stderr_tail"] = (proc.stderr or "")[-4000:]
-        if proc.returncode != 0:
-            raise BuildError(
-                f"wkhtmltopdf failed (exit {proc.returncode}): {(proc.stderr or proc.stdout or '').strip()}"
-            )
-        if not pdf_path.exists() or pdf_path.stat().st_size == 0:
-            raise BuildError("wkhtmltopdf reported success but PDF was not created")
-        return meta
 
-    if adapter == "command":
-        if not pdf_cmd:
-            raise BuildError("--pdf-cmd is required when --pdf-adapter=command")
-        meta["command_template"] = pdf_cmd
-        cmd_str = pdf_cmd.format(html=str(html_path), pdf=str(pdf_path))
-        meta["command_executed"] = cmd_str
-        proc = subprocess.run(cmd_str, shell=True, capture_output=True, text=True)
-        meta["exit_code"] = proc.returncode
-        meta["stdout_tail"] = (proc.stdout or "")[-4000:]
-        meta["stderr_tail"] = (proc.stderr or "")[-4000:]
-        if proc.returncode != 0:
-            raise BuildError(
-                f"pdf adapter command failed (exit {proc.returncode}): {(proc.stderr or proc.stdout or '').strip()}"
-            )
-        if not pdf_path.exists() or pdf_path.stat().st_size == 0:
-            raise BuildError("PDF adapter reported success but PDF was not created")
-        return meta
+def deferred_pdf_adapter_meta(adapter: str) -> Dict[str, Any]:
+    """The manifest's pdf_adapter block until the deferred PDF is rendered."""
+
+    return {"name": adapter, "version": None, "exit_code": None, "deferred": True}
+
+
+def write_pdf_job(out_dir: Path, *, html_path: Path, pdf_path: Path, manifest_path: Path) -> Path:
+    path = out_dir / PDF_JOB_FILENAME
+    write_json(path, {"html": str(html_path), "pdf": str(pdf_path), "manifest": str(manifest_path)})
+    return path
+
+
+def read_pdf_job(path: Path) -> Tuple[Path, Path, Path]:
+    """(html_path, pdf_path, manifest_path) from a PDF_JOB_FILENAME file."""
+
+    job = read_json(path)
+    try:
+        return Path(job["html"]), Path(job["pdf"]), Path(job["manifest"])
+    except (KeyError, TypeError) as exc:
+        raise BuildError(f"Invalid PDF job file: {path} ({exc})")
+
 
-    raise BuildError(f"Unknown --pdf-adapter: {adapter}")
+def finish_deferred_pdf(manifest_path: Path, pdf_path: Path, pdf_adapter: Dict[str, Any]) -> Dict[str, Any]:
+    """Record a batch-rendered PDF in the manifest of the build that deferred it.
+
+    ``pdf_adapter`` replaces the deferred block and the PDF is listed last in ``outputs``. The
+    manifest keeps its key order (and sorting, if it was written sorted). Returns the manifest.
+    """
+
+    text = manifest_path.read_text(encoding="utf-8")
+    manifest = json.loads(text)
+    sort_keys = text == json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    (digest,) = sha256_files([pdf_path], cache=default_hash_cache())
+    outputs = [o for o in manifest.get("outputs", []) if o.get("filename") != pdf_path.name]
+    outputs.append(
+        {
+            "type": "pdf",
+            "filename": pdf_path.name,
+            "sha256": digest,
+            "size_bytes": pdf_path.stat().st_size,
+            "content_type": _content_type_for(pdf_path),
+            "storage": None,
+            "url": None,
+            "release_asset_name": None,
+        }
+    )
+    manifest["outputs"] = outputs
+    manifest["pdf_adapter"] = pdf_adapter
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=sort_keys) + "\n", encoding="utf-8")
+    return manifest
 
 
 def join_list(value: Any) -> str:
@@ -276,19 +687,23 @@ def write_manifest(
     input_files: Sequence[Path],
     output_files: Sequence[Path],
     unresolved_template_vars: Sequence[str],
+    pdf_adapter: Optional[Dict[str, Any]] = None,
 ) -> None:
+    digests = sha256_files([*input_files, *output_files], cache=default_hash_cache())
+    input_digests, output_digests = digests[: len(input_files)], digests[len(input_files) :]
+
     inputs = []
-    for p in input_files:
+    for p, digest in zip(input_files, input_digests):
         rel = p.resolve().relative_to(repo_root.resolve()).as_posix()
-        inputs.append({"name": p.name, "path": rel, "sha256": sha256_file(p)})
+        inputs.append({"name": p.name, "path": rel, "sha256": digest})
 
     outputs = []
-    for p in output_files:
+    for p, digest in zip(output_files, output_digests):
         outputs.append(
             {
                 "type": p.suffix.lstrip(".") or "file",
                 "filename": p.name,
-                "sha256": sha256_file(p),
+                "sha256": digest,
                 "size_bytes": p.stat().st_size,
                 "content_type": _content_type_for(p),
                 "storage": None,
@@ -311,55 +726,83 @@ def write_manifest(
         "outputs": outputs,
         "unresolved_template_vars": list(unresolved_template_vars),
     }
+    if pdf_adapter and pdf_adapter.get("name") and pdf_adapter.get("name") != "none":
+        obj["pdf_adapter"] = pdf_adapter
 
     write_json(out_path, obj)
 
 
-def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> None:
-    if not schema_path.exists():
-        raise BuildError(f"Manifest schema not found: {schema_path}")
+# Checked validators by (resolved schema path, schema content sha256), then by format checking.
+_SCHEMA_VALIDATORS: Dict[Tuple[str, str], Dict[bool, Any]] = {}
+_SCHEMA_VALIDATORS_LOCK = threading.Lock()
+
 
+def _import_jsonschema(purpose: str) -> Any:
     try:
         import jsonschema  # type: ignore
     except Exception as exc:  # noqa: BLE001
         raise BuildError(
-            "Missing dependency 'jsonschema' required for manifest validation. "
+            f"Missing dependency 'jsonschema' required for {purpose}. "
             "Install it (pip install jsonschema) or run via CI. "
             f"({exc})"
         )
+    return jsonschema
 
-    schema = read_json(schema_path)
-    try:
-        jsonschema.Draft202012Validator(schema).validate(manifest)
-    except jsonschema.ValidationError as exc:  # type: ignore[attr-defined]
-        path_str = "/".join(str(p) for p in exc.path) if exc.path else "(root)"
-        raise BuildError(f"Manifest failed schema validation at {path_str}: {exc.message}")
 
+def schema_validator(schema_path: Path, *, format_checker: bool = True) -> Any:
+    """A checked jsonschema validator for ``schema_path``, built once per schema content.
+
+    The schema is re-read on each call (it may change between builds) but only parsed,
+    checked and compiled when its sha256 is new. The validator class follows ``$schema``.
+    """
 
-def validate_json_against_schema(data: Any, schema_path: Path) -> None:
     if not schema_path.exists():
         raise BuildError(f"Schema not found: {schema_path}")
+    jsonschema = _import_jsonschema("schema validation")
+    raw = schema_path.read_bytes()
+    key = (str(schema_path.resolve()), hashlib.sha256(raw).hexdigest())
+    variants = _SCHEMA_VALIDATORS.get(key)
+    if variants is not None:
+        if format_checker not in variants:
+            checker = jsonschema.FormatChecker() if format_checker else None
+            variants.setdefault(format_checker, next(iter(variants.values())).evolve(format_checker=checker))
+        return variants[format_checker]
 
     try:
-        import jsonschema  # type: ignore
+        schema = json.loads(raw.decode("utf-8"))
     except Exception as exc:  # noqa: BLE001
-        raise BuildError(
-            "Missing dependency 'jsonschema' required for schema validation. "
-            "Install it (pip install jsonschema) or run via CI. "
-            f"({exc})"
-        )
-
-    schema = read_json(schema_path)
+        raise BuildError(f"Failed to read JSON: {schema_path} ({exc})") from exc
     try:
         validator_cls = jsonschema.validators.validator_for(schema)
         validator_cls.check_schema(schema)
-        validator = validator_cls(schema, format_checker=jsonschema.FormatChecker())
+    except jsonschema.SchemaError as exc:  # type: ignore[attr-defined]
+        raise BuildError(f"Invalid schema {schema_path}: {exc}") from exc
+    validator = validator_cls(schema, format_checker=jsonschema.FormatChecker() if format_checker else None)
+    with _SCHEMA_VALIDATORS_LOCK:
+        return _SCHEMA_VALIDATORS.setdefault(key, {format_checker: validator}).setdefault(format_checker, validator)
+
+
+def validate_manifest_schema(manifest: Dict[str, Any], schema_path: Path) -> None:
+    if not schema_path.exists():
+        raise BuildError(f"Manifest schema not found: {schema_path}")
+
+    jsonschema = _import_jsonschema("manifest validation")
+    validator = schema_validator(schema_path, format_checker=False)
+    try:
+        validator.validate(manifest)
+    except jsonschema.ValidationError as exc:  # type: ignore[attr-defined]
+        path_str = "/".join(str(p) for p in exc.path) if exc.path else "(root)"
+        raise BuildError(f"Manifest failed schema validation at {path_str}: {exc.message}")
+
+
+def validate_json_against_schema(data: Any, schema_path: Path) -> None:
+    jsonschema = _import_jsonschema("schema validation")
+    validator = schema_validator(schema_path)
+    try:
         validator.validate(data)
     except jsonschema.ValidationError as exc:  # type: ignore[attr-defined]
         path_str = "/".join(str(p) for p in exc.path) if exc.path else "(root)"
         raise BuildError(f"Output failed schema validation at {path_str}: {exc.message}")
-    except jsonschema.SchemaError as exc:  # type: ignore[attr-defined]
-        raise BuildError(f"Invalid schema {schema_path}: {exc}")
 
 
 def write_minimal_pdf(path: Path, *, title: str, body_lines: Iterable[str]) -> None:
@@ -421,89 +864,250 @@ def write_minimal_pdf(path: Path, *, title: str, body_lines: Iterable[str]) -> N
     path.write_bytes(bytes(out))
 
 
-def write_html_to_pdf(html_path: Path, pdf_path: Path, *, wait_for_fonts: bool = True) -> None:
-    """
-    Convert HTML file to PDF using Playwright's Chromium print-to-PDF.
-    
-    Args:
-        html_path: Path to HTML file to convert
-        pdf_path: Path where PDF should be written
-        wait_for_fonts: If True, waits for fonts to load (default: True)
+# Print settings shared by every Chromium-rendered PDF (kept stable for consistent page counts).
+PDF_PRINT_OPTIONS: Dict[str, Any] = {
+    "format": "Letter",
+    "print_background": True,
+    "margin": {"top": "0.75in", "right": "0.75in", "bottom": "1in", "left": "0.75in"},
+    "prefer_css_page_size": False,
+}
+
+DEFAULT_PDF_RENDER_PAGES = 2
+
+# Adapter name recorded for Chromium-rendered PDFs (cache keys and manifests).
+PLAYWRIGHT_PDF_ADAPTER = "playwright-chromium"
+
+_PLAYWRIGHT_MISSING = (
+    "Missing dependency 'playwright' required for PDF generation. "
+    "Install it: pip install playwright && playwright install chromium"
+)
+
+
+@dataclass(frozen=True)
+class PdfRenderResult:
+    html_path: Path
+    pdf_path: Path
+    # Seconds spent waiting for a free page, then rendering (load + fonts + print).
+    queued_sec: float
+    render_sec: float
+    # Served from the PDF cache (nothing was rendered).
+    cache_hit: bool = False
+
+
+class HtmlPdfRenderer:
+    """One headless Chromium with ``pages`` reusable tabs, fed from an asyncio queue.
+
+    The browser lives on a private event-loop thread, so synchronous builders can submit
+    several documents and block only on the results they need. Each tab waits for
+    ``document.fonts.ready`` instead of sleeping before it prints.
     """
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError as exc:
-        raise BuildError(
-            "Missing dependency 'playwright' required for PDF generation. "
-            "Install it: pip install playwright && playwright install chromium"
-        ) from exc
 
-    if not html_path.exists():
-        raise BuildError(f"HTML file not found: {html_path}")
+    def __init__(self, *, pages: int = DEFAULT_PDF_RENDER_PAGES) -> None:
+        if pages < 1:
+            raise ValueError(f"pages must be >= 1 (got {pages})")
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError as exc:
+            raise BuildError(_PLAYWRIGHT_MISSING) from exc
+
+        self._async_playwright = async_playwright
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="html-pdf-renderer", daemon=True)
+        self._thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self._start(pages), self._loop).result()
+        except Exception as exc:
+            self._closed = True
+            self._stop_loop()
+            raise BuildError(f"Failed to start headless Chromium: {exc}") from exc
+
+    def __enter__(self) -> "HtmlPdfRenderer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    async def _start(self, pages: int) -> None:
+        self._playwright = await self._async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch()
+            try:
+                tabs = [await self._browser.new_page() for _ in range(pages)]
+            except BaseException:
+                await self._browser.close()
+                raise
+        except BaseException:
+            # A failed start must not leave Chromium or the Playwright driver running.
+            await self._playwright.stop()
+            raise
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._work(page)) for page in tabs]
+
+    async def _work(self, page: Any) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            html_path, pdf_path, wait_for_fonts, enqueued, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.perf_counter()
+            try:
+                await page.goto(html_path.resolve().as_uri(), wait_until="load")
+                if wait_for_fonts:
+                    await page.evaluate("document.fonts.ready.then(() => null)")
+                await page.pdf(path=str(pdf_path), **PDF_PRINT_OPTIONS)
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(BuildError(f"Failed to generate PDF from HTML: {html_path} ({exc})"))
+            else:
+                future.set_result(
+                    PdfRenderResult(html_path, pdf_path, started - enqueued, time.perf_counter() - started)
+                )
+
+    def submit(self, html_path: Path, pdf_path: Path, *, wait_for_fonts: bool = True) -> "Future[PdfRenderResult]":
+        if self._closed:
+            raise BuildError("PDF renderer is closed")
+        if not html_path.exists():
+            raise BuildError(f"HTML file not found: {html_path}")
+        future: Future[PdfRenderResult] = Future()
+        job = (html_path, pdf_path, wait_for_fonts, time.perf_counter(), future)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return future
+
+    def render(self, html_path: Path, pdf_path: Path, *, wait_for_fonts: bool = True) -> PdfRenderResult:
+        return self.submit(html_path, pdf_path, wait_for_fonts=wait_for_fonts).result()
+
+    def render_many(self, jobs: Iterable[Tuple[Path, Path]]) -> List[PdfRenderResult]:
+        """Render (html_path, pdf_path) pairs concurrently; results follow input order."""
+
+        futures = [self.submit(html_path, pdf_path) for html_path, pdf_path in jobs]
+        return [f.result() for f in futures]
+
+    async def _shutdown(self) -> None:
+        for _ in self._workers:
+            self._queue.put_nowait(None)
+        await asyncio.gather(*self._workers)
+        await self._browser.close()
+        await self._playwright.stop()
+
+    def _stop_loop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        finally:
+            self._stop_loop()
+
+
+_SHARED_PDF_RENDERER: Optional[HtmlPdfRenderer] = None
+
+
+def shared_pdf_renderer() -> HtmlPdfRenderer:
+    """The process-wide renderer, started on first use and closed at interpreter exit."""
+
+    global _SHARED_PDF_RENDERER
+    if _SHARED_PDF_RENDERER is None:
+        _SHARED_PDF_RENDERER = HtmlPdfRenderer()
+        atexit.register(_SHARED_PDF_RENDERER.close)
+    return _SHARED_PDF_RENDERER
 
-    html_uri = html_path.resolve().as_uri()
 
+def playwright_version() -> Optional[str]:
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(html_uri, wait_until="networkidle")
-            
-            if wait_for_fonts:
-                # Wait for fonts to load
-                page.wait_for_timeout(500)
-            
-            # Generate PDF with specific settings for consistency
-            page.pdf(
-                path=str(pdf_path),
-                format="Letter",
-                print_background=True,
-                margin={
-                    "top": "0.75in",
-                    "right": "0.75in", 
-                    "bottom": "1in",
-                    "left": "0.75in"
-                },
-                prefer_css_page_size=False,
+        return importlib.metadata.version("playwright")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def write_html_to_pdf_batch(
+    jobs: Sequence[Tuple[Path, Path]], *, wait_for_fonts: bool = True, cache: Optional[PdfCache] = None
+) -> List[PdfRenderResult]:
+    """Render (html_path, pdf_path) pairs on the shared renderer; results follow input order.
+
+    With a ``cache``, hits are copied out and only misses start (or reach) the browser.
+    """
+
+    settings = {**PDF_PRINT_OPTIONS, "wait_for_fonts": wait_for_fonts}
+    version = playwright_version() if cache is not None else None
+    results: List[Optional[PdfRenderResult]] = []
+    misses = []
+    for html_path, pdf_path in jobs:
+        if not html_path.exists():
+            raise BuildError(f"HTML file not found: {html_path}")
+        key, hit = None, False
+        if cache is not None:
+            key, hit = cache.lookup(
+                html_path, pdf_path, adapter=PLAYWRIGHT_PDF_ADAPTER, version=version, settings=settings
             )
-            browser.close()
-    except Exception as exc:
-        raise BuildError(f"Failed to generate PDF from HTML: {exc}") from exc
+        if hit:
+            results.append(PdfRenderResult(html_path, pdf_path, 0.0, 0.0, cache_hit=True))
+            continue
+        future = shared_pdf_renderer().submit(html_path, pdf_path, wait_for_fonts=wait_for_fonts)
+        misses.append((len(results), key, future))
+        results.append(None)
+    for i, key, future in misses:
+        result = results[i] = future.result()
+        if cache is not None and key:
+            cache.store(key, result.pdf_path)
+    return [r for r in results if r is not None]
+
+
+def write_html_to_pdf(html_path: Path, pdf_path: Path, *, wait_for_fonts: bool = True) -> PdfRenderResult:
+    """
+    Convert HTML file to PDF using Playwright's Chromium print-to-PDF.
+
+    Uses the default PDF cache and the shared renderer, so later calls in the same process
+    reuse the running browser.
+
+    Args:
+        html_path: Path to HTML file to convert
+        pdf_path: Path where PDF should be written
+        wait_for_fonts: If True, waits for document.fonts.ready before printing (default: True)
+    """
+    jobs = [(html_path, pdf_path)]
+    return write_html_to_pdf_batch(jobs, wait_for_fonts=wait_for_fonts, cache=default_pdf_cache())[0]
 
 
 def count_pdf_pages(pdf_path: Path) -> int:
     """
     Count the number of pages in a PDF file.
-    
+
     Args:
         pdf_path: Path to PDF file
-        
+
     Returns:
         Number of pages in the PDF
     """
     if not pdf_path.exists():
         raise BuildError(f"PDF file not found: {pdf_path}")
-    
+
     try:
         # Read PDF and count page objects
         content = pdf_path.read_bytes()
         # Simple page count by finding "/Type /Page" objects (not in "/Pages")
         # More robust: look for the /Count in the /Pages object
         import re
-        
+
         # Look for /Pages dictionary with /Count
-        pages_pattern = rb'/Pages\s+\d+\s+\d+\s+R.*?/Count\s+(\d+)'
+        pages_pattern = rb"/Pages\s+\d+\s+\d+\s+R.*?/Count\s+(\d+)"
         match = re.search(pages_pattern, content, re.DOTALL)
         if match:
             return int(match.group(1))
-        
+
         # Fallback: count individual /Page objects (not /Pages)
         # This is less reliable but works for simple PDFs
-        page_pattern = rb'/Type\s*/Page[^s]'
+        page_pattern = rb"/Type\s*/Page[^s]"
         pages = len(re.findall(page_pattern, content))
         if pages > 0:
             return pages
-            
+
         raise BuildError("Could not determine page count from PDF")
     except Exception as exc:
         raise BuildError(f"Failed to count PDF pages: {exc}") from exc
@@ -9,16 +9,39 @@ This is intentionally separate from the CI smoke runner:
 Usage examples:
   python scripts/release_products.py --pdf-adapter wkhtmltopdf
   python scripts/release_products.py --pdf-adapter command --pdf-cmd "wkhtmltopdf {html} {pdf}"
+
+Builders run as separate processes, one at a time unless --jobs is raised. With a PDF
+adapter they only write HTML (--defer-pdf); every product's PDFs are then rendered here in
+one run_pdf_adapter_batch call, at most --pdf-workers at a time, and each job's adapter meta
+is written into its manifest's pdf_adapter block. For --pdf-adapter wkhtmltopdf the
+executable and version are resolved once.
 """
 
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Mapping, Optional, Sequence
+
+from product_build_utils import (
+    DEFAULT_PDF_ADAPTER_WORKERS,
+    PDF_JOB_FILENAME,
+    BuildError,
+    default_pdf_cache,
+    finish_deferred_pdf,
+    read_pdf_job,
+    resolve_wkhtmltopdf,
+    run_pdf_adapter_batch,
+    validate_manifest_schema,
+)
+
+# Builders that render a PDF from their HTML; release passes them --defer-pdf.
+PDF_PRODUCTS = ["weekly_signal_brief", "attention_mechanics_report", "pattern_engine_report", "content_template_pack"]
 
 
 @dataclass(frozen=True)
@@ -43,8 +66,53 @@ def is_fixture_run(info: RunInfo) -> bool:
     return "fixture" in info.run_id.lower()
 
 
-def _run(argv: list[str], cwd: Path) -> None:
-    subprocess.run(argv, cwd=str(cwd), check=True)
+def _run(argv: list[str], cwd: Path, env: Optional[Mapping[str, str]] = None) -> None:
+    subprocess.run(argv, cwd=str(cwd), env=env, check=True)
+
+
+def _run_all(commands: Sequence[tuple[str, list[str]]], cwd: Path, *, jobs: int, env: Mapping[str, str]) -> None:
+    """Run builder commands, ``jobs`` at a time; output is replayed in submission order."""
+
+    if jobs <= 1:
+        for label, argv in commands:
+            print(f"[release] {label}", flush=True)
+            _run(argv, cwd, env)
+        return
+
+    def capture(argv: list[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(argv, cwd=str(cwd), env=env, capture_output=True, text=True)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(capture, argv) for _, argv in commands]
+        failed: Optional[subprocess.CompletedProcess] = None
+        for (label, _), future in zip(commands, futures):
+            proc = future.result()
+            print(f"[release] {label}")
+            sys.stdout.write(proc.stdout)
+            sys.stderr.write(proc.stderr)
+            if proc.returncode != 0 and failed is None:
+                failed = proc
+    if failed is not None:
+        raise subprocess.CalledProcessError(failed.returncode, failed.args, failed.stdout, failed.stderr)
+
+
+def _render_deferred_pdfs(
+    job_files: Sequence[Path], repo_root: Path, *, adapter: str, pdf_cmd: Optional[str], workers: int
+) -> None:
+    """Render every deferred (html, pdf) job in one bounded batch and complete its manifest."""
+
+    jobs = [read_pdf_job(path) for path in job_files]
+    metas = run_pdf_adapter_batch(
+        adapter=adapter,
+        jobs=[(html, pdf) for html, pdf, _ in jobs],
+        pdf_cmd=pdf_cmd,
+        max_workers=workers,
+        cache=default_pdf_cache(),
+    )
+    schema_path = repo_root / "artifacts" / "manifest.schema.json"
+    for job_file, (_, pdf, manifest_path), meta in zip(job_files, jobs, metas):
+        validate_manifest_schema(finish_deferred_pdf(manifest_path, pdf, meta), schema_path)
+        job_file.unlink()
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -80,6 +148,18 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Also build the Signal Dashboard webapp zip deliverable.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Builders to run at once (default: 1). PDFs are rendered afterwards, see --pdf-workers.",
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=DEFAULT_PDF_ADAPTER_WORKERS,
+        help=f"PDF adapter processes to run at once across all products (default: {DEFAULT_PDF_ADAPTER_WORKERS}).",
+    )
 
     args = parser.parse_args(argv)
 
@@ -161,27 +241,33 @@ def main(argv: list[str] | None = None) -> int:
         ],
     }
 
-    if args.pdf_adapter == "command":
-        if not args.pdf_cmd:
-            print("ERROR: --pdf-cmd is required when --pdf-adapter=command", file=sys.stderr)
-            return 2
-        for product in [
-            "weekly_signal_brief",
-            "attention_mechanics_report",
-            "pattern_engine_report",
-            "content_template_pack",
-        ]:
-            builders[product].extend(["--pdf-cmd", args.pdf_cmd])
+    if args.pdf_adapter == "command" and not args.pdf_cmd:
+        print("ERROR: --pdf-cmd is required when --pdf-adapter=command", file=sys.stderr)
+        return 2
+    if args.pdf_adapter != "none":
+        for product in PDF_PRODUCTS:
+            builders[product].append("--defer-pdf")
 
     if args.bundle_dashboard_webapp:
         builders["signal_dashboard"].append("--bundle-webapp")
 
+    env = dict(os.environ)
+    if args.pdf_adapter == "wkhtmltopdf":
+        try:
+            exe, version = resolve_wkhtmltopdf()
+        except BuildError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 2
+        env["WKHTMLTOPDF_PATH"] = exe
+        env["WKHTMLTOPDF_VERSION"] = version or ""
+
     runs = list(iter_run_json(repo_root))
     if not runs:
         print("No run.json files found under products/*/runs/*/run.json")
         return 2
 
-    built = 0
+    commands: list[tuple[str, list[str]]] = []
+    job_files: list[Path] = []
     for info in runs:
         if info.product not in builders:
             continue
@@ -190,6 +276,10 @@ def main(argv: list[str] | None = None) -> int:
 
         out_dir = out_root / info.product / info.run_id
         out_dir.mkdir(parents=True, exist_ok=True)
+        job_file = out_dir / PDF_JOB_FILENAME
+        job_file.unlink(missing_ok=True)  # left by an earlier, failed release
+        if args.pdf_adapter != "none" and info.product in PDF_PRODUCTS:
+            job_files.append(job_file)
 
         cmd = [
             a.format(
@@ -198,11 +288,20 @@ def main(argv: list[str] | None = None) -> int:
             )
             for a in builders[info.product]
         ]
-        print(f"[release] {info.product}/{info.run_id}")
-        _run(cmd, cwd=repo_root)
-        built += 1
+        commands.append((f"{info.product}/{info.run_id}", cmd))
 
-    print(f"Release builds complete: {built} run(s) -> {out_root}")
+    _run_all(commands, repo_root, jobs=args.jobs, env=env)
+
+    if job_files:
+        print(f"[release] rendering {len(job_files)} PDF(s), {args.pdf_workers} at a time", flush=True)
+        try:
+            _render_deferred_pdfs(
+                job_files, repo_root, adapter=args.pdf_adapter, pdf_cmd=args.pdf_cmd, workers=args.pdf_workers
+            )
+        except BuildError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 1
+    print(f"Release builds complete: {len(commands)} run(s) -> {out_root}")
     return 0
 
 
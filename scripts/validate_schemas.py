@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import argparse
-import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
-import jsonschema
+try:
+    from product_build_utils import BuildError, schema_validator
+except ImportError:  # imported as scripts.validate_schemas
+    from scripts.product_build_utils import BuildError, schema_validator
 
 
 @dataclass(frozen=True)
@@ -37,27 +39,27 @@ def _iter_schema_files(repo_root: Path) -> Iterable[Path]:
         yield path
 
 
-def _load_json(path: Path) -> object:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def validate_schema_file(path: Path) -> SchemaResult:
+    # One read: schema_validator parses the file and checks it against its metaschema.
     try:
-        schema = _load_json(path)
-    except Exception as exc:  # noqa: BLE001
-        return SchemaResult(path=path, ok=False, error=f"failed to parse JSON: {exc}")
-
-    try:
-        validator_cls = jsonschema.validators.validator_for(schema)
-        validator_cls.check_schema(schema)
-    except Exception as exc:  # noqa: BLE001
-        return SchemaResult(path=path, ok=False, error=f"invalid JSON Schema: {exc}")
+        schema_validator(path)
+    except BuildError as exc:
+        cause = exc.__cause__
+        # JSONDecodeError and UnicodeDecodeError are both ValueErrors; SchemaError is not.
+        if isinstance(cause, ValueError):
+            return SchemaResult(path=path, ok=False, error=f"failed to parse JSON: {cause}")
+        return SchemaResult(path=path, ok=False, error=f"invalid JSON Schema: {cause or exc}")
 
     return SchemaResult(path=path, ok=True)
 
 
 def validate_repo_schemas(repo_root: Path) -> list[str]:
+    try:
+        import jsonschema  # noqa: F401
+    except ImportError as exc:
+        # Reported once, not as an "invalid JSON Schema" for every file.
+        return [f"Missing dependency 'jsonschema' required for schema validation (pip install jsonschema): {exc}"]
+
     errors: list[str] = []
     for schema_path in _iter_schema_files(repo_root):
         result = validate_schema_file(schema_path)
@@ -0,0 +1,10 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _aggregate_cache_dir(tmp_path, monkeypatch):
+    """Keep the aggregator's derived caches in the test's tmp dir instead of build/."""
+
+    monkeypatch.setenv("AGGREGATE_CACHE_DIR", str(tmp_path / "aggregate_cache"))
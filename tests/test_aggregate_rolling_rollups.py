@@ -0,0 +1,101 @@
+"""Tests for scripts/aggregate_rolling_rollups.py."""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import aggregate_rolling_rollups as rolling  # noqa: E402
+import aggregate_weekly_inputs as agg  # noqa: E402
+from weekly_run_helpers import make_run, run_aggregator  # noqa: E402
+
+
+def _rows(path: Path, drop: tuple = ()) -> list:
+    with path.open(encoding="utf-8", newline="") as f:
+        return [{k: v for k, v in r.items() if k not in drop} for r in csv.DictReader(f)]
+
+
+def test_rolling_window_matches_single_run_over_the_same_rows(tmp_path: Path, monkeypatch) -> None:
+    runs = tmp_path / "runs"
+    week_lines = []
+    for week, seed in [("2099-W01", 41), ("2099-W02", 42), ("2099-W04", 43)]:
+        run_json = make_run(runs / week, 300, week_id=week, seed=seed)
+        week_lines.append((run_json.parent / "inputs" / "posts_export.csv").read_bytes().splitlines(keepends=True))
+
+    combined = make_run(tmp_path / "combined", 0, week_id="combined")
+    posts = combined.parent / "inputs" / "posts_export.csv"
+    posts.write_bytes(b"".join(week_lines[0] + week_lines[1][1:] + week_lines[2][1:]))
+    run_aggregator(combined)
+
+    out = tmp_path / "rolling"
+    argv = ["--runs", str(runs / "*"), "--out-dir", str(out), "--windows", "1,4"]
+    before_runs = sorted(p.relative_to(runs) for p in runs.rglob("*"))
+    assert rolling.main(argv) == 0
+    assert sorted(p.relative_to(runs) for p in runs.rglob("*")) == before_runs
+    partials = sorted((tmp_path / "aggregate_cache").glob(f"*/{agg.WEEKLY_PARTIAL_FILENAME}"))
+    assert len(partials) == 3
+    first = {p.name: p.read_bytes() for p in out.iterdir()}
+
+    starts = []
+    iter_posts = agg._iter_posts_csv
+    monkeypatch.setattr(
+        agg, "_iter_posts_csv", lambda path, *, start=0: starts.append(start) or iter_posts(path, start=start)
+    )
+    # Unchanged weeks come from their cached partials without re-reading the exports.
+    assert rolling.main(argv) == 0
+    assert starts == []
+    assert {p.name: p.read_bytes() for p in out.iterdir()} == first
+
+    # Without partials, weeks with a checkpoint (here with an extra dimension) are merged from it
+    # and left untouched.
+    monkeypatch.setenv(agg.AGGREGATE_CACHE_DIR_ENV, str(tmp_path / "fresh_cache"))
+    run_aggregator(runs / "2099-W01" / "run.json", "--incremental", "--rollup-dimension", "visual_style")
+    state = runs / "2099-W01" / agg.AGGREGATE_STATE_FILENAME
+    before = state.read_bytes()
+    starts.clear()
+    assert rolling.main(argv) == 0
+    # W01 resumes at the end of its checkpointed export; the other weeks are parsed from the start.
+    assert sorted(starts) == [0, 0, sum(map(len, week_lines[0]))]
+    assert state.read_bytes() == before
+    assert {p.name: p.read_bytes() for p in out.iterdir()} == first
+
+    # A touched export with the same bytes still matches its partial by sha256.
+    posts_w02 = runs / "2099-W02" / "inputs" / "posts_export.csv"
+    posts_w02.write_bytes(posts_w02.read_bytes())
+    starts.clear()
+    assert rolling.main(argv) == 0
+    assert starts == []
+    # An edited export invalidates its partial.
+    with posts_w02.open("ab") as f:
+        f.write(week_lines[1][1])
+    assert rolling.main(argv) == 0
+    assert starts == [0]
+    posts_w02.write_bytes(b"".join(week_lines[1]))
+    assert rolling.main(argv) == 0
+    assert {p.name: p.read_bytes() for p in out.iterdir()} == first
+
+    drop = ("week_id", "window_weeks", "weeks_present")
+    for name in ["hooks_rollup", "verticals_rollup"]:
+        assert _rows(out / f"{name}_4w.csv", drop) == _rows(combined.parent / "inputs" / f"{name}.csv", drop)
+
+    four_week = _rows(out / "hooks_rollup_4w.csv")
+    assert {r["week_id"] for r in four_week} == {"2099-W01..2099-W04"}
+    assert {r["weeks_present"] for r in four_week} == {"3"}
+
+    summary = json.loads((out / "rolling_windows.json").read_text(encoding="utf-8"))
+    assert summary["as_of_week"] == "2099-W04"
+    assert [w["weeks_present"] for w in summary["windows"]] == [["2099-W04"], ["2099-W01", "2099-W02", "2099-W04"]]
+
+
+def test_rolling_rejects_a_pattern_with_no_runs(tmp_path: Path) -> None:
+    runs = tmp_path / "runs"
+    make_run(runs / "2099-W01", 20, week_id="2099-W01")
+    argv = ["--runs", str(runs / "*"), "--runs", str(tmp_path / "typo" / "*"), "--out-dir", str(tmp_path / "out")]
+    with pytest.raises(SystemExit, match="no run.json matches"):
+        rolling.main(argv)
@@ -0,0 +1,349 @@
+"""Tests for scripts/aggregate_weekly_inputs.py."""
+
+import csv
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import aggregate_weekly_inputs as agg  # noqa: E402
+from weekly_run_helpers import (  # noqa: E402
+    POSTS_HEADER,
+    make_run,
+    run_aggregator,
+    run_outputs,
+    write_posts,
+)
+
+
+def test_streaming_matches_default_mode(tmp_path: Path) -> None:
+    run_json = make_run(tmp_path / "run", 1500)
+    posts = run_json.parent / "inputs" / "posts_export.csv"
+    with posts.open("a", encoding="utf-8", newline="") as f:
+        # Literal NaN metrics count as missing in every mode.
+        for i, value in enumerate(["nan", "NaN", " nan ", "0.4"]):
+            row = dict.fromkeys(POSTS_HEADER, "")
+            row.update(date="2099-01-03", platform="tiktok", vertical="ops", hook_type="claim", block_id="B-1")
+            row.update(duration_sec="22", is_control=str(i % 2 == 0).lower(), views_1h="10", views_24h="100")
+            row.update(avg_view_duration_sec="5", completion_pct=value, loop_pct="0.1", decision="keep")
+            csv.DictWriter(f, fieldnames=POSTS_HEADER).writerow(row)
+    expected = run_aggregator(run_json)
+    assert json.loads(expected["dataset_health.json"])["counts"]["total_posts"] == 1504
+    assert run_aggregator(run_json, "--streaming") == expected
+    assert run_aggregator(run_json, "--incremental") == expected
+
+
+def test_streaming_aggregator_tracks_health_incrementally(tmp_path: Path) -> None:
+    posts = tmp_path / "posts_export.csv"
+    write_posts(posts, 400, seed=11)
+    rows = list(agg._iter_posts_csv(posts))
+
+    stream = agg._StreamingAggregator()
+    for r in agg._iter_posts_csv(posts):
+        stream.add(r)
+
+    valid = [r for r in rows if agg._is_valid(r)[0]]
+    assert stream.total_posts == len(rows)
+    assert stream.valid_posts == len(valid)
+    assert stream.posts_range() == agg._compute_date_range(agg._parse_posts_csv(posts))
+    assert sum(len(acc.rr) for acc in stream.sets.values()) == len(valid)
+
+
+def test_columnar_store_matches_row_parser(tmp_path: Path) -> None:
+    posts = tmp_path / "posts_export.csv"
+    write_posts(posts, 300, seed=5)
+    rows = list(agg._iter_posts_csv(posts))
+    cols = agg._parse_posts_csv(posts)
+
+    assert len(cols) == len(rows)
+    assert len(cols.labels["platform"]) == 3
+    for i, r in enumerate(rows):
+        for field in agg._NUMERIC_FIELDS:
+            v = cols.numeric[field][i]
+            assert (getattr(r, field) is None and v != v) or getattr(r, field) == v
+        for field in agg._CODED_FIELDS:
+            assert cols.label(field, i) == getattr(r, field)
+
+    valid_idx, _, _ = agg._split_valid(cols)
+    assert valid_idx == [i for i, r in enumerate(rows) if agg._is_valid(r)[0]]
+
+
+def _valid_columns(posts: Path):
+    cols = agg._parse_posts_csv(posts)
+    valid_idx, _, _ = agg._split_valid(cols)
+    return cols.take(valid_idx)
+
+
+def test_numpy_scoring_matches_stdlib_on_fixture_run(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    fixture = REPO_ROOT / "products/weekly_signal_brief/runs/2099-W01-fixture/inputs/posts_export.csv"
+    synthetic = tmp_path / "posts_export.csv"
+    write_posts(synthetic, 2000, seed=3)
+
+    for posts in [fixture, synthetic]:
+        cols = _valid_columns(posts)
+        stdlib_scores = agg._derive_metrics(cols, engine="stdlib").score
+        numpy_scores = agg._derive_metrics(cols, engine="numpy").score
+        assert len(stdlib_scores) == len(numpy_scores) == len(cols)
+        for a, b in zip(stdlib_scores, numpy_scores):
+            assert abs(a - b) <= 1e-12
+
+
+def test_robust_norm_handles_zero_mad() -> None:
+    # Retention is clamped at 1.0, so most of a set can tie and push MAD to zero.
+    out = agg._robust_norm([1.0, 1.0, 1.0, 0.4])
+    assert out == [0.5, 0.5, 0.5, 0.0]
+
+
+def test_scoring_engine_falls_back_without_numpy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(agg, "np", None)
+    assert agg._resolve_scoring_engine("auto") == "stdlib"
+    with pytest.raises(SystemExit):
+        agg._resolve_scoring_engine("numpy")
+
+
+def test_derived_metrics_table_is_engine_independent(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    posts = tmp_path / "posts_export.csv"
+    write_posts(posts, 800, seed=13)
+    cols = _valid_columns(posts)
+
+    stdlib = agg._derive_metrics(cols, engine="stdlib")
+    vectorized = agg._derive_metrics(cols, engine="numpy")
+    assert stdlib.set_keys == vectorized.set_keys
+    assert list(stdlib.set_ids) == list(vectorized.set_ids)
+    assert stdlib.duration_band == vectorized.duration_band
+    for a, b in [
+        (stdlib.retention_ratio, vectorized.retention_ratio),
+        (stdlib.save_share_rate, vectorized.save_share_rate),
+        (stdlib.velocity, vectorized.velocity),
+        (stdlib.comment_rate, vectorized.comment_rate),
+    ]:
+        assert a.tobytes() == b.tobytes()
+
+
+def test_extra_rollup_dimensions_share_one_grouping_pass(tmp_path: Path) -> None:
+    run_json = make_run(tmp_path / "run", 1200, seed=17)
+    expected = run_aggregator(run_json)
+    extra = ["--rollup-dimension", "visual_style", "--rollup-dimension", "experiment_id+variant_id"]
+    inputs = run_json.parent / "inputs"
+
+    for mode in [[], ["--streaming"]]:
+        assert run_aggregator(run_json, *extra, *mode) == expected
+        with (inputs / "experiment_id_variant_id_rollup.csv").open(encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]["experiment_id"] == "EXP-001"
+        assert {r["variant_id"] for r in rows} == {"A", "B"}
+        with (inputs / "visual_style_rollup.csv").open(encoding="utf-8", newline="") as f:
+            style_samples = sum(int(r["visual_style_samples"]) for r in csv.DictReader(f))
+        assert style_samples == sum(int(r["experiment_id_variant_id_samples"]) for r in rows)
+
+    with pytest.raises(SystemExit):
+        agg._parse_rollup_dimension("hook_text")
+
+
+def test_rollup_schema_v02_adds_velocity_and_comment_rate(tmp_path: Path) -> None:
+    run_json = make_run(tmp_path / "run", 900, seed=19)
+    v01 = run_aggregator(run_json)
+    v02 = run_aggregator(run_json, "--rollup-schema", "v02")
+    assert run_aggregator(run_json, "--rollup-schema", "v02", "--streaming") == v02
+    assert v02["dataset_health.json"] == v01["dataset_health.json"]
+
+    old_rows = list(csv.DictReader(v01["hooks_rollup.csv"].decode("utf-8").splitlines()))
+    new_rows = list(csv.DictReader(v02["hooks_rollup.csv"].decode("utf-8").splitlines()))
+    assert list(new_rows[0]) == agg._rollup_columns(agg.HOOKS_DIMENSION) + [
+        "hook_median_velocity",
+        "hook_median_comment_rate",
+    ]
+    assert [{k: r[k] for k in old_rows[0]} for r in new_rows] == old_rows
+
+    posts = run_json.parent / "inputs" / "posts_export.csv"
+    rows = [r for r in agg._iter_posts_csv(posts) if agg._is_valid(r)[0]]
+    first = new_rows[0]
+    group = [
+        r
+        for r in rows
+        if (r.platform, agg._duration_band(r.duration_sec), r.block_id, r.hook_type)
+        == (first["platform"], first["duration_band"], first["block_id"], first["hook_type"])
+    ]
+    velocities = [v for v in map(agg._velocity, group) if v is not None]
+    comment_rates = [v for v in map(agg._comment_rate, group) if v is not None]
+    assert float(first["hook_median_velocity"]) == pytest.approx(statistics.median(velocities), abs=1e-4)
+    assert float(first["hook_median_comment_rate"]) == pytest.approx(statistics.median(comment_rates), abs=1e-4)
+
+
+def test_exact_median_selection_matches_statistics_median(monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(23)
+    for n in [1, 2, 33, 34, 5001, 5002]:
+        values = [float(rng.randint(0, 50)) for _ in range(n)]
+        expected = statistics.median(values)
+        assert agg._median_exact(values) == expected
+        assert agg._select(sorted(values, reverse=True), n // 2) == sorted(values)[n // 2]
+        monkeypatch.setattr(agg, "_PY_SELECT_MIN", 1)
+        monkeypatch.setattr(agg, "np", None)
+        assert agg._median_exact(values) == expected
+        monkeypatch.undo()
+
+
+def test_incremental_ingests_appended_rows_and_matches_full_run(tmp_path: Path, capsys) -> None:
+    full_run = make_run(tmp_path / "full", 900, seed=37)
+    expected = run_aggregator(full_run)
+    lines = (full_run.parent / "inputs" / "posts_export.csv").read_bytes().splitlines(keepends=True)
+
+    run_json = make_run(tmp_path / "inc", 0)
+    posts = run_json.parent / "inputs" / "posts_export.csv"
+    state = run_json.parent / agg.AGGREGATE_STATE_FILENAME
+    for cut in [400, 650, len(lines)]:
+        posts.write_bytes(b"".join(lines[:cut]))
+        run_aggregator(run_json, "--incremental")
+    assert "resuming posts_export.csv" in capsys.readouterr().out
+    assert run_outputs(run_json) == expected
+    assert json.loads(state.read_text(encoding="utf-8"))["offset"] == posts.stat().st_size
+
+    # A rewritten prefix invalidates the checkpoint; a partial last row is never checkpointed.
+    posts.write_bytes(b"".join(lines[:1] + lines[2:]).rstrip(b"\r\n"))
+    run_aggregator(run_json, "--incremental")
+    assert "no usable checkpoint" in capsys.readouterr().out
+    assert not state.exists()
+
+
+@pytest.mark.parametrize("engine", ["stdlib", "numpy"])
+def test_parallel_scoring_matches_serial(tmp_path: Path, engine: str) -> None:
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    posts = tmp_path / "posts_export.csv"
+    write_posts(posts, 1500, seed=47)
+    cols = _valid_columns(posts)
+
+    serial = agg._derive_metrics(cols, engine=engine)
+    parallel = agg._derive_metrics(cols, engine=engine, workers=3)
+    assert len(serial.set_keys) > 3
+    assert parallel.score.tobytes() == serial.score.tobytes()
+
+    run_json = make_run(tmp_path / "run", 1500, seed=47)
+    expected = run_aggregator(run_json, "--scoring-engine", engine)
+    assert run_aggregator(run_json, "--scoring-engine", engine, "--workers", "3") == expected
+    assert run_aggregator(run_json, "--scoring-engine", engine, "--workers", "3", "--streaming") == expected
+
+
+def test_fast_reader_matches_dictreader_on_ragged_input(tmp_path: Path) -> None:
+    posts = tmp_path / "posts_export.csv"
+    write_posts(posts, 500, seed=53)
+    lines = posts.read_text(encoding="utf-8").splitlines()
+    # Short rows, extra fields, blank lines, padded numbers and unparseable values.
+    lines[3] = ",".join(lines[3].split(",")[:5])
+    lines[7] = lines[7] + ",extra"
+    lines[11] = lines[11].replace(",hook,", ",hook, 17 ,", 1)
+    lines[13] = lines[13].replace(",hook,", ",hook,n/a,", 1)
+    lines.insert(20, "")
+    posts.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    fast = agg._parse_posts_csv(posts)
+    reference = agg._parse_posts_csv_records(posts)
+    assert len(fast) == len(reference) == 500
+    for field in agg._NUMERIC_FIELDS:
+        assert fast.numeric[field].tobytes() == reference.numeric[field].tobytes()
+    for field in agg._CODED_FIELDS:
+        assert [fast.label(field, i) for i in range(len(fast))] == [
+            reference.label(field, i) for i in range(len(reference))
+        ]
+    assert fast.notes == reference.notes
+
+
+def test_column_cache_round_trips_and_tracks_the_export(tmp_path: Path) -> None:
+    run_json = make_run(tmp_path / "run", 700, seed=59)
+    posts = run_json.parent / "inputs" / "posts_export.csv"
+    cache = agg._column_cache_path(posts)
+    expected = run_aggregator(run_json, "--no-column-cache")
+    assert not cache.exists()
+
+    assert run_aggregator(run_json) == expected
+    assert cache.exists() and not (posts.parent / cache.name).exists()
+    cached = agg._read_column_cache(cache, posts)
+    parsed = agg._parse_posts_csv(posts)
+    assert cached is not None and len(cached) == len(parsed)
+    for field in agg._NUMERIC_FIELDS:
+        assert cached.numeric[field].tobytes() == parsed.numeric[field].tobytes()
+    for field in agg._CODED_FIELDS:
+        assert cached.codes[field] == parsed.codes[field] and cached.labels[field] == parsed.labels[field]
+    assert cached.notes == parsed.notes
+    assert run_aggregator(run_json) == expected
+
+    # An edit changes size/mtime, so the sha256 is rechecked and the stale cache rejected; a corrupt one is ignored.
+    data = posts.read_bytes()
+    posts.write_bytes(data.replace(b"tiktok", b"TIKTOK", 1))
+    assert agg._read_column_cache(cache, posts) is None
+    cache.write_bytes(b"garbage")
+    assert agg._load_posts_columns(posts).label("platform", 0) == agg._parse_posts_csv(posts).label("platform", 0)
+
+
+def test_lift_labels_drive_rollup_win_rates(tmp_path: Path) -> None:
+    run_json = make_run(tmp_path / "run", 0)
+
+    def post(block: str, is_control: str, completion: float, shares: int, saves: int, decision: str) -> dict:
+        return {
+            "date": "2099-01-05",
+            "platform": "tiktok",
+            "vertical": "ops",
+            "hook_type": "claim",
+            "duration_sec": 20,
+            "block_id": block,
+            "is_control": is_control,
+            "views_1h": 100,
+            "views_24h": 1000,
+            "avg_view_duration_sec": 10,
+            "completion_pct": completion,
+            "loop_pct": 0.1,
+            "shares": shares,
+            "saves": saves,
+            "decision": decision,
+        }
+
+    rows = [
+        post("B-1", "true", 0.50, 50, 50, ""),  # baseline: completion 0.5, save+share rate 0.1
+        post("B-1", "false", 0.60, 60, 60, "kill"),  # +20% / +20% -> WIN
+        post("B-1", "false", 0.52, 50, 55, "keep"),  # +4% / +5% -> NEUTRAL
+        post("B-1", "false", 0.45, 60, 60, "scale"),  # -10% completion -> LOSS
+        post("B-2", "false", 0.50, 10, 10, "keep"),  # no control in B-2: decision fallback
+        post("B-2", "false", 0.50, 10, 10, "kill"),
+    ]
+    with (run_json.parent / "inputs" / "posts_export.csv").open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=POSTS_HEADER, restval="")
+        w.writeheader()
+        w.writerows(rows)
+
+    cols = agg._parse_posts_csv(run_json.parent / "inputs" / "posts_export.csv")
+    derived = agg._derive_metrics(cols)
+    assert derived.block_baselines == {"B-1": (0.5, 0.1)}
+    assert [agg.OUTCOME_LABELS[c] if c >= 0 else None for c in derived.lift_label] == [
+        None,
+        "WIN",
+        "NEUTRAL",
+        "LOSS",
+        None,
+        None,
+    ]
+
+    def win_rates(outputs: dict) -> dict:
+        reader = csv.DictReader(outputs["hooks_rollup.csv"].decode("utf-8").splitlines())
+        return {r["block_id"]: float(r["hook_win_rate"]) for r in reader}
+
+    lift = run_aggregator(run_json, "--win-rate-source", "lift")
+    assert win_rates(lift) == pytest.approx({"B-1": 1 / 3, "B-2": 0.5}, abs=1e-4)
+    health = json.loads(lift["dataset_health.json"])
+    assert health["outcome_labels"]["labels"] == {"LOSS": 1, "NEUTRAL": 1, "WIN": 1}
+    assert health["outcome_labels"]["blocks_with_baseline"] == 1
+    assert health["outcome_labels"]["decision_fallback_blocks"] == ["B-2"]
+    assert run_aggregator(run_json, "--win-rate-source", "lift", "--streaming") == lift
+
+    # Decision labels are the default; dataset_health.json then has no outcome_labels block.
+    decision = run_aggregator(run_json)
+    assert win_rates(decision) == pytest.approx({"B-1": 2 / 3, "B-2": 0.5}, abs=1e-4)
+    assert "outcome_labels" not in json.loads(decision["dataset_health.json"])
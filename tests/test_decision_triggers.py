@@ -0,0 +1,105 @@
+"""Tests for scripts/decision_triggers.py and aggregate_weekly_inputs.py --propose-decisions."""
+
+import csv
+import sys
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import aggregate_weekly_inputs as agg  # noqa: E402
+import decision_triggers as dtr  # noqa: E402
+from weekly_run_helpers import make_run, run_aggregator  # noqa: E402
+
+
+def _hook_row(
+    hook: str,
+    *,
+    block: str = "B-1",
+    samples: int = 8,
+    win_rate: float = 0.5,
+    score: float = 0.5,
+    completion: float = 0.5,
+    save_share: float = 0.02,
+    week_id: str = "2099-W05",
+) -> dict:
+    return {
+        "week_id": week_id,
+        "platform": "tiktok",
+        "duration_band": "20-27",
+        "block_id": block,
+        "hook_type": hook,
+        "hook_samples": samples,
+        "hook_win_rate": win_rate,
+        "hook_median_completion": completion,
+        "hook_median_save_share_rate": save_share,
+        "hook_score_median": score,
+    }
+
+
+def _standings(rows: list, baselines: Optional[dict] = None) -> list:
+    return dtr.standings(rows, pattern_type="hook", pattern_field="hook_type", prefix="hook", baselines=baselines)
+
+
+def test_quartiles_and_scale_replication() -> None:
+    rows = [
+        _hook_row("claim", score=0.9, win_rate=0.7, completion=0.6, save_share=0.03),
+        _hook_row("question", score=0.5),
+        _hook_row("story", score=0.4),
+        _hook_row("contrarian", score=0.1, completion=0.3, save_share=0.01),
+        _hook_row("list", score=0.95, win_rate=0.8, samples=3),  # below the 6-sample minimum
+    ]
+    by_hook = {s.pattern_id: s for s in _standings(rows, {"B-1": (0.5, 0.02)})}
+    assert by_hook["claim"].quartile == "top" and by_hook["contrarian"].quartile == "bottom"
+    assert by_hook["question"].quartile == "mid"
+    assert by_hook["contrarian"].below_baseline and not by_hook["claim"].below_baseline
+
+    proposed = {r["pattern_id"]: r for r in dtr.propose(list(by_hook.values()), week_id="2099-W05")}
+    assert "list" not in proposed
+    assert proposed["claim"]["decision_type"] == "keep"
+    assert proposed["claim"]["followup_week"] == "2099-W06"
+    assert proposed["contrarian"]["decision_type"] == "iterate"
+
+    # The same pattern clearing the scale bar in an earlier week counts as the replication.
+    earlier = _standings([_hook_row("claim", score=0.9, win_rate=0.65, week_id="2099-W04"), _hook_row("x", score=0.2)])
+    proposed = {r["pattern_id"]: r for r in dtr.propose(list(by_hook.values()), earlier, week_id="2099-W05")}
+    assert proposed["claim"]["decision_type"] == "scale"
+
+
+def test_kill_needs_two_prior_weeks_below_baseline_and_no_drift() -> None:
+    def week(week_id: str, completion: float) -> list:
+        return _standings(
+            [_hook_row("claim", completion=completion, save_share=0.01, week_id=week_id)], {"B-1": (0.5, 0.02)}
+        )
+
+    current = week("2099-W05", 0.3)
+    assert dtr.propose(current, week("2099-W04", 0.3), week_id="2099-W05")[0]["decision_type"] == "iterate"
+
+    history = week("2099-W03", 0.3) + week("2099-W04", 0.3)
+    assert dtr.propose(current, history, week_id="2099-W05")[0]["decision_type"] == "kill"
+    drifted = dtr.propose(current, history, week_id="2099-W05", drift_flags=["low_sample_size"])
+    assert drifted[0]["decision_type"] == "iterate"
+    # An improving week in between resets the streak; later weeks are ignored.
+    recovered = week("2099-W03", 0.3) + week("2099-W04", 0.6) + week("2099-W06", 0.3)
+    assert dtr.propose(current, recovered, week_id="2099-W05")[0]["decision_type"] == "iterate"
+
+
+def test_aggregator_writes_proposed_decisions_from_history(tmp_path: Path) -> None:
+    previous = make_run(tmp_path / "runs" / "2099-W01", 600, week_id="2099-W01", seed=71)
+    current = make_run(tmp_path / "runs" / "2099-W02", 600, week_id="2099-W02", seed=72)
+    expected = run_aggregator(current)
+
+    outputs = run_aggregator(current, "--propose-decisions", "--decision-history", str(tmp_path / "runs" / "*"))
+    assert outputs == expected
+    # History runs are only read: no checkpoint is written into them.
+    assert not (previous.parent / agg.AGGREGATE_STATE_FILENAME).exists()
+
+    with (current.parent / "inputs" / agg.DECISIONS_PROPOSED_FILENAME).open(encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert reader.fieldnames == dtr.DECISIONS_COLUMNS
+    assert rows and {r["week_id"] for r in rows} == {"2099-W02"}
+    assert {r["decision_type"] for r in rows} <= {"kill", "iterate", "keep", "scale"}
+    assert {r["pattern_type"] for r in rows} <= {"hook", "vertical"}
@@ -0,0 +1,76 @@
+"""Tests for scripts/metric_drift.py and aggregate_weekly_inputs.py --drift-history."""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import aggregate_weekly_inputs as agg  # noqa: E402
+import metric_drift  # noqa: E402
+from weekly_run_helpers import make_run, run_aggregator  # noqa: E402
+
+
+def test_psi_and_ks_on_binned_distributions() -> None:
+    same = [10] * metric_drift.BINS
+    assert metric_drift.psi(same, [2 * c for c in same]) == pytest.approx(0.0)
+    assert metric_drift.ks_statistic(same, same) == pytest.approx(0.0)
+
+    low = [100] * 5 + [0] * (metric_drift.BINS - 5)
+    assert metric_drift.ks_statistic(low, same) == pytest.approx(0.75)
+    assert metric_drift.psi(low, same) > metric_drift.DEFAULT_PSI_THRESHOLD
+
+    # Last week weighs fully, a week one half-life older half as much.
+    ref = metric_drift.weighted_reference([(1, {("tiktok", "loop_pct"): same}), (3, {("tiktok", "loop_pct"): same})], 2)
+    assert ref[("tiktok", "loop_pct")][0] == pytest.approx(15.0)
+
+
+def _halve_completion(run_json: Path) -> None:
+    posts = run_json.parent / "inputs" / "posts_export.csv"
+    with posts.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for r in rows:
+        if r["completion_pct"]:
+            r["completion_pct"] = str(float(r["completion_pct"]) / 2)
+    with posts.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+
+
+def test_drift_flags_shift_and_reuses_cached_week_histograms(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    runs = tmp_path / "runs"
+    for week, seed in [("2099-W01", 81), ("2099-W02", 82), ("2099-W03", 83)]:
+        make_run(runs / week, 900, week_id=week, seed=seed)
+    steady = make_run(runs / "2099-W04", 900, week_id="2099-W04", seed=84)
+    history = ["--drift-history", str(runs / "*")]
+    before_history = sorted(p.relative_to(runs) for p in runs.glob("2099-W0[123]/**/*"))
+
+    health = json.loads(run_aggregator(steady, *history)["dataset_health.json"])
+    assert not [f for f in health["drift_flags"] if f.startswith("distribution_shift:")]
+    assert health["drift"]["reference_weeks"] == ["2099-W03", "2099-W02", "2099-W01"]
+    assert {c["metric"] for c in health["drift"]["checks"]} == set(metric_drift.DRIFT_METRICS)
+    weeks = ["2099-W01", "2099-W02", "2099-W03", "2099-W04"]
+    assert all(agg._metric_histograms_path(runs / w / "inputs" / "posts_export.csv").exists() for w in weeks)
+    # History runs are only read; every cache lives under the cache root.
+    assert sorted(p.relative_to(runs) for p in runs.glob("2099-W0[123]/**/*")) == before_history
+
+    shifted = make_run(tmp_path / "shifted" / "2099-W04", 900, week_id="2099-W04", seed=84)
+    _halve_completion(shifted)
+
+    # Every earlier week now comes from its cached histograms; no export is loaded again.
+    def no_parse(*args, **kwargs):
+        raise AssertionError("history export was re-read")
+
+    monkeypatch.setattr(agg, "_load_posts_columns", no_parse)
+    outputs = run_aggregator(shifted, *history, "--streaming")
+    health = json.loads(outputs["dataset_health.json"])
+    completion_flags = [f for f in health["drift_flags"] if f.endswith(":completion_pct")]
+    assert completion_flags == [f"distribution_shift:{p}:completion_pct" for p in ["ig_reels", "tiktok", "yt_shorts"]]
+    assert not [f for f in health["drift_flags"] if f.endswith(":loop_pct")]
+    assert "Distribution shift" in health["notes"]
@@ -0,0 +1,129 @@
+"""Tests for scripts/metrics_export_ingest.py."""
+
+import csv
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import metrics_export_ingest as mei  # noqa: E402
+import metrics_snapshot_store as mss  # noqa: E402
+
+EXPORT_HEADER = ["Video ID", "Published", "Pulled", "Views", "avgWatchTimeMs", "completionRate", "replays", "Saves"]
+
+
+def _mapping(tmp_path: Path) -> mei.ExportMapping:
+    path = tmp_path / "mapping.json"
+    spec = {
+        "columns": {
+            "Video ID": "canonical_post_id",
+            "Published": "publish_time_utc",
+            "Pulled": "captured_at_utc",
+            "Views": "views",
+            "avgWatchTimeMs": "avg_view_duration_sec",
+            "completionRate": "completion_pct",
+            "replays": "loop_pct",
+            "Saves": "saves",
+        },
+        "percent_scale": 100,
+        "duration_scale": 0.001,
+        "field_warnings": {"loop_pct": "LOOP_DEFINITION_DIFF"},
+    }
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return mei.ExportMapping.load(path).with_defaults(platform="tiktok", window="W24H")
+
+
+def _write_export(path: Path, rows: list) -> Path:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(EXPORT_HEADER)
+        w.writerows(rows)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["stdlib", "numpy"])
+def test_export_rows_are_mapped_validated_and_split(tmp_path: Path, engine: str) -> None:
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    pub, at = "2099-01-05T10:00:00Z", "2099-01-06T11:00:00Z"
+    export = _write_export(
+        tmp_path / "tiktok.csv",
+        [
+            ["TT-1", pub, at, "900", "8500", "0.42", "0.1", "12"],
+            ["TT-2", pub, at, "-3", "8500", "1.2", "", "12"],
+            ["TT-3", pub, "2099-01-06T13:00:01Z", "900", "8500", "0.42", "0.1", "12"],
+            ["", pub, at, "900", "8500", "0.42", "0.1", "12"],
+            ["TT-5", "", at, "n/a", "8500", "0.42", "0.1", "12"],
+        ],
+    )
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    report = mei.ingest_file(conn, export, _mapping(tmp_path), run_id="RUN-1", engine=engine)
+    assert (report.rows, report.accepted, report.rejected, report.stored) == (5, 1, 4, 4)
+
+    with (tmp_path / f"tiktok{mei.REJECTED_SUFFIX}").open(encoding="utf-8", newline="") as f:
+        rejected = {r["Video ID"]: r["errors"].split(";") for r in csv.DictReader(f)}
+    assert rejected == {
+        "TT-2": ["NEGATIVE_METRIC:views", "PERCENT_OUT_OF_RANGE:completion_pct"],
+        "TT-3": ["OUTSIDE_GRACE"],
+        "": ["MISSING_IDENTITY:canonical_post_id"],
+        "TT-5": ["UNPARSEABLE:views", "PUBLISH_TIME_MISSING"],
+    }
+
+    (row,) = conn.execute(
+        "SELECT views, avg_view_duration_sec, completion_pct, loop_pct, warnings, missing_fields, source_mode, raw "
+        "FROM snapshots WHERE canonical_post_id = 'TT-1'"
+    ).fetchall()
+    assert row[:4] == (900.0, 8.5, 42.0, 10.0)
+    assert json.loads(row[4]) == ["LOOP_DEFINITION_DIFF"]
+    assert json.loads(row[5]) == ["shares", "comments"] and row[6] == "export"
+    assert json.loads(row[7])["avgWatchTimeMs"] == "8500"
+
+
+def test_vectorized_checks_match_scalar_validator_across_chunks(tmp_path: Path) -> None:
+    rng = random.Random(5)
+    pub = "2099-01-05T10:00:00Z"
+    rows = []
+    for i in range(2000):
+        rows.append(
+            [
+                f"TT-{i}",
+                pub,
+                f"2099-01-06T{rng.choice(['09', '10', '11', '12', '13'])}:00:00Z",
+                str(rng.randint(-5, 1000)),
+                str(rng.randint(0, 700000)),
+                str(round(rng.uniform(-0.1, 1.2), 3)),
+                rng.choice(["", str(round(rng.random(), 3))]),
+                str(rng.randint(-1, 40)),
+            ]
+        )
+    export = _write_export(tmp_path / "big.csv", rows)
+    mapping = _mapping(tmp_path)
+    engines = ["stdlib", "numpy"] if mei.np is not None else ["stdlib"]
+    results = {}
+    for engine in engines:
+        db = tmp_path / f"{engine}.sqlite"
+        conn = mss.connect(db)
+        rejected_dir = tmp_path / engine
+        report = mei.ingest_file(
+            conn, export, mapping, run_id="RUN-1", engine=engine, chunk_rows=333, rejected_dir=rejected_dir
+        )
+        assert report.rows == 2000 and report.stored == 2000
+        snapshots = conn.execute(
+            "SELECT canonical_post_id, errors, views, avg_view_duration_sec, completion_pct, loop_pct, saves "
+            "FROM snapshots ORDER BY snapshot_id"
+        ).fetchall()
+        for _, errors, *values in snapshots:
+            parsed = dict(zip(["views", "avg_view_duration_sec", "completion_pct", "loop_pct", "saves"], values))
+            scalar = mss.validation_errors(parsed)
+            assert [e for e in json.loads(errors) if e not in ("BEFORE_WINDOW", "OUTSIDE_GRACE")] == scalar
+        results[engine] = (snapshots, (rejected_dir / f"big{mei.REJECTED_SUFFIX}").read_bytes())
+
+        # Re-ingesting the same export under the same run_id stores nothing new.
+        again = mei.ingest_file(conn, export, mapping, run_id="RUN-1", engine=engine, rejected_dir=rejected_dir)
+        assert again.stored == 0 and again.duplicates == 2000
+    assert all(r == results["stdlib"] for r in results.values())
@@ -0,0 +1,151 @@
+"""Tests for scripts/metrics_poll_scheduler.py (offline, on simulated time)."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import metrics_poll_scheduler as mps  # noqa: E402
+import metrics_snapshot_store as mss  # noqa: E402
+
+PUBLISH = "2099-01-05T12:00:00Z"
+
+
+def _parsed(views: int) -> dict:
+    return {"views": views, "completion_pct": 41.5, "saves": 3}
+
+
+def _adapter(tmp_path: Path, platform: str, posts: dict, latency: float = 0.0) -> mps.FileAdapter:
+    path = tmp_path / f"{platform}.json"
+    spec = {"platform": platform, "adapter_version": "fake@1", "latency_sec": latency, "posts": posts}
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return mps.FileAdapter(path)
+
+
+def _schedule(conn, adapters, posts, **kwargs) -> mps.PollReport:
+    start = min(p.publish_time for p in posts) + mps.WINDOW_OFFSET_SEC["W1H"]
+    scheduler = mps.PollScheduler(
+        conn, {a.platform: a for a in adapters}, run_id="RUN-1", clock=mps.VirtualClock(start), **kwargs
+    )
+    scheduler.add_posts(posts)
+    return asyncio.run(scheduler.run())
+
+
+def _post(platform: str, ref: str, publish: str = PUBLISH) -> mps.PendingPost:
+    return mps.PendingPost(platform=platform, post_ref=ref, publish_time=mss.parse_utc(publish), account_id="acct")
+
+
+def test_retries_follow_the_repoll_schedule_and_stop_at_grace(tmp_path: Path) -> None:
+    tiktok = _adapter(
+        tmp_path,
+        "tiktok",
+        {
+            "https://tt/1": {
+                "canonical_post_id": "TT-1",
+                "responses": {
+                    "W1H": [{"parsed": _parsed(100)}],
+                    "W24H": [{"error": "HTTP 503"}, {"parsed": {"views": -5}}, {"parsed": _parsed(900)}],
+                },
+            },
+            "https://tt/2": {"canonical_post_id": "TT-2", "responses": {"W24H": [{"parsed": _parsed(50)}]}},
+        },
+    )
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    posts = [_post("tiktok", "https://tt/1"), _post("tiktok", "https://tt/2"), _post("tiktok", "https://tt/404")]
+    report = _schedule(conn, [tiktok], posts)
+
+    # TT-2 has no W1H data: three failed attempts, then the window is missed.
+    assert report.missed == [("https://tt/2", "W1H")]
+    assert report.unresolved == ["https://tt/404"]
+    assert report.accepted == 3 and report.stored == 8
+
+    rows = conn.execute(
+        "SELECT attempt, captured_at_utc, errors FROM snapshots "
+        "WHERE canonical_post_id = 'TT-1' AND window = 'W24H' ORDER BY attempt"
+    ).fetchall()
+    assert [(a, t) for a, t, _ in rows] == [
+        (1, "2099-01-06T12:00:00Z"),
+        (2, "2099-01-06T12:30:00Z"),
+        (3, "2099-01-06T14:00:00Z"),
+    ]
+    assert "FETCH_FAILED" in rows[0][2] and "NEGATIVE_METRIC:views" in rows[1][2] and rows[2][2] == "[]"
+    missed = conn.execute("SELECT captured_at_utc FROM snapshots WHERE canonical_post_id = 'TT-2' AND window = 'W1H'")
+    assert [t for (t,) in missed] == ["2099-01-05T13:00:00Z", "2099-01-05T13:10:00Z", "2099-01-05T13:30:00Z"]
+
+
+def test_concurrency_and_rate_limits_are_bounded(tmp_path: Path) -> None:
+    def many(prefix: str, n: int) -> dict:
+        return {
+            f"{prefix}-{i}": {
+                "canonical_post_id": f"{prefix}-{i}",
+                "responses": {"W1H": [{"parsed": _parsed(i)}], "W24H": [{"parsed": _parsed(10 * i)}]},
+            }
+            for i in range(n)
+        }
+
+    fast = _adapter(tmp_path, "ig_reels", many("IG", 60), latency=0.001)
+    slow = _adapter(tmp_path, "yt_shorts", many("YT", 4))
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    posts = [_post("ig_reels", f"IG-{i}") for i in range(60)] + [_post("yt_shorts", f"YT-{i}") for i in range(4)]
+    report = _schedule(conn, [fast, slow], posts, concurrency=8, rate_limits={"yt_shorts": mps.TokenBucket(0.5)})
+
+    assert report.accepted == 128 and not report.missed
+    assert fast.max_inflight <= 8 < 60 and report.max_inflight == 8
+    # 0.5 pulls/s with a burst of one: YouTube pulls of the same window are 2 s apart.
+    times = conn.execute(
+        "SELECT captured_at_utc FROM snapshots WHERE platform = 'yt_shorts' AND window = 'W1H' ORDER BY 1"
+    ).fetchall()
+    assert [t for (t,) in times] == [f"2099-01-05T13:00:{s:02d}Z" for s in (0, 2, 4, 6)]
+
+    with pytest.raises(ValueError):
+        mps.PollScheduler(conn, {}, run_id="RUN-2").add_posts([_post("tiktok", "x")])
+
+
+class _BuggyAdapter(mps.FileAdapter):
+    async def fetch_metrics(self, canonical_post_id: str, window: str):
+        if canonical_post_id == "TT-2":
+            raise KeyError("views")
+        return await super().fetch_metrics(canonical_post_id, window)
+
+
+def test_unexpected_adapter_exceptions_fail_the_pull_not_the_run(tmp_path: Path) -> None:
+    _adapter(tmp_path, "tiktok", {f"https://tt/{i}": {"canonical_post_id": f"TT-{i}"} for i in (1, 2)})
+    tiktok = _BuggyAdapter(tmp_path / "tiktok.json")
+    tiktok._responses["TT-1"] = {"W1H": [{"parsed": _parsed(100)}], "W24H": [{"parsed": _parsed(900)}]}
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    report = _schedule(conn, [tiktok], [_post("tiktok", "https://tt/1"), _post("tiktok", "https://tt/2")])
+
+    assert report.accepted == 2 and report.stored == 8
+    assert sorted(report.missed) == [("https://tt/2", "W1H"), ("https://tt/2", "W24H")]
+    errors = conn.execute("SELECT DISTINCT errors FROM snapshots WHERE canonical_post_id = 'TT-2'").fetchall()
+    assert errors == [(json.dumps(["ADAPTER_EXCEPTION: KeyError: 'views'"]),)]
+
+
+class _InterruptedClock(mps.VirtualClock):
+    waits = 0
+
+    async def wait(self, deadline, inflight) -> None:
+        self.waits += 1
+        if self.waits == 2:
+            raise RuntimeError("interrupted")
+        await super().wait(deadline, inflight)
+
+
+def test_buffered_snapshots_are_stored_when_the_run_is_interrupted(tmp_path: Path) -> None:
+    tiktok = _adapter(tmp_path, "tiktok", {"https://tt/1": {"canonical_post_id": "TT-1", "responses": {}}})
+    tiktok._responses["TT-1"] = {"W1H": [{"parsed": _parsed(100)}]}
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    post = _post("tiktok", "https://tt/1")
+    scheduler = mps.PollScheduler(
+        conn, {"tiktok": tiktok}, run_id="RUN-1", clock=_InterruptedClock(post.publish_time + 3600), store_batch=100
+    )
+    scheduler.add_posts([post])
+    with pytest.raises(RuntimeError, match="interrupted"):
+        asyncio.run(scheduler.run())
+    assert scheduler.report.stored == 1
+    assert conn.execute("SELECT window, errors FROM snapshots").fetchall() == [("W1H", "[]")]
@@ -0,0 +1,113 @@
+"""Tests for scripts/metrics_reconcile.py."""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import metrics_reconcile as mr  # noqa: E402
+import metrics_snapshot_store as mss  # noqa: E402
+
+PUBLISH = "2099-01-05T12:00:00Z"
+
+
+def _snapshot(
+    post_id: str, window: str, captured_at: str, attempt: int = 1, publish: str = PUBLISH, **parsed
+) -> mss.MetricsSnapshot:
+    return mss.MetricsSnapshot.from_dict(
+        {
+            "run_id": f"R-{captured_at[11:13]}",
+            "captured_at_utc": captured_at,
+            "platform": "tiktok",
+            "account_id": "acct-1",
+            "canonical_post_id": post_id,
+            "window": window,
+            "adapter_version": "tiktok@1",
+            "source_mode": "api",
+            "attempt": attempt,
+            "publish_time_utc": publish,
+            "parsed": parsed,
+        }
+    )
+
+
+def _store(tmp_path: Path, posts: list, snapshots: list):
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    # posts_export.csv has no id column; hook_text stands in for it in these tests.
+    tracker = [{"platform": "tiktok", "notes": "", "hook_text": p["canonical_post_id"], **p} for p in posts]
+    mss.upsert_posts(conn, tracker)
+    mss.ingest_snapshots(conn, snapshots)
+    return conn
+
+
+def _rows(path: Path) -> dict:
+    with path.open(encoding="utf-8", newline="") as f:
+        return {r["hook_text"]: r for r in csv.DictReader(f)}
+
+
+def test_first_valid_in_grace_pull_is_accepted_and_later_moves_are_amendments(tmp_path: Path) -> None:
+    # Ingested out of capture order: reconciliation must not depend on insertion order.
+    conn = _store(
+        tmp_path,
+        [{"canonical_post_id": "P-1", "date": "2099-01-05"}],
+        [
+            _snapshot("P-1", "W1H", "2099-01-05T15:00:00Z", views=200),
+            _snapshot("P-1", "W24H", "2099-01-06T12:30:00Z", 2, views=1010, completion_pct=41.5),
+            _snapshot("P-1", "W1H", "2099-01-05T13:10:00Z", 2, views=100),
+            _snapshot("P-1", "W1H", "2099-01-05T13:00:00Z", views=90, errors=["FETCH_FAILED"]),
+            _snapshot("P-1", "W24H", "2099-01-06T12:00:00Z", views=1000, completion_pct=40.0, saves=7),
+        ],
+    )
+    out = tmp_path / "posts_export.csv"
+    report = mr.reconcile(conn, out, date_from="2099-01-01", date_to="2099-01-07")
+
+    row = _rows(out)["P-1"]
+    assert (row["views_1h"], row["views_24h"], row["completion_pct"], row["saves"]) == ("100", "1000", "0.4", "7")
+    assert row["decision"] == "" and report.invalidated == []
+    assert vars(report.windows["W1H"]) == {"snapshots": 3, "accepted": 1, "rejected": 1, "late": 1, "missing": 0}
+    # W24H views moved 1% (under the 2% threshold); completion moved 1.5 points.
+    assert [(a["window"], a["field"], a["before"], a["after"]) for a in report.amendments] == [
+        ("W1H", "views", 100.0, 200.0),
+        ("W24H", "completion_pct", 40.0, 41.5),
+    ]
+    assert report.flags == ["RECONCILIATION_DELTA"]
+
+
+def test_posts_without_w24h_are_invalidated_and_orphans_counted(tmp_path: Path) -> None:
+    _store(
+        tmp_path,
+        [
+            {"canonical_post_id": "P-2", "date": "2099-01-05", "notes": "reposted"},
+            {"canonical_post_id": "P-3", "date": "2099-01-06"},
+            {"canonical_post_id": "P-9", "date": "2099-02-01"},
+        ],
+        [
+            _snapshot("P-2", "W1H", "2099-01-05T13:00:00Z", views=10),
+            # Valid but past the W24H grace: diagnostics only, never accepted.
+            _snapshot("P-2", "W24H", "2099-01-06T14:00:01Z", views=500),
+            _snapshot("P-X", "W24H", "2099-01-06T12:00:00Z", views=5),
+            # An orphan published outside --from/--to is not counted for this range.
+            _snapshot("P-Y", "W24H", "2099-03-02T12:00:00Z", publish="2099-03-01T12:00:00Z", views=5),
+        ],
+    )
+    out = tmp_path / "inputs" / "posts_export.csv"
+    assert (
+        mr.main(
+            ["--db", str(tmp_path / "metrics.sqlite"), "--from", "2099-01-01", "--to", "2099-01-07", "--out", str(out)]
+        )
+        == 0
+    )
+
+    rows = _rows(out)
+    assert list(rows) == ["P-2", "P-3"]
+    assert rows["P-2"]["views_1h"] == "10" and rows["P-2"]["views_24h"] == ""
+    assert rows["P-2"]["notes"] == f"reposted; {mr.MISSING_METRICS_NOTE}"
+    assert all(r["decision"] == "invalid" for r in rows.values())
+
+    report = json.loads((out.parent / mr.RECONCILIATION_REPORT_FILENAME).read_text(encoding="utf-8"))
+    assert report["invalidated"] == ["P-2", "P-3"] and report["orphan_posts"] == 1
+    assert report["windows"]["W24H"] == {"snapshots": 1, "accepted": 0, "rejected": 0, "late": 1, "missing": 2}
+    assert report["flags"] == []
@@ -0,0 +1,146 @@
+"""Tests for scripts/metrics_snapshot_store.py and aggregate_weekly_inputs.py --snapshot-store."""
+
+import csv
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+sys.path.insert(0, str(REPO_ROOT / "tests"))
+
+import metrics_reconcile  # noqa: E402
+import metrics_snapshot_store as mss  # noqa: E402
+from weekly_run_helpers import make_run, run_aggregator  # noqa: E402
+
+
+def _snapshot(post_id: str, window: str, captured_at: str, *, run_id: str = "R-1", **parsed) -> mss.MetricsSnapshot:
+    d = {
+        "run_id": run_id,
+        "captured_at_utc": captured_at,
+        "platform": "tiktok",
+        "account_id": "acct-1",
+        "canonical_post_id": post_id,
+        "window": window,
+        "adapter_version": "tiktok@1",
+        "source_mode": "api",
+        "raw": {"post": post_id},
+        "parsed": parsed,
+    }
+    return mss.MetricsSnapshot.from_dict(d)
+
+
+def _pct(v: str) -> float:
+    return float(v) * 100 if v else None
+
+
+def _store_from_csv(conn: sqlite3.Connection, posts_csv: Path) -> None:
+    with posts_csv.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    tracker = [dict(r, canonical_post_id=f"P-{i:05d}") for i, r in enumerate(rows)]
+    assert mss.upsert_posts(conn, tracker) == len(rows)
+
+    def num(v: str):
+        return float(v) if v else None
+
+    snapshots = []
+    for r in tracker:
+        pid = r["canonical_post_id"]
+        snapshots.append(_snapshot(pid, "W1H", "2099-02-01T01:00:00Z", views=num(r["views_1h"])))
+        w24 = dict(
+            views=num(r["views_24h"]),
+            avg_view_duration_sec=num(r["avg_view_duration_sec"]),
+            completion_pct=_pct(r["completion_pct"]),
+            loop_pct=_pct(r["loop_pct"]),
+            shares=num(r["shares"]),
+            saves=num(r["saves"]),
+            comments=num(r["comments"]),
+        )
+        # A rejected earlier pull and a later re-pull must both lose to the first valid one.
+        snapshots.append(_snapshot(pid, "W24H", "2099-02-01T23:00:00Z", run_id="R-0", errors=["timeout"]))
+        snapshots.append(_snapshot(pid, "W24H", "2099-02-02T00:00:00Z", **w24))
+        snapshots.append(_snapshot(pid, "W24H", "2099-02-02T06:00:00Z", run_id="R-2", views=1.0))
+    result = mss.ingest_snapshots(conn, snapshots, batch_rows=97)
+    assert result == mss.IngestResult(inserted=len(snapshots), duplicates=0)
+
+
+def test_snapshots_are_immutable_and_first_valid_pull_wins(tmp_path: Path) -> None:
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    mss.upsert_posts(
+        conn, [{"canonical_post_id": "P-1", "date": "2099-01-02", "platform": "tiktok", "is_control": "true"}]
+    )
+    first = _snapshot("P-1", "W24H", "2099-01-03T00:00:00Z", views=100, completion_pct=42.0)
+    assert mss.ingest_snapshots(conn, [first]) == mss.IngestResult(inserted=1, duplicates=0)
+    # Re-ingesting the same identity keeps the stored row.
+    again = _snapshot("P-1", "W24H", "2099-01-03T00:00:00Z", views=999)
+    assert mss.ingest_snapshots(conn, [again]) == mss.IngestResult(inserted=0, duplicates=1)
+
+    with pytest.raises(sqlite3.IntegrityError, match="immutable"):
+        conn.execute("UPDATE snapshots SET views = 1")
+    with pytest.raises(sqlite3.IntegrityError, match="immutable"):
+        conn.execute("DELETE FROM snapshots")
+
+    # A bad batch rolls back as a whole.
+    with pytest.raises(ValueError):
+        mss.ingest_snapshots(conn, [_snapshot("P-2", "W1H", "x"), _snapshot("P-2", "W7D", "x")])
+    assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 1
+
+    out = tmp_path / "posts_export.csv"
+    assert metrics_reconcile.reconcile(conn, out, date_from="2099-01-01", date_to="2099-01-07").posts == 1
+    with out.open(encoding="utf-8", newline="") as f:
+        (row,) = list(csv.DictReader(f))
+    assert row["views_24h"] == "100" and row["views_1h"] == ""
+    assert row["completion_pct"] == "0.42" and row["is_control"] == "true"
+
+
+def test_aggregator_materializes_posts_export_from_store(tmp_path: Path) -> None:
+    csv_run = make_run(tmp_path / "csv", 700, seed=91)
+    posts_csv = csv_run.parent / "inputs" / "posts_export.csv"
+    with posts_csv.open(encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames
+        rows = [r for r in reader if r["date"] != "bad-date"]
+
+    store_run = make_run(tmp_path / "store", 1, seed=91)
+    conn = mss.connect(tmp_path / "metrics.sqlite")
+    _store_from_csv(conn, posts_csv)
+    conn.close()
+
+    # The store orders by (date, canonical_post_id); the tracker ids follow file order.
+    keyed = sorted(enumerate(rows), key=lambda t: (t[1]["date"], t[0]))
+    with posts_csv.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=header)
+        w.writeheader()
+        w.writerows(r for _, r in keyed)
+    expected = run_aggregator(csv_run)
+
+    run = json.loads(store_run.read_text(encoding="utf-8"))
+    run["inputs"]["posts_range"] = "2099-01-01..2099-01-31"
+    store_run.write_text(json.dumps(run), encoding="utf-8")
+    assert run_aggregator(store_run, "--snapshot-store", str(tmp_path / "metrics.sqlite")) == expected
+
+
+def test_v2_store_is_migrated_and_older_stores_are_refused(tmp_path: Path) -> None:
+    db = tmp_path / "metrics.sqlite"
+    conn = mss.connect(db)
+    assert mss.ingest_snapshots(conn, [_snapshot("P-1", "W24H", "2099-01-03T00:00:00Z", views=100)]).inserted == 1
+    # Rewind to the v2 layout: the partial valid-only index instead of snapshots_post_window.
+    conn.executescript(
+        "DROP INDEX snapshots_post_window;\n"
+        "CREATE INDEX snapshots_valid_post_window ON snapshots (canonical_post_id, window) WHERE errors = '[]';\n"
+        "PRAGMA user_version = 2;"
+    )
+    conn.close()
+
+    conn = mss.connect(db)
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "snapshots_post_window" in indexes and "snapshots_valid_post_window" not in indexes
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == mss.STORE_SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 1
+    conn.execute("PRAGMA user_version = 1")
+    conn.close()
+    with pytest.raises(ValueError, match="schema v1, expected v3"):
+        mss.connect(db)
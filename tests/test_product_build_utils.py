@@ -0,0 +1,320 @@
+"""Tests for scripts/product_build_utils.py (templates, PDF rendering and caching)."""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import build_weekly_signal_brief as brief  # noqa: E402
+import product_build_utils as pbu  # noqa: E402
+
+
+def _regex_render(template_text: str, values: dict) -> tuple:
+    """The pre-compilation renderer: one regex pass with a callback."""
+
+    unresolved = set()
+
+    def repl(m: re.Match) -> str:
+        if m.group(1) in values:
+            return str(values[m.group(1)])
+        unresolved.add(m.group(1))
+        return m.group(0)
+
+    return pbu.VAR_PATTERN.sub(repl, template_text), unresolved
+
+
+def test_compiled_templates_render_like_the_regex_pass() -> None:
+    templates = [
+        "",
+        "no slots",
+        "{{a}}",
+        "x {{ a }} y {{b.c}}{{ a }} {{ missing-one }} {not} {{ }} z",
+    ]
+    templates += [
+        p.read_text(encoding="utf-8") for p in sorted(REPO_ROOT.glob("products/*/templates/**/*.*")) if p.is_file()
+    ]
+    for text in templates:
+        keys = sorted(set(pbu.VAR_PATTERN.findall(text)))
+        values = {k: f"<{i}>" for i, k in enumerate(keys) if i % 3}
+        values["a"] = 7
+        expected = _regex_render(text, values)
+        for module in (pbu, brief):
+            compiled = module.compile_template(text)
+            assert compiled.render(values) == expected
+            assert compiled.variables == set(keys)
+            assert module.render_template(text, values) == expected
+
+
+def test_templates_are_cached_by_content_hash(tmp_path: Path) -> None:
+    a, b = tmp_path / "a.md", tmp_path / "b.md"
+    a.write_text("Hi {{ name }}", encoding="utf-8")
+    b.write_text("Hi {{ name }}", encoding="utf-8")
+    first = pbu.load_template(a)
+    assert pbu.load_template(b) is first and pbu.extract_template_vars("Hi {{ name }}") == {"name"}
+
+    a.write_text("Bye {{ name }}", encoding="utf-8")
+    second = pbu.load_template(a)
+    assert second is not first and second.render({"name": "x"}) == ("Bye x", set())
+
+
+# CI installs Chromium and sets this so the renderer tests fail instead of skipping.
+REQUIRE_CHROMIUM = os.environ.get("REQUIRE_CHROMIUM") == "1"
+
+
+def test_pdf_renderer_pool_renders_documents_in_submission_order(tmp_path: Path) -> None:
+    if not REQUIRE_CHROMIUM:
+        pytest.importorskip("playwright")
+    html = []
+    for i in range(3):
+        p = tmp_path / f"doc{i}.html"
+        p.write_text(pbu.wrap_html_document(title=f"Doc {i}", body_html=f"<p>{i}</p>"), encoding="utf-8")
+        html.append(p)
+    try:
+        renderer = pbu.HtmlPdfRenderer(pages=2)
+    except pbu.BuildError as exc:
+        if REQUIRE_CHROMIUM:
+            raise
+        pytest.skip(f"Chromium unavailable: {exc}")
+    with renderer:
+        results = renderer.render_many([(h, h.with_suffix(".pdf")) for h in html])
+        with pytest.raises(pbu.BuildError, match="not found"):
+            renderer.submit(tmp_path / "missing.html", tmp_path / "missing.pdf")
+    assert [r.html_path for r in results] == html
+    assert all(r.pdf_path.read_bytes().startswith(b"%PDF") and r.render_sec > 0 for r in results)
+    with pytest.raises(pbu.BuildError, match="closed"):
+        renderer.submit(html[0], tmp_path / "late.pdf")
+
+
+class _FakeBrowser:
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    async def new_page(self) -> object:
+        if self.log.count("page") == 1:
+            raise RuntimeError("tab crashed")
+        self.log.append("page")
+        return object()
+
+    async def close(self) -> None:
+        self.log.append("browser closed")
+
+
+class _FakePlaywright:
+    def __init__(self, log: list) -> None:
+        self.log = log
+        self.chromium = self
+
+    async def start(self) -> "_FakePlaywright":
+        return self
+
+    async def launch(self) -> _FakeBrowser:
+        return _FakeBrowser(self.log)
+
+    async def stop(self) -> None:
+        self.log.append("playwright stopped")
+
+
+def test_pdf_renderer_closes_chromium_when_a_tab_fails_to_open(monkeypatch: pytest.MonkeyPatch) -> None:
+    log: list = []
+    fake = type(sys)("playwright.async_api")
+    fake.async_playwright = lambda: _FakePlaywright(log)
+    monkeypatch.setitem(sys.modules, "playwright", type(sys)("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.async_api", fake)
+    with pytest.raises(pbu.BuildError, match="tab crashed"):
+        pbu.HtmlPdfRenderer(pages=3)
+    assert log == ["page", "browser closed", "playwright stopped"]
+
+
+def _pdf_cmd(tmp_path: Path, *, sleep: float) -> str:
+    script = tmp_path / "fake_pdf_tool.py"
+    script.write_text(
+        "import pathlib, sys, time\n"
+        f"time.sleep({sleep})\n"
+        "src, out = map(pathlib.Path, sys.argv[1:])\n"
+        "if 'bad' in src.name:\n"
+        "    sys.exit('cannot render ' + src.name)\n"
+        "out.write_bytes(b'%PDF-1.4 ' + src.read_bytes())\n",
+        encoding="utf-8",
+    )
+    return f'"{sys.executable}" "{script}" "{{html}}" "{{pdf}}"'
+
+
+def test_pdf_adapter_batch_runs_jobs_concurrently_and_reports_each(tmp_path: Path) -> None:
+    jobs = []
+    for i in range(4):
+        (tmp_path / f"d{i}.html").write_text(f"<p>{i}</p>", encoding="utf-8")
+        jobs.append((tmp_path / f"d{i}.html", tmp_path / f"d{i}.pdf"))
+    started = time.perf_counter()
+    metas = pbu.run_pdf_adapter_batch(
+        adapter="command", jobs=jobs, pdf_cmd=_pdf_cmd(tmp_path, sleep=0.3), max_workers=4
+    )
+    # Four 0.3 s jobs overlap rather than running back to back.
+    assert time.perf_counter() - started < 1.0
+    assert [m["command_executed"].split()[-1].strip('"') for m in metas] == [str(pdf) for _, pdf in jobs]
+    assert all(m["exit_code"] == 0 and m["duration_sec"] >= 0.3 and m["started_at_utc"] for m in metas)
+    assert all(pdf.read_bytes() == b"%PDF-1.4 " + html.read_bytes() for html, pdf in jobs)
+
+    (tmp_path / "bad.html").write_text("x", encoding="utf-8")
+    jobs.insert(1, (tmp_path / "bad.html", tmp_path / "bad.pdf"))
+    (tmp_path / "d3.pdf").unlink()
+    with pytest.raises(pbu.BuildError, match=r"exit 1\) for bad.pdf: cannot render bad.html"):
+        pbu.run_pdf_adapter_batch(adapter="command", jobs=jobs, pdf_cmd=_pdf_cmd(tmp_path, sleep=0))
+    # The failure is raised only after the rest of the batch has finished.
+    assert (tmp_path / "d3.pdf").exists()
+
+
+def test_release_renders_every_products_pdfs_in_one_batch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("jsonschema")
+    import release_products
+
+    monkeypatch.setenv("PDF_CACHE_DIR", str(tmp_path / "pdf_cache"))
+    monkeypatch.setenv("HASH_CACHE_PATH", str(tmp_path / "hash_cache.sqlite"))
+    batches = []
+    real_batch = release_products.run_pdf_adapter_batch
+    monkeypatch.setattr(
+        release_products,
+        "run_pdf_adapter_batch",
+        lambda **kw: batches.append(kw) or real_batch(**kw),
+    )
+    out_root = tmp_path / "release"
+    argv = ["--out-root", str(out_root), "--pdf-adapter", "command", "--pdf-cmd", _pdf_cmd(tmp_path, sleep=0)]
+    assert release_products.main([*argv, "--pdf-workers", "2"]) == 0
+
+    # Builders only wrote HTML; one bounded batch rendered every product's PDF.
+    assert len(batches) == 1 and batches[0]["max_workers"] == 2
+    assert sorted(pdf.parents[1].name for _, pdf in batches[0]["jobs"]) == sorted(release_products.PDF_PRODUCTS)
+    assert not list(out_root.glob(f"*/*/{pbu.PDF_JOB_FILENAME}"))
+    for product in release_products.PDF_PRODUCTS:
+        (manifest_path,) = (out_root / product).glob("*/*.manifest.json")
+        text = manifest_path.read_text(encoding="utf-8")
+        manifest = json.loads(text)
+        assert manifest["pdf_adapter"]["exit_code"] == 0 and "deferred" not in manifest["pdf_adapter"]
+        pdf = manifest_path.parent / manifest["outputs"][-1]["filename"]
+        assert pdf.suffix == ".pdf" and pdf.read_bytes().startswith(b"%PDF-1.4 <")
+        assert manifest["outputs"][-1]["sha256"] == hashlib.sha256(pdf.read_bytes()).hexdigest()
+        if product == "weekly_signal_brief":
+            assert text == json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+
+
+def test_pdf_cache_skips_unchanged_documents_and_keys_on_linked_css(tmp_path: Path) -> None:
+    cache = pbu.PdfCache(tmp_path / "cache")
+    (tmp_path / "style.css").write_text("p { color: red }", encoding="utf-8")
+    html = tmp_path / "doc.html"
+    html.write_text('<link rel="stylesheet" href="style.css" /><p>hi</p>', encoding="utf-8")
+    pdf_cmd = _pdf_cmd(tmp_path, sleep=0)
+
+    def render(out: str) -> dict:
+        (meta,) = pbu.run_pdf_adapter_batch(
+            adapter="command", jobs=[(html, tmp_path / out)], pdf_cmd=pdf_cmd, cache=cache
+        )
+        return meta
+
+    first = render("a.pdf")
+    assert first["cache_hit"] is False and first["exit_code"] == 0
+    hit = render("b.pdf")
+    assert hit["cache_hit"] is True and hit["cache_key"] == first["cache_key"] and hit["exit_code"] is None
+    assert (tmp_path / "b.pdf").read_bytes() == (tmp_path / "a.pdf").read_bytes()
+    # Outputs are copies: rewriting one in place leaves the cache entry intact.
+    (tmp_path / "b.pdf").write_bytes(b"placeholder")
+    assert render("c.pdf")["cache_hit"] and (tmp_path / "c.pdf").read_bytes() == (tmp_path / "a.pdf").read_bytes()
+
+    (tmp_path / "style.css").write_text("p { color: blue }", encoding="utf-8")
+    assert render("d.pdf")["cache_hit"] is False
+
+
+def test_pdf_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = pbu.PdfCache(tmp_path / "cache", max_bytes=2500)
+    src = tmp_path / "src.pdf"
+    src.write_bytes(b"%PDF" + b"x" * 996)
+    for i, key in enumerate(["aa" * 32, "bb" * 32]):
+        cache.store(key, src)
+        entry = tmp_path / "cache" / key[:2] / f"{key}.pdf"
+        os.utime(entry, (1000 + i, 1000 + i))
+    # Reading "aa" makes "bb" the least recently used entry.
+    assert cache.fetch("aa" * 32, tmp_path / "out.pdf")
+    cache.store("cc" * 32, src)
+    assert [p.stem[:2] for p in sorted((tmp_path / "cache").glob("*/*.pdf"))] == ["aa", "cc"]
+    assert not cache.fetch("bb" * 32, tmp_path / "out.pdf")
+
+
+def test_hash_cache_reuses_digests_until_size_mtime_or_inode_change(tmp_path: Path, monkeypatch) -> None:
+    cache = pbu.HashCache(tmp_path / "hashes.sqlite")
+    files = []
+    for i in range(3):
+        p = tmp_path / f"f{i}.txt"
+        p.write_text(f"content {i}", encoding="utf-8")
+        os.utime(p, ns=(10**18, 10**18 + i))
+        files.append(p)
+    expected = [pbu.sha256_file(p) for p in files]
+    assert pbu.sha256_files(files, cache=cache, max_workers=3) == expected
+
+    # Cached entries are served without re-reading the file.
+    calls = []
+    monkeypatch.setattr(pbu, "sha256_file", lambda p: calls.append(p) or "x" * 64)
+    assert pbu.sha256_files(files, cache=cache) == expected and calls == []
+
+    os.utime(files[0], ns=(10**18, 10**18 + 100))
+    files[1].write_text("content 1!", encoding="utf-8")
+    os.utime(files[1], ns=(10**18, 10**18 + 1))
+    assert pbu.sha256_files(files, cache=cache) == ["x" * 64, "x" * 64, expected[2]]
+    assert calls == files[:2]
+
+    # A file touched just now is hashed but not remembered.
+    calls.clear()
+    files[2].write_text("content 2", encoding="utf-8")
+    assert pbu.sha256_files(files[2:], cache=cache) == ["x" * 64]
+    assert pbu.sha256_files(files[2:], cache=cache) == ["x" * 64] and len(calls) == 2
+
+
+def test_schema_validators_are_reused_until_the_schema_content_changes(tmp_path: Path) -> None:
+    pytest.importorskip("jsonschema")
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text('{"type": "object", "required": ["a"]}', encoding="utf-8")
+    first = pbu.schema_validator(schema_path)
+    assert pbu.schema_validator(schema_path) is first
+    assert pbu.schema_validator(schema_path, format_checker=False).format_checker is None
+    pbu.validate_json_against_schema({"a": 1}, schema_path)
+    with pytest.raises(pbu.BuildError, match=r"at \(root\): 'a' is a required property"):
+        pbu.validate_manifest_schema({}, schema_path)
+
+    schema_path.write_text('{"type": "object", "required": ["b"]}', encoding="utf-8")
+    assert pbu.schema_validator(schema_path) is not first
+    with pytest.raises(pbu.BuildError, match="'b' is a required property"):
+        pbu.validate_json_against_schema({"a": 1}, schema_path)
+
+    schema_path.write_text('{"type": 12}', encoding="utf-8")
+    with pytest.raises(pbu.BuildError, match="Invalid schema"):
+        pbu.schema_validator(schema_path)
+
+
+def test_validate_schemas_reads_each_schema_once_and_reports_missing_jsonschema_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("jsonschema")
+    import validate_schemas
+
+    templates = tmp_path / "products" / "p" / "templates"
+    templates.mkdir(parents=True)
+    (tmp_path / "artifacts").mkdir()
+    (tmp_path / "artifacts" / "manifest.schema.json").write_text('{"type": "object"}', encoding="utf-8")
+    (templates / "a_schema.json").write_text("{not json", encoding="utf-8")
+    (templates / "b_schema.json").write_text('{"type": 12}', encoding="utf-8")
+
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda p: reads.append(p.name) or read_bytes(p))
+    errors = validate_schemas.validate_repo_schemas(tmp_path)
+    assert sorted(reads) == ["a_schema.json", "b_schema.json", "manifest.schema.json"]
+    assert [e.split(": ", 1)[1].split(":")[0] for e in errors] == ["failed to parse JSON", "invalid JSON Schema"]
+
+    monkeypatch.setitem(sys.modules, "jsonschema", None)
+    (errors_without_jsonschema,) = validate_schemas.validate_repo_schemas(tmp_path)
+    assert errors_without_jsonschema.startswith("Missing dependency 'jsonschema'")
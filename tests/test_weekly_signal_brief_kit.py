@@ -0,0 +1,84 @@
+"""Smoke test: the Weekly Signal Brief buyer kit runs from its allowlisted files alone."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import aggregate_weekly_inputs as agg  # noqa: E402
+import build_weekly_signal_brief as brief  # noqa: E402
+import package_weekly_signal_brief_kit as kit  # noqa: E402
+
+FIXTURE_RUN = "products/weekly_signal_brief/runs/2099-W01-fixture/run.json"
+
+
+@pytest.fixture
+def kit_root(tmp_path: Path) -> Path:
+    root = tmp_path / "kit"
+    for p in kit.iter_allowlisted_paths(REPO_ROOT.resolve()):
+        dest = root / p.relative_to(REPO_ROOT.resolve())
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(p, dest)
+    return root
+
+
+def _run(kit_root: Path, *args: str) -> subprocess.CompletedProcess:
+    # No PYTHONPATH: only the kit's own scripts/ directory is importable.
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    return subprocess.run([sys.executable, *args], cwd=kit_root, env=env, capture_output=True, text=True, timeout=120)
+
+
+def test_kit_aggregator_runs_without_the_repo_scripts(kit_root: Path) -> None:
+    assert sorted(p.name for p in (kit_root / "scripts").glob("*.py")) == [
+        "aggregate_weekly_inputs.py",
+        "build_weekly_signal_brief.py",
+    ]
+    for extra in ([], ["--streaming"], ["--incremental"]):
+        proc = _run(kit_root, "scripts/aggregate_weekly_inputs.py", "--run-json", FIXTURE_RUN, *extra)
+        assert proc.returncode == 0, proc.stderr
+        assert "OK week_id=2099-W01-fixture" in proc.stdout
+
+
+def test_kit_brief_builder_runs_without_the_repo_scripts(kit_root: Path) -> None:
+    pytest.importorskip("jsonschema")
+    proc = _run(
+        kit_root,
+        "scripts/build_weekly_signal_brief.py",
+        "--run",
+        FIXTURE_RUN,
+        "--out-dir",
+        str(kit_root / "out"),
+        "--pdf-adapter",
+        "none",
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert (kit_root / "out" / "2099-W01-fixture.manifest.json").exists()
+
+
+def test_kit_builder_reads_proposed_decisions_where_the_aggregator_writes_them(kit_root: Path) -> None:
+    pytest.importorskip("jsonschema")
+    run_json = kit_root / FIXTURE_RUN
+    build = ["scripts/build_weekly_signal_brief.py", "--run", FIXTURE_RUN, "--pdf-adapter", "none"]
+
+    # Default location: next to hooks_rollup.csv, for the aggregator and the builder alike.
+    assert agg.DECISIONS_PROPOSED_FILENAME == brief.DECISIONS_PROPOSED_FILENAME
+    inputs = run_json.parent / "inputs"
+    shutil.copyfile(inputs / "decisions.csv", inputs / agg.DECISIONS_PROPOSED_FILENAME)
+    proc = _run(kit_root, *build, "--out-dir", str(kit_root / "out"), "--use-proposed-decisions")
+    assert proc.returncode == 0, proc.stderr
+
+    # A declared but not yet written proposals file does not block a build that does not use it.
+    run = json.loads(run_json.read_text(encoding="utf-8"))
+    run["inputs"]["files"]["decisions_proposed"] = "inputs/decisions_review.csv"
+    run_json.write_text(json.dumps(run, indent=2), encoding="utf-8")
+    proc = _run(kit_root, *build, "--out-dir", str(kit_root / "out2"))
+    assert proc.returncode == 0, proc.stderr
+    proc = _run(kit_root, *build, "--out-dir", str(kit_root / "out3"), "--use-proposed-decisions")
+    assert proc.returncode != 0 and "decisions_review.csv not found" in proc.stderr
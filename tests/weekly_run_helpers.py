@@ -0,0 +1,114 @@
+"""Synthetic Weekly Signal Brief runs shared by the aggregator tests."""
+
+import csv
+import json
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import aggregate_weekly_inputs as agg  # noqa: E402
+
+POSTS_HEADER = [
+    "date",
+    "platform",
+    "vertical",
+    "hook_type",
+    "hook_text",
+    "duration_sec",
+    "visual_style",
+    "voice_style",
+    "block_id",
+    "experiment_id",
+    "variant_id",
+    "is_control",
+    "views_1h",
+    "views_24h",
+    "avg_view_duration_sec",
+    "completion_pct",
+    "loop_pct",
+    "shares",
+    "saves",
+    "comments",
+    "decision",
+    "notes",
+]
+
+COMPUTED_AT = "2099-01-08T00:00:00Z"
+
+
+def write_posts(path: Path, n: int, *, seed: int = 7) -> None:
+    rng = random.Random(seed)
+
+    def maybe(v, p=0.03):
+        return "" if rng.random() < p else v
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(POSTS_HEADER)
+        for _ in range(n):
+            w.writerow(
+                [
+                    f"2099-01-{rng.randint(1, 28):02d}" if rng.random() > 0.01 else "bad-date",
+                    rng.choice(["tiktok", "yt_shorts", "ig_reels"]),
+                    rng.choice(["ops", "finance", "ai"]),
+                    rng.choice(["claim", "question", "contrarian", "story"]),
+                    "hook",
+                    rng.choice([15, 17, 22, 25, 30, 33, 40, ""]),
+                    rng.choice(["minimal", "loop_v1"]),
+                    rng.choice(["neutral", "warm"]),
+                    rng.choice(["B-1", "B-2"]),
+                    "EXP-001",
+                    rng.choice(["A", "B"]),
+                    rng.choice(["true", "false"]),
+                    maybe(rng.randint(0, 5000)),
+                    maybe(rng.randint(0, 50000)),
+                    maybe(round(rng.uniform(1, 14.5), 2)),
+                    maybe(round(rng.random(), 3)),
+                    maybe(round(rng.random() * 0.3, 3)),
+                    maybe(rng.randint(0, 500), 0.1),
+                    maybe(rng.randint(0, 500), 0.1),
+                    rng.randint(0, 100),
+                    rng.choice(["keep", "iterate", "kill", "scale", "invalid", ""]),
+                    rng.choice(["", "ok", "INVALID_REASON: boosted"]),
+                ]
+            )
+
+
+def make_run(root: Path, n: int, *, week_id: str = "2099-W02", seed: int = 7) -> Path:
+    (root / "inputs").mkdir(parents=True, exist_ok=True)
+    write_posts(root / "inputs" / "posts_export.csv", n, seed=seed)
+    run_json = root / "run.json"
+    run_json.write_text(
+        json.dumps(
+            {
+                "week_id": week_id,
+                "inputs": {
+                    "posts_source": "TEST",
+                    "files": {
+                        "posts_export": "inputs/posts_export.csv",
+                        "hooks_rollup": "inputs/hooks_rollup.csv",
+                        "verticals_rollup": "inputs/verticals_rollup.csv",
+                        "dataset_health": "inputs/dataset_health.json",
+                    },
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    return run_json
+
+
+def run_outputs(run_json: Path) -> dict:
+    inputs = run_json.parent / "inputs"
+    return {
+        name: (inputs / name).read_bytes()
+        for name in ["hooks_rollup.csv", "verticals_rollup.csv", "dataset_health.json"]
+    }
+
+
+def run_aggregator(run_json: Path, *extra: str) -> dict:
+    assert agg.main(["--run-json", str(run_json), "--computed-at-utc", COMPUTED_AT, *extra]) == 0
+    return run_outputs(run_json)